@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# pg_trgm GIN indexes for the `__icontains` filters and the `q=` search.
+# Django compiles icontains to `UPPER(col::text) LIKE UPPER('%x%')` on Postgres,
+# so the indexes are built on that expression for the planner to match them.
+# Only Postgres supports them; other backends keep plain sequential matching.
+TRIGRAM_INDEXES = {
+    'api_flightlog': ['departure_place', 'landing_place', 'comments'],
+    'api_uav': [
+        'drone_name', 'manufacturer', 'type', 'motor_type', 'video_system',
+        'firmware', 'firmware_version', 'gps', 'mag', 'baro', 'gyro', 'acc',
+        'registration_number', 'serial_number'
+    ],
+}
+
+
+def _index_name(table, column):
+    return f'{table}_{column}_trgm'
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            schema_editor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {_index_name(table, column)} '
+                f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {_index_name(table, column)}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0006_uav_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.1.7 on 2026-10-18 23:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('deleted_record_id', models.AutoField(primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField()),
+                ('model_name', models.CharField(max_length=50)),
+                ('object_id', models.IntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImportedRecord',
+            fields=[
+                ('imported_record_id', models.AutoField(primary_key=True, serialize=False)),
+                ('source', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=50)),
+                ('source_id', models.IntegerField()),
+                ('local_id', models.IntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='flightlog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='maintenancelog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='uavconfig',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='maintenancereminder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='flightlog',
+            index=models.Index(fields=['user', 'updated_at'], name='api_flightl_user_id_6aedf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(fields=['user', 'updated_at'], name='api_mainten_user_id_0e9263_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uav',
+            index=models.Index(fields=['user', 'updated_at'], name='api_uav_user_id_7c4530_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uavconfig',
+            index=models.Index(fields=['user', 'updated_at'], name='api_uavconf_user_id_1dc192_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['user_id', 'deleted_at'], name='api_deleted_user_id_9d7f9a_idx'),
+        ),
+        migrations.AddField(
+            model_name='importedrecord',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imported_records', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='importedrecord',
+            constraint=models.UniqueConstraint(fields=('user', 'source', 'model_name', 'source_id'), name='unique_imported_record'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+from django.conf import settings
+from django.db import migrations
+
+# Inline copy of the storage layout of UAVImageService, so the migration keeps
+# working if the service changes
+UAV_IMAGES_DIR = 'uav_images'
+DATA_URI = re.compile(r'^data:image/([a-zA-Z0-9.+-]+);base64,(.*)$', re.DOTALL)
+EXTENSIONS = {'png', 'jpg', 'gif', 'webp', 'svg'}
+SUBTYPES = {'jpg': 'jpeg', 'svg': 'svg+xml'}
+
+
+def data_uris_to_files(apps, schema_editor):
+    UAV = apps.get_model('api', 'UAV')
+    directory = os.path.join(settings.MEDIA_ROOT, UAV_IMAGES_DIR)
+    for uav in UAV.objects.exclude(image__isnull=True).exclude(image='').only('uav_id', 'image').iterator():
+        match = DATA_URI.match(uav.image)
+        content = None
+        if match:
+            subtype, payload = match.groups()
+            extension = {'jpeg': 'jpg', 'svg+xml': 'svg'}.get(subtype.lower(), subtype.lower())
+            try:
+                content = base64.b64decode(payload)
+            except (binascii.Error, ValueError):
+                pass
+
+        if content is None or extension not in EXTENSIONS:
+            # Not a picture that could be displayed either
+            image = None
+        else:
+            name = f'{hashlib.sha256(content).hexdigest()}.{extension}'
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path):
+                os.makedirs(directory, exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(content)
+            image = f'{UAV_IMAGES_DIR}/{name}'
+        UAV.objects.filter(pk=uav.pk).update(image=image)
+
+
+def files_to_data_uris(apps, schema_editor):
+    UAV = apps.get_model('api', 'UAV')
+    for uav in UAV.objects.exclude(image__isnull=True).exclude(image='').only('uav_id', 'image').iterator():
+        path = os.path.join(settings.MEDIA_ROOT, UAV_IMAGES_DIR, os.path.basename(uav.image))
+        image = None
+        if os.path.isfile(path):
+            extension = os.path.splitext(path)[1].lstrip('.')
+            with open(path, 'rb') as f:
+                payload = base64.b64encode(f.read()).decode('ascii')
+            image = f'data:image/{SUBTYPES.get(extension, extension)};base64,{payload}'
+        UAV.objects.filter(pk=uav.pk).update(image=image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_import_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(data_uris_to_files, files_to_data_uris),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_uav_image_files'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uav',
+            name='image',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def write_thumbnails(apps, schema_editor):
+    # Only derived files are written, so the service is used directly
+    from api.services.image_service import UAVImageService
+    UAV = apps.get_model('api', 'UAV')
+    images = UAV.objects.exclude(image__isnull=True).exclude(image='').values_list('image', flat=True).distinct()
+    for image in images.iterator():
+        UAVImageService.write_thumbnails(image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_uav_image_path'),
+    ]
+
+    operations = [
+        migrations.RunPython(write_thumbnails, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,37 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
-from django.db import models
-from django.db.models.signals import post_delete
+from django.db import models, transaction
+from django.db.models.signals import post_delete, pre_delete
 from django.dispatch import receiver
 import os
 
+
+class TombstoneQuerySet(models.QuerySet):
+    def delete(self):
+        # Tombstones for every row in one INSERT, instead of a signal per row
+        with transaction.atomic(using=self.db):
+            record_deletions(self.model, self.values_list('pk', self.model.TOMBSTONE_OWNER))
+            return super().delete()
+
+
+class TombstoneModel(models.Model):
+    """Model whose deletions are recorded as DeletedRecord tombstones for delta sync.
+
+    Rows deleted by a UAV's cascade are recorded by record_uav_deletion.
+    """
+    # Lookup of the id of the user owning a row
+    TOMBSTONE_OWNER = 'user_id'
+
+    objects = TombstoneQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            record_deletions(type(self), type(self).objects.filter(pk=self.pk).values_list('pk', self.TOMBSTONE_OWNER))
+            return super().delete(*args, **kwargs)
+
+
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -93,8 +121,8 @@ class UAV(models.Model):
     acc = models.CharField(max_length=100, blank=True, null=True)
     registration_number = models.CharField(max_length=100, blank=True, null=True)
     serial_number = models.CharField(max_length=100, blank=True, null=True)
-    # Aircraft picture, stored in the DB as a 256x256 base64 data URI
-    image = models.TextField(blank=True, null=True)
+    # Aircraft picture: path under MEDIA_ROOT of the file named by its content hash
+    image = models.CharField(max_length=255, blank=True, null=True)
     custom_attributes = models.JSONField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -104,10 +132,20 @@ class UAV(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'drone_name'], name='unique_user_drone_name')
         ]
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.drone_name} ({self.serial_number})"
 
+# Remove the picture once no UAV uses it any more
+@receiver(post_delete, sender=UAV)
+def delete_image_on_uav_delete(sender, instance, **kwargs):
+    from .services.image_service import UAVImageService
+    if instance.image:
+        UAVImageService.release(instance.image)
+
 
 # UAV configuration file upload path
 def uav_config_path(instance, filename):
@@ -115,7 +153,7 @@ def uav_config_path(instance, filename):
     user_id = instance.user.user_id
     return f'uav_configs/user{user_id}/{filename}'
 
-class UAVConfig(models.Model):
+class UAVConfig(TombstoneModel):
     config_id = models.AutoField(primary_key=True)
     uav = models.ForeignKey(UAV, on_delete=models.CASCADE, related_name='configurations')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uav_configurations')
@@ -125,6 +163,12 @@ class UAVConfig(models.Model):
     upload_date = models.DateField()
     file = models.FileField(upload_to=uav_config_path)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
     
     def save(self, *args, **kwargs):
         # Handle file replacement on update
@@ -153,7 +197,7 @@ def delete_file_on_config_delete(sender, instance, **kwargs):
 
 
 # Flight logs
-class FlightLog(models.Model):
+class FlightLog(TombstoneModel):
     # Choices for dropdown fields
     LIGHT_CONDITIONS = [
         ('Day', 'Day'),
@@ -188,11 +232,13 @@ class FlightLog(models.Model):
     comments = models.CharField(max_length=255, blank=True, null=True)
     blackbox_log = models.CharField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         indexes = [
             models.Index(fields=['user', 'departure_date']),
             models.Index(fields=['uav', 'departure_date']),
+            models.Index(fields=['user', 'updated_at']),
         ]
     
     def __str__(self):
@@ -233,7 +279,7 @@ def maintenance_log_path(instance, filename):
     user_id = instance.user.user_id
     return f'maint_logs/user{user_id}/{filename}'
 
-class MaintenanceLog(models.Model):
+class MaintenanceLog(TombstoneModel):
     maintenance_id = models.AutoField(primary_key=True)
     uav = models.ForeignKey(UAV, on_delete=models.CASCADE, related_name='maintenance_logs')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='maintenance_logs')
@@ -242,6 +288,12 @@ class MaintenanceLog(models.Model):
     event_date = models.DateField()
     file = models.FileField(upload_to=maintenance_log_path, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
     
     def save(self, *args, **kwargs):
         # Handle file replacement on update
@@ -277,7 +329,9 @@ COMPONENT_CHOICES = [
 ]
 
 # Maintenance reminders
-class MaintenanceReminder(models.Model):
+class MaintenanceReminder(TombstoneModel):
+    TOMBSTONE_OWNER = 'uav__user_id'
+
     reminder_id = models.AutoField(primary_key=True)
     uav = models.ForeignKey(UAV, on_delete=models.CASCADE, related_name='reminders')
     component = models.CharField(max_length=50, choices=COMPONENT_CHOICES)
@@ -285,7 +339,7 @@ class MaintenanceReminder(models.Model):
     next_maintenance = models.DateField()
     reminder_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         # Prevent duplicate (uav, component) pairs
@@ -311,3 +365,133 @@ class File(models.Model):
     
     def __str__(self):
         return f"File {self.file_id} for UAV {self.uav}"
+
+
+# Background user data exports
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    export_id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Section name -> pending / running / done
+    progress = models.JSONField(default=dict, blank=True)
+    file_path = models.CharField(max_length=500, blank=True, null=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Heartbeat of the worker; jobs that stop updating are swept as failed
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Set for delta exports: only changes after this point are included
+    since = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Export {self.export_id} for {self.user} ({self.status})"
+
+
+class ImportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    import_id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Phase name -> pending / running / done / skipped
+    progress = models.JSONField(default=dict, blank=True)
+    # Same payload the synchronous import returned: success, message, details with errors
+    result = models.JSONField(null=True, blank=True)
+    # Uploaded archive under IMPORT_ROOT, removed once the job has finished
+    file_path = models.CharField(max_length=500, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    # Checked between phases; phases already imported stay committed
+    cancel_requested = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Heartbeat of the worker; jobs that stop updating are swept as failed
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Import {self.import_id} for {self.user} ({self.status})"
+
+
+# Tombstones of deleted records, so delta exports can carry deletions
+class DeletedRecord(models.Model):
+    deleted_record_id = models.AutoField(primary_key=True)
+    # Plain id rather than a foreign key: tombstones may outlive the rows around them
+    user_id = models.IntegerField()
+    model_name = models.CharField(max_length=50)
+    object_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.model_name} {self.object_id}"
+
+
+# Record id in an imported archive -> local record id, so later delta archives can be applied
+class ImportedRecord(models.Model):
+    imported_record_id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='imported_records')
+    # Identifies the exporting account, see ExportService.get_source_key
+    source = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=50)
+    source_id = models.IntegerField()
+    local_id = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'source', 'model_name', 'source_id'],
+                name='unique_imported_record'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} {self.source_id} -> {self.local_id}"
+
+
+# Names used for tracked models in tombstones and import mappings
+TRACKED_MODEL_NAMES = {
+    UAV: 'uav',
+    UAVConfig: 'uav_config',
+    FlightLog: 'flight_log',
+    MaintenanceLog: 'maintenance_log',
+    MaintenanceReminder: 'maintenance_reminder',
+}
+
+
+def record_deletions(model, rows):
+    """Write the tombstones of (object id, owner id) rows of a tracked model in one INSERT."""
+    DeletedRecord.objects.bulk_create([
+        DeletedRecord(user_id=user_id, model_name=TRACKED_MODEL_NAMES[model], object_id=object_id)
+        for object_id, user_id in rows if user_id is not None
+    ])
+
+
+# A UAV's delete cascades to its records without calling their delete(),
+# so its tombstones and theirs are written here, once per UAV
+@receiver(pre_delete, sender=UAV, dispatch_uid='record_uav_deletion')
+def record_uav_deletion(sender, instance, **kwargs):
+    rows = [(UAV, instance.pk)]
+    for model in (UAVConfig, FlightLog, MaintenanceLog, MaintenanceReminder):
+        rows.extend((model, pk) for pk in model.objects.filter(uav=instance).values_list('pk', flat=True))
+    DeletedRecord.objects.bulk_create([
+        DeletedRecord(user_id=instance.user_id, model_name=TRACKED_MODEL_NAMES[model], object_id=object_id)
+        for model, object_id in rows
+    ])
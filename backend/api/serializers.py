@@ -1,14 +1,13 @@
+from urllib.parse import urlsplit
 from rest_framework import serializers
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer
 from django.contrib.auth import get_user_model
-from .models import UserSettings, UAV, FlightLog, MaintenanceLog, MaintenanceReminder, File, FlightGPSLog, UAVConfig
+from django.urls import reverse
+from .services.image_service import UAVImageService
+from .models import UserSettings, UAV, FlightLog, MaintenanceLog, MaintenanceReminder, File, FlightGPSLog, UAVConfig, ExportJob, ImportJob
 
 User = get_user_model()
 
-# Upper bound for the base64 data URI of a UAV image (a 256x256 picture stays
-# far below this; the limit only guards against oversized payloads).
-MAX_UAV_IMAGE_LENGTH = 2 * 1024 * 1024
-
 class CustomUserCreateSerializer(BaseUserCreateSerializer):
     class Meta(BaseUserCreateSerializer.Meta):
         model = User
@@ -35,7 +34,45 @@ class UserSettingsSerializer(serializers.ModelSerializer):
         model = UserSettings
         fields = '__all__'
 
-class UAVSerializer(serializers.ModelSerializer):
+class DeferredFieldsMixin:
+    """Leave out the fields in context['deferred_fields']: columns a list query didn't load."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in self.context.get('deferred_fields', ()):
+            self.fields.pop(name, None)
+
+class UAVImageField(serializers.Field):
+    """UAV picture: written as a base64 data URI, read back as the URL of the stored file.
+
+    A new picture validates to its decoded (content, extension); the serializer
+    writes it only once it saves the UAV.
+    """
+
+    def to_representation(self, value):
+        url = reverse('uav-image', args=[value.rsplit('/', 1)[-1]])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_internal_value(self, data):
+        if not data:
+            return None
+        if not isinstance(data, str):
+            raise serializers.ValidationError("Image must be a base64 data URI (data:image/...).")
+        if data.startswith('data:'):
+            try:
+                return UAVImageService.decode_data_uri(data)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+
+        # Sending back the URL of a stored picture keeps it
+        name = urlsplit(data).path.rsplit('/', 1)[-1]
+        image = f"{UAVImageService.UAV_IMAGES_DIR}/{name}"
+        if urlsplit(data).path != reverse('uav-image', args=[name]) or not UAVImageService.file_path(image):
+            raise serializers.ValidationError("Image must be a base64 data URI (data:image/...).")
+        return image
+
+class UAVSerializer(DeferredFieldsMixin, serializers.ModelSerializer):
     props_maint_date = serializers.DateField(required=False, allow_null=True)
     motor_maint_date = serializers.DateField(required=False, allow_null=True)
     frame_maint_date = serializers.DateField(required=False, allow_null=True)
@@ -45,22 +82,18 @@ class UAVSerializer(serializers.ModelSerializer):
     props_reminder_active = serializers.BooleanField(required=False)
     motor_reminder_active = serializers.BooleanField(required=False)
     frame_reminder_active = serializers.BooleanField(required=False)
+    image = UAVImageField(required=False, allow_null=True)
+    # {size: URL} of the picture's WebP thumbnails, for srcset
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = UAV
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at')
 
-    def validate_image(self, value):
-        # The image is stored inline in the DB as a base64 data URI (256x256,
-        # produced by the client), so reject anything that isn't one.
-        if not value:
-            return value
-        if not value.startswith('data:image/'):
-            raise serializers.ValidationError("Image must be a base64 data URI (data:image/...).")
-        if len(value) > MAX_UAV_IMAGE_LENGTH:
-            raise serializers.ValidationError("Image is too large.")
-        return value
+    def get_image_srcset(self, obj):
+        thumbnails = UAVImageService.thumbnails(obj.image)
+        return {size: self.fields['image'].to_representation(path) for size, path in thumbnails.items()} or None
 
     def validate_drone_name(self, value):
         user = self.context['request'].user
@@ -96,7 +129,12 @@ class UAVSerializer(serializers.ModelSerializer):
                 reminder_data[key] = validated_data.pop(key)
 
         # Create UAV instance
-        uav = super().create(validated_data)
+        image = self._store_image(validated_data)
+        try:
+            uav = super().create(validated_data)
+        except Exception:
+            UAVImageService.release(image)
+            raise
 
         # Update or create maintenance reminders
         from .services.uav_service import UAVService
@@ -104,12 +142,39 @@ class UAVSerializer(serializers.ModelSerializer):
 
         return uav
 
+    def update(self, instance, validated_data):
+        previous_image = instance.image
+        image = self._store_image(validated_data)
+        try:
+            uav = super().update(instance, validated_data)
+        except Exception:
+            if image != previous_image:
+                UAVImageService.release(image)
+            raise
+        if previous_image and previous_image != uav.image:
+            UAVImageService.release(previous_image)
+        return uav
+
+    @staticmethod
+    def _store_image(validated_data):
+        # Write a newly uploaded picture now that the rest of the data is valid
+        image = validated_data.get('image')
+        if isinstance(image, tuple):
+            try:
+                image = validated_data['image'] = UAVImageService.store(*image)
+            except ValueError as e:
+                raise serializers.ValidationError({'image': [str(e)]})
+        return image
+
 class NestedUAVSerializer(UAVSerializer):
     """UAV as embedded in a flight log.
 
     Drops the image, which would otherwise be repeated for every row of a
     flight log page. The flight log UI resolves pictures from the UAV list.
     """
+    image = None
+    image_srcset = None
+
     class Meta(UAVSerializer.Meta):
         fields = None
         exclude = ('image',)
@@ -143,6 +208,16 @@ class FlightLogSerializer(serializers.ModelSerializer):
         flight_log = FlightLog.objects.create(uav=uav, **validated_data)
         return flight_log
 
+class FlightLogBulkSerializer(FlightLogSerializer):
+    # One create/update of a bulk request; the user's UAV ids are loaded up front
+    class Meta(FlightLogSerializer.Meta):
+        read_only_fields = ('user',)
+
+    def validate_uav_id(self, value):
+        if value not in self.context['uav_ids']:
+            raise serializers.ValidationError(f"UAV with id {value} does not exist or doesn't belong to you")
+        return value
+
 class FlightGPSLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = FlightGPSLog
@@ -233,3 +308,34 @@ class UAVConfigSerializer(serializers.ModelSerializer):
         if instance.file and request:
             representation['file'] = request.build_absolute_uri(instance.file.url)
         return representation
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'export_id', 'status', 'since', 'progress', 'file_size', 'error',
+            'created_at', 'completed_at', 'expires_at', 'download_url'
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, instance):
+        # Signed link, so the archive can be fetched (and resumed) without the auth header
+        from django.urls import reverse
+        from .services.export_service import ExportService
+        if not ExportService.get_export_path(instance):
+            return None
+        url = reverse('export-download', args=[instance.export_id])
+        url = f"{url}?token={ExportService.get_download_token(instance)}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            'import_id', 'status', 'progress', 'result', 'error', 'cancel_requested',
+            'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
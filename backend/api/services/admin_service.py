@@ -67,12 +67,13 @@ class AdminService:
     @staticmethod
     def get_user_uavs(admin_user, user_id, query_params=None):
         from ..models import UAV
+        from .uav_service import UAVService, UAV_LIST_DEFERRED_FIELDS
         # Only staff users can access UAV queryset
         if not admin_user.is_staff:
             return UAV.objects.none()
         
+        queryset = UAV.objects.defer(*UAVService.list_deferred_fields(query_params, UAV_LIST_DEFERRED_FIELDS))
         if user_id:
-            return UAV.objects.filter(user_id=user_id)
+            return queryset.filter(user_id=user_id)
         
-        return UAV.objects.all()
-        return UAV.objects.all()
+        return queryset
@@ -0,0 +1,108 @@
+import hashlib
+from functools import wraps
+from django.db.models import Count, Max, Min
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from ..models import UAV, FlightLog, FlightGPSLog, MaintenanceReminder, DeletedRecord, TRACKED_MODEL_NAMES
+
+# Clients may keep a response but must revalidate it before every use
+REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+
+# (model, owner id lookup) of the records each versioned resource is rendered from
+RESOURCE_SOURCES = {
+    # UAV rows carry their reminders and the totals of their flight logs
+    'uavs': [(UAV, 'user_id'), (MaintenanceReminder, 'uav__user_id'), (FlightLog, 'user_id')],
+    # Flight log rows embed their UAV
+    'flight_logs': [(FlightLog, 'user_id'), (UAV, 'user_id')],
+    'uav_meta': [(UAV, 'user_id')],
+    'flight_log_meta': [(FlightLog, 'user_id')],
+}
+
+
+def _token(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def conditional_get(version):
+    """Answer If-None-Match / If-Modified-Since with 304 before a GET handler runs.
+
+    version(request, *args, **kwargs) returns (etag, last modified or None) of
+    what the handler would render, or None to always run it.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            current = version(request, *args, **kwargs)
+            if current is None:
+                return handler(view, request, *args, **kwargs)
+
+            etag, last_modified = current
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = handler(view, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                if timestamp is not None:
+                    response['Last-Modified'] = http_date(timestamp)
+                response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+            return response
+        return wrapper
+    return decorator
+
+
+class ConditionalService:
+    """Version tokens that let read endpoints skip unchanged responses."""
+
+    @staticmethod
+    def resource_version(request, resource, owner_id=None):
+        """Weak ETag and last change of the records a resource is rendered from.
+
+        owner_id is the user whose records the view lists, by default the
+        requesting user. Row counts and deletion tombstones catch deletes,
+        which leave no updated_at behind.
+        """
+        if owner_id is None:
+            owner_id = request.user.pk
+        sources = RESOURCE_SOURCES[resource]
+        renderer = getattr(request, 'accepted_renderer', None)
+        parts = [resource, str(owner_id), renderer.format if renderer else None]
+        changes = []
+
+        for model, owner in sources:
+            state = model.objects.filter(**{owner: owner_id}).aggregate(count=Count('pk'), changed=Max('updated_at'))
+            parts.append((state['count'], state['changed'].isoformat() if state['changed'] else None))
+            changes.append(state['changed'])
+
+        deleted = DeletedRecord.objects.filter(
+            user_id=owner_id, model_name__in=[TRACKED_MODEL_NAMES[model] for model, _ in sources]
+        ).aggregate(latest=Max('deleted_at'))['latest']
+        changes.append(deleted)
+
+        last_modified = max((moment for moment in changes if moment), default=None)
+        parts.append(deleted.isoformat() if deleted else None)
+        return f'W/"{_token(*parts)}"', last_modified
+
+    @staticmethod
+    def gps_version(request, flightlog_id):
+        """Strong ETag of a flight's GPS track, or None if the user can't see the flight.
+
+        Points are never edited, only replaced as a whole by new rows, so the
+        count and id range of the rows pin the track down exactly.
+        """
+        flight = FlightLog.objects.filter(pk=flightlog_id).values('user_id', 'updated_at').first()
+        if flight is None or (flight['user_id'] != request.user.pk and not request.user.is_staff):
+            return None
+
+        rows = FlightGPSLog.objects.filter(flight_log_id=flightlog_id).aggregate(
+            count=Count('pk'), first=Min('pk'), last=Max('pk')
+        )
+        renderer = getattr(request, 'accepted_renderer', None)
+        token = _token('gps', flightlog_id, rows['count'], rows['first'], rows['last'],
+                       renderer.format if renderer else None)
+        return f'"{token}"', flight['updated_at']
+
+    @staticmethod
+    def file_etag(stat):
+        """Strong ETag of a file from its modification time and size."""
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
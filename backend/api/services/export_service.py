@@ -1,268 +1,557 @@
+import glob
 import os
-import re
+import time
 import json
 import csv
-import base64
-import binascii
 import zipfile
-import tempfile
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from io import StringIO
+from itertools import groupby
+from operator import itemgetter
 from django.conf import settings
-from django.http import HttpResponse
-from ..models import UAV, FlightLog, MaintenanceLog, MaintenanceReminder, FlightGPSLog, UAVConfig
-from ..serializers import (UAVSerializer, FlightLogSerializer, 
-                         MaintenanceLogSerializer, MaintenanceReminderSerializer, 
-                         FlightGPSLogSerializer)
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.dateparse import parse_date, parse_datetime
+from ..models import (UAV, FlightLog, MaintenanceLog, MaintenanceReminder, FlightGPSLog, UAVConfig, ExportJob,
+                      DeletedRecord)
+from ..serializers import FlightGPSLogSerializer
+from .image_service import UAVImageService
+
+# Read size when copying stored files into the archive
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# Formats that are compressed already; deflating them again only costs time
+STORED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.zip', '.gz', '.bz2', '.xz', '.7z', '.bbl', '.bfl'}
+
+# GPS points fetched per database round trip and written per archive write
+GPS_CHUNK_SIZE = 5000
+
+# Seconds between heartbeats of a background export while it writes a section
+EXPORT_HEARTBEAT_SECONDS = 60
+
+# Reminder components that are part of a UAV's representation
+UAV_REMINDER_COMPONENTS = ['props', 'motor', 'frame']
+
+# Compact encoder for the potentially large GPS files
+_compact_json = json.JSONEncoder(separators=(',', ':'))
+
+DOWNLOAD_TOKEN_SALT = 'api.export-download'
+SOURCE_KEY_SALT = 'api.export-source'
+
+# Version of the archive layout, recorded in manifest.json
+# 2: GPS tracks are columnar ({"columns": [...], "rows": [[...], ...]})
+# 3: UAV pictures only travel as files in uavs/images, not as data URIs in uavs.json
+EXPORT_FORMAT_VERSION = 3
+
+
+class _ZipStreamSink:
+    """Write-only file object that holds ZIP output until the response yields it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
 class ExportService:
     @staticmethod
-    def export_user_data(user):
+    def export_user_data(user, since=None):
+        """
+        Export all user-related drone data as a streamed ZIP archive.
+        With since, only records changed after it plus deletions are included.
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        kind = 'delta' if since else 'export'
+        filename = f"dronelogbook_{kind}_{timestamp}.zip"
+
+        response = StreamingHttpResponse(ExportService.stream_user_data(user, since=since), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def _sections():
+        """Archive sections in write order, keyed by their progress name."""
+        return [
+            ('uavs', ExportService._export_uavs),
+            ('uav_configs', ExportService._export_uav_configs),
+            ('flight_logs', ExportService._export_flight_logs),
+            ('gps_data', ExportService._export_gps_data),
+            ('maintenance_logs', ExportService._export_maintenance_logs),
+            ('maintenance_reminders', ExportService._export_maintenance_reminders),
+        ]
+
+    @staticmethod
+    def get_source_key(user):
+        """Stable, non-reversible id of the exporting account, used to match records on re-import."""
+        return salted_hmac(SOURCE_KEY_SALT, str(user.pk)).hexdigest()[:32]
+
+    @staticmethod
+    def resolve_since(user, value):
+        """Turn a `since` parameter into a datetime.
+
+        Accepts the id of one of the user's completed export jobs (its start
+        time is used) or an ISO date/datetime. Raises ValueError otherwise.
+        """
+        value = (value or '').strip()
+        if value.isdigit():
+            job = ExportJob.objects.filter(user=user, export_id=int(value), status='completed').first()
+            if not job:
+                raise ValueError(f"No completed export {value}")
+            return job.created_at
+
+        try:
+            since = parse_datetime(value)
+            if since is None:
+                day = parse_date(value)
+                since = datetime(day.year, day.month, day.day) if day else None
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValueError(f"Invalid since value: {value}")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    @staticmethod
+    def _changed(queryset, since):
+        """Restrict queryset to records changed at or after since (delta exports)."""
+        return queryset.filter(updated_at__gte=since) if since else queryset
+
+    @staticmethod
+    def stream_user_data(user, on_section=None, since=None, export_id=None):
+        """Yield the export ZIP piece by piece as its entries are written.
+
+        on_section(name, state) is called when a section starts and when it is done.
         """
-        Export all user-related drone data as a ZIP archive.
+        sink = _ZipStreamSink()
+        # The sink cannot seek, so zipfile writes each entry with a data descriptor
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=settings.EXPORT_COMPRESSION_LEVEL) as zip_file:
+            ExportService._write_manifest(zip_file, user, since, export_id)
+            for name, export_section in ExportService._sections():
+                if on_section:
+                    on_section(name, 'running')
+                for _ in export_section(zip_file, user, since):
+                    data = sink.pop()
+                    if data:
+                        yield data
+                if on_section:
+                    on_section(name, 'done')
+            if since:
+                ExportService._write_deletions(zip_file, user, since)
+
+        # Central directory
+        yield sink.pop()
+
+    @staticmethod
+    def _write_manifest(zip_file, user, since, export_id):
+        manifest = {
+            'format_version': EXPORT_FORMAT_VERSION,
+            'type': 'delta' if since else 'full',
+            'since': since.isoformat() if since else None,
+            'created_at': timezone.now().isoformat(),
+            'export_id': export_id,
+            'source': ExportService.get_source_key(user),
+        }
+        zip_file.writestr('manifest.json', json.dumps(manifest, indent=2))
+
+    @staticmethod
+    def _write_deletions(zip_file, user, since):
+        """Write the tombstones of records deleted after since."""
+        deletions = [
+            {'model': model_name, 'id': object_id, 'deleted_at': deleted_at.isoformat()}
+            for model_name, object_id, deleted_at in DeletedRecord.objects.filter(
+                user_id=user.pk, deleted_at__gte=since
+            ).order_by('deleted_at').values_list('model_name', 'object_id', 'deleted_at')
+        ]
+        zip_file.writestr('deleted.json', json.dumps(deletions, indent=2))
+
+    @staticmethod
+    def create_export_job(user, since=None):
+        """Queue a background export; it starts once the surrounding transaction commits."""
+        job = ExportJob.objects.create(
+            user=user,
+            since=since,
+            progress={name: 'pending' for name, _ in ExportService._sections()}
+        )
+        transaction.on_commit(lambda: threading.Thread(
+            target=ExportService._run_export_job_thread, args=(job.export_id,), daemon=True
+        ).start())
+        return job
+
+    @staticmethod
+    def _run_export_job_thread(export_id):
+        try:
+            ExportService.run_export_job(export_id)
+        finally:
+            # Release the database connection opened by this thread
+            connection.close()
+
+    @staticmethod
+    def run_export_job(export_id):
+        """Write the export archive of a job into EXPORT_ROOT, recording progress per section.
+
+        Any error marks the job failed, so clients polling it don't wait forever.
         """
-        # Create temp file for ZIP archive
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-            temp_filename = temp_file.name
-        
         try:
-            with zipfile.ZipFile(temp_filename, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                ExportService._export_uavs(zip_file, user)
-                ExportService._export_uav_configs(zip_file, user)
-                ExportService._export_flight_logs(zip_file, user)
-                ExportService._export_maintenance_logs(zip_file, user)
-                ExportService._export_maintenance_reminders(zip_file, user)
-            
-            with open(temp_filename, 'rb') as f:
-                zip_content = f.read()
-            
-            os.unlink(temp_filename)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"dronelogbook_export_{timestamp}.zip"
-            
-            response = HttpResponse(zip_content, content_type='application/zip')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            
-            return response
-        
+            return ExportService._write_export(export_id)
         except Exception as e:
-            # Ensure temp file is deleted on error
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
-            raise e
+            ExportService._remove_partial_files(export_id)
+            ExportJob.objects.filter(export_id=export_id).update(status='failed', error=str(e))
+            return ExportJob.objects.filter(export_id=export_id).first()
+
+    @staticmethod
+    def _write_export(export_id):
+        job = ExportJob.objects.select_related('user').get(export_id=export_id)
+        job.status = 'running'
+        job.save(update_fields=['status', 'updated_at'])
+        last_beat = time.monotonic()
+
+        def on_section(name, state):
+            nonlocal last_beat
+            job.progress[name] = state
+            job.save(update_fields=['progress', 'updated_at'])
+            last_beat = time.monotonic()
+
+        os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+        kind = 'delta' if job.since else 'export'
+        file_name = f"dronelogbook_{kind}_{job.export_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        path = os.path.join(settings.EXPORT_ROOT, file_name)
+        with open(f"{path}.part", 'wb') as f:
+            for data in ExportService.stream_user_data(job.user, on_section, job.since, job.export_id):
+                f.write(data)
+                # Long sections keep the job alive for the stale job sweep
+                if time.monotonic() - last_beat > EXPORT_HEARTBEAT_SECONDS:
+                    ExportJob.objects.filter(export_id=export_id).update(updated_at=timezone.now())
+                    last_beat = time.monotonic()
+        os.replace(f"{path}.part", path)
+
+        now = timezone.now()
+        job.status = 'completed'
+        job.file_path = file_name
+        job.file_size = os.path.getsize(path)
+        job.completed_at = now
+        job.expires_at = now + timedelta(hours=settings.EXPORT_TTL_HOURS)
+        # A job the sweep has failed meanwhile stays failed
+        finished = ExportJob.objects.filter(export_id=export_id, status='running').update(
+            status=job.status, file_path=job.file_path, file_size=job.file_size,
+            completed_at=job.completed_at, expires_at=job.expires_at, updated_at=now
+        )
+        if not finished:
+            os.unlink(path)
+            job.refresh_from_db()
+        return job
+
+    @staticmethod
+    def _remove_partial_files(export_id):
+        for path in glob.glob(os.path.join(settings.EXPORT_ROOT, f"dronelogbook_*_{export_id}_*.zip.part")):
+            os.unlink(path)
+
+    @staticmethod
+    def fail_stale_export_jobs():
+        """Mark jobs failed whose worker stopped reporting progress (cron job)."""
+        cutoff = timezone.now() - timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+        stale = ExportJob.objects.filter(status__in=['pending', 'running'], updated_at__lte=cutoff)
+        for export_id in stale.values_list('export_id', flat=True):
+            # Only remove the files of a job this sweep actually failed
+            if stale.filter(export_id=export_id).update(
+                status='failed', error='The export was interrupted. Please start it again.'
+            ):
+                ExportService._remove_partial_files(export_id)
+
+    @staticmethod
+    def get_export_path(job):
+        """Absolute path of a finished, unexpired export archive, or None."""
+        if job.status != 'completed' or not job.file_path:
+            return None
+        if job.expires_at and job.expires_at <= timezone.now():
+            return None
+        path = os.path.join(settings.EXPORT_ROOT, job.file_path)
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def get_download_token(job):
+        return signing.dumps({'export_id': job.export_id}, salt=DOWNLOAD_TOKEN_SALT)
+
+    @staticmethod
+    def check_download_token(job, token):
+        """Whether token was issued for job and is still within the export TTL."""
+        try:
+            data = signing.loads(token, salt=DOWNLOAD_TOKEN_SALT, max_age=settings.EXPORT_TTL_HOURS * 3600)
+        except signing.BadSignature:
+            return False
+        return data.get('export_id') == job.export_id
+
+    @staticmethod
+    def cleanup_expired_exports():
+        """Delete expired export archives and their jobs (cron job)."""
+        expired = ExportJob.objects.filter(expires_at__lte=timezone.now())
+        for job in expired:
+            if job.file_path:
+                path = os.path.join(settings.EXPORT_ROOT, job.file_path)
+                if os.path.exists(path):
+                    os.unlink(path)
+        expired.delete()
+
+    @staticmethod
+    def _write_file(zip_file, path, arcname, store=False):
+        """Copy a file into the ZIP in chunks, yielding after each one.
+
+        Already compressed formats, and files marked with store, are stored as they are.
+        """
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        if store or os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+        with open(path, 'rb') as source, zip_file.open(zinfo, 'w') as target:
+            while True:
+                chunk = source.read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                target.write(chunk)
+                yield
+        yield
     
     @staticmethod
-    def _export_uavs(zip_file, user):
+    def _rows(queryset, *extra):
+        """All concrete fields (plus extra lookups) of queryset as dicts, in one query."""
+        fields = [field.name for field in queryset.model._meta.concrete_fields]
+        return list(queryset.order_by('pk').values(*fields, *extra))
+
+    @staticmethod
+    def _write_json(zip_file, path, rows, exclude=()):
+        data = [{key: value for key, value in row.items() if key not in exclude} for row in rows]
+        zip_file.writestr(path, json.dumps(data, indent=2, cls=DjangoJSONEncoder))
+
+    @staticmethod
+    def _write_csv(zip_file, path, header, rows):
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+        writer.writerows(rows)
+        zip_file.writestr(path, output.getvalue())
+
+    @staticmethod
+    def _export_uavs(zip_file, user, since=None):
         """Export UAVs as JSON and CSV."""
-        uavs = UAV.objects.filter(user=user)
-        if not uavs.exists():
+        uavs = ExportService._rows(ExportService._changed(UAV.objects.filter(user=user), since))
+        if not uavs:
             return
-        
-        uavs_data = UAVSerializer(uavs, many=True).data
-        json_content = json.dumps(uavs_data, indent=2)
-        zip_file.writestr('uavs/uavs.json', json_content)
-        
-        if uavs.exists():
-            output = StringIO()
-            writer = csv.writer(output)
-            header = [
-                'uav_id', 'drone_name', 'manufacturer', 'type', 'motors',
-                'motor_type', 'video', 'video_system', 'esc', 'esc_firmware',
-                'receiver', 'receiver_firmware', 'flight_controller', 'firmware',
-                'firmware_version', 'gps', 'mag', 'baro', 'gyro', 'acc',
-                'registration_number', 'serial_number', 'is_active', 'image_file'
-            ]
-            writer.writerow(header)
-            for uav in uavs:
-                # The picture is also written out as a real image file so the
-                # export stays viewable outside the app (uavs.json keeps the
-                # data URI, which is what an import reads back).
-                image_path = ExportService._write_uav_image(zip_file, uav)
-                row = [
-                    uav.uav_id, uav.drone_name, uav.manufacturer, uav.type, uav.motors,
-                    uav.motor_type, uav.video, uav.video_system, uav.esc, uav.esc_firmware,
-                    uav.receiver, uav.receiver_firmware, uav.flight_controller, uav.firmware,
-                    uav.firmware_version, uav.gps, uav.mag, uav.baro, uav.gyro, uav.acc,
-                    uav.registration_number, uav.serial_number, uav.is_active, image_path
-                ]
-                writer.writerow(row)
-            zip_file.writestr('uavs/uavs.csv', output.getvalue())
 
-    @staticmethod
-    def _write_uav_image(zip_file, uav):
-        """Decode a UAV's base64 data URI into the ZIP. Returns the path used, or ''."""
-        if not uav.image:
-            return ''
+        # Maintenance dates are part of a UAV's representation, as in the API
+        reminders = MaintenanceReminder.objects.filter(
+            uav__user=user, uav_id__in=[uav['uav_id'] for uav in uavs], component__in=UAV_REMINDER_COMPONENTS
+        ).values_list('uav_id', 'component', 'last_maintenance', 'next_maintenance', 'reminder_active')
+        maintenance = {}
+        for uav_id, component, last_maintenance, next_maintenance, reminder_active in reminders:
+            maintenance.setdefault(uav_id, {}).update({
+                f'{component}_maint_date': last_maintenance,
+                f'{component}_reminder_date': next_maintenance,
+                f'{component}_reminder_active': reminder_active,
+            })
+        for uav in uavs:
+            uav.update(maintenance.get(uav['uav_id'], {}))
 
-        match = re.match(r'^data:image/([a-zA-Z0-9.+-]+);base64,(.*)$', uav.image, re.DOTALL)
-        if not match:
-            return ''
+        ExportService._write_json(zip_file, 'uavs/uavs.json', uavs, exclude=('image',))
+        yield
 
-        subtype, payload = match.groups()
-        extension = {'jpeg': 'jpg', 'svg+xml': 'svg'}.get(subtype.lower(), subtype.lower())
+        header = [
+            'uav_id', 'drone_name', 'manufacturer', 'type', 'motors',
+            'motor_type', 'video', 'video_system', 'esc', 'esc_firmware',
+            'receiver', 'receiver_firmware', 'flight_controller', 'firmware',
+            'firmware_version', 'gps', 'mag', 'baro', 'gyro', 'acc',
+            'registration_number', 'serial_number', 'is_active', 'image_file'
+        ]
+        rows = []
+        for uav in uavs:
+            # The picture travels as a real image file, which is also what an
+            # import reads back; uavs.json doesn't carry the server-side path.
+            uav['image_file'] = ExportService._write_uav_image(zip_file, uav['uav_id'], uav['image'])
+            if uav['image_file']:
+                yield
+            rows.append([uav[field] for field in header])
+        ExportService._write_csv(zip_file, 'uavs/uavs.csv', header, rows)
+        yield
 
-        try:
-            content = base64.b64decode(payload)
-        except (binascii.Error, ValueError):
+    @staticmethod
+    def _write_uav_image(zip_file, uav_id, image):
+        """Copy a UAV's stored picture into the ZIP. Returns the path used, or ''."""
+        source_path = UAVImageService.file_path(image)
+        if not source_path:
             return ''
 
-        path = f'uavs/images/uav_{uav.uav_id}.{extension}'
-        zip_file.writestr(path, content)
+        extension = os.path.splitext(source_path)[1].lstrip('.')
+        with open(source_path, 'rb') as f:
+            content = f.read()
+
+        path = f'uavs/images/uav_{uav_id}.{extension}'
+        zip_file.writestr(path, content, compress_type=zipfile.ZIP_STORED)
         return path
-    
+
     @staticmethod
-    def _export_uav_configs(zip_file, user):
+    def _export_uav_configs(zip_file, user, since=None):
         """Export UAV configs as JSON and CSV, include files."""
-        uav_configs = UAVConfig.objects.filter(user=user)
-        if not uav_configs.exists():
+        configs = ExportService._rows(
+            ExportService._changed(UAVConfig.objects.filter(user=user), since), 'uav__drone_name'
+        )
+        if not configs:
             return
-        
-        try:
-            from ..serializers import UAVConfigSerializer
-            configs_data = UAVConfigSerializer(uav_configs, many=True).data
-            json_content = json.dumps(configs_data, indent=2)
-            zip_file.writestr('uav_configs/uav_configs.json', json_content)
-        except ImportError:
-            # Fallback if serializer is missing
-            configs_data = [{
-                'config_id': config.config_id,
-                'uav_id': config.uav_id,
-                'name': config.name,
-                'note': config.note,
-                'upload_date': config.upload_date.isoformat(),
-                'file': config.file.name if config.file else None
-            } for config in uav_configs]
-            json_content = json.dumps(configs_data, indent=2)
-            zip_file.writestr('uav_configs/uav_configs.json', json_content)
-        
-        if uav_configs.exists():
-            output = StringIO()
-            writer = csv.writer(output)
-            header = [
-                'config_id', 'uav_id', 'drone_name', 'name', 'note',
-                'script', 'upload_date', 'file_path'
-            ]
-            writer.writerow(header)
-            for config in uav_configs:
-                file_path = config.file.name if config.file else ''
-                row = [
-                    config.config_id, config.uav_id, config.uav.drone_name,
-                    config.name, config.note, config.script, config.upload_date, file_path
-                ]
-                writer.writerow(row)
-                # Add config file to ZIP if present
-                if config.file and os.path.exists(config.file.path):
-                    file_name = os.path.basename(config.file.name)
-                    zip_file.write(config.file.path, f'uav_configs/files/{file_name}')
-            zip_file.writestr('uav_configs/uav_configs.csv', output.getvalue())
-    
+
+        ExportService._write_json(zip_file, 'uav_configs/uav_configs.json', configs, exclude={'uav__drone_name'})
+        yield
+
+        rows = []
+        for config in configs:
+            rows.append([
+                config['config_id'], config['uav'], config['uav__drone_name'], config['name'],
+                config['note'], config['script'], config['upload_date'], config['file']
+            ])
+            # Add config file to ZIP if present
+            if config['file']:
+                path = os.path.join(settings.MEDIA_ROOT, config['file'])
+                if os.path.exists(path):
+                    file_name = os.path.basename(config['file'])
+                    yield from ExportService._write_file(zip_file, path, f'uav_configs/files/{file_name}')
+        ExportService._write_csv(zip_file, 'uav_configs/uav_configs.csv', [
+            'config_id', 'uav_id', 'drone_name', 'name', 'note',
+            'script', 'upload_date', 'file_path'
+        ], rows)
+        yield
+
     @staticmethod
-    def _export_flight_logs(zip_file, user):
-        """Export flight logs as JSON and CSV. Include GPS logs and blackbox files."""
-        flight_logs = FlightLog.objects.filter(user=user)
-        if not flight_logs.exists():
+    def _export_flight_logs(zip_file, user, since=None):
+        """Export flight logs as JSON and CSV. Include blackbox files."""
+        flight_logs = ExportService._rows(
+            ExportService._changed(FlightLog.objects.filter(user=user), since), 'uav__drone_name'
+        )
+        if not flight_logs:
             return
 
-        logs_data = FlightLogSerializer(flight_logs, many=True).data
-        json_content = json.dumps(logs_data, indent=2)
-        zip_file.writestr('flight_logs/flight_logs.json', json_content)
-
-        if flight_logs.exists():
-            output = StringIO()
-            writer = csv.writer(output)
-            header = [
-                'flightlog_id', 'uav_id', 'drone_name', 'departure_place', 'departure_date',
-                'departure_time', 'landing_place', 'landing_time', 'flight_duration',
-                'takeoffs', 'landings', 'light_conditions', 'ops_conditions', 'pilot_type',
-                'comments', 'blackbox_log'
-            ]
-            writer.writerow(header)
-            for log in flight_logs:
-                row = [
-                    log.flightlog_id, log.uav_id, log.uav.drone_name, log.departure_place,
-                    log.departure_date, log.departure_time, log.landing_place,
-                    log.landing_time, log.flight_duration, log.takeoffs, log.landings,
-                    log.light_conditions, log.ops_conditions, log.pilot_type, log.comments,
-                    log.blackbox_log or ''
-                ]
-                writer.writerow(row)
-                # Add blackbox file to ZIP if present
-                if log.blackbox_log:
-                    blackbox_path = os.path.join(settings.MEDIA_ROOT, log.blackbox_log)
-                    if os.path.exists(blackbox_path):
-                        file_name = os.path.basename(log.blackbox_log)
-                        zip_file.write(blackbox_path, f'flight_logs/blackbox/{file_name}')
-                    # Add original blackbox file if present
-                    original_filename = os.path.splitext(os.path.basename(log.blackbox_log))[0] + '.txt'
-                    original_path = os.path.join(settings.BLACKBOX_ORIGINAL_ROOT, original_filename)
-                    if os.path.exists(original_path):
-                        zip_file.write(original_path, f'flight_logs/blackbox-original/{original_filename}')
-            zip_file.writestr('flight_logs/flight_logs.csv', output.getvalue())
-            # Export GPS logs per flight log
-            for log in flight_logs:
-                gps_logs = FlightGPSLog.objects.filter(flight_log=log)
-                if gps_logs.exists():
-                    gps_data = FlightGPSLogSerializer(gps_logs, many=True).data
-                    gps_json = json.dumps(gps_data, indent=2)
-                    zip_file.writestr(f'flight_logs/gps_data/flight_{log.flightlog_id}_gps.json', gps_json)
-    
+        ExportService._write_json(zip_file, 'flight_logs/flight_logs.json', flight_logs, exclude={'uav__drone_name'})
+        yield
+
+        header = [
+            'flightlog_id', 'uav_id', 'drone_name', 'departure_place', 'departure_date',
+            'departure_time', 'landing_place', 'landing_time', 'flight_duration',
+            'takeoffs', 'landings', 'light_conditions', 'ops_conditions', 'pilot_type',
+            'comments', 'blackbox_log'
+        ]
+        fields = {'uav_id': 'uav', 'drone_name': 'uav__drone_name'}
+        rows = []
+        for log in flight_logs:
+            log['blackbox_log'] = log['blackbox_log'] or ''
+            rows.append([log[fields.get(column, column)] for column in header])
+            # Add blackbox file to ZIP if present
+            if log['blackbox_log']:
+                blackbox_path = os.path.join(settings.MEDIA_ROOT, log['blackbox_log'])
+                if os.path.exists(blackbox_path):
+                    file_name = os.path.basename(log['blackbox_log'])
+                    yield from ExportService._write_file(zip_file, blackbox_path, f'flight_logs/blackbox/{file_name}')
+                # Add original blackbox file if present
+                original_filename = os.path.splitext(os.path.basename(log['blackbox_log']))[0] + '.txt'
+                original_path = os.path.join(settings.BLACKBOX_ORIGINAL_ROOT, original_filename)
+                if os.path.exists(original_path):
+                    # Raw flight controller logs (.bbl/.bfl content) barely deflate
+                    yield from ExportService._write_file(
+                        zip_file, original_path, f'flight_logs/blackbox-original/{original_filename}', store=True
+                    )
+        ExportService._write_csv(zip_file, 'flight_logs/flight_logs.csv', header, rows)
+        yield
+
+    @staticmethod
+    def _export_gps_data(zip_file, user, since=None):
+        """Export each flight's GPS track as columnar JSON, read through a single ordered cursor."""
+        columns = FlightGPSLogSerializer.Meta.fields
+        points = FlightGPSLog.objects.filter(flight_log__user=user)
+        if since:
+            points = points.filter(flight_log__updated_at__gte=since)
+        rows = points.order_by('flight_log_id', 'timestamp', 'id').values_list(
+            'flight_log_id', *columns
+        ).iterator(chunk_size=GPS_CHUNK_SIZE)
+
+        header = f'{{"columns":{_compact_json.encode(columns)},"rows":['.encode()
+        for flight_log_id, track in groupby(rows, key=itemgetter(0)):
+            zinfo = zipfile.ZipInfo(f'flight_logs/gps_data/flight_{flight_log_id}_gps.json', time.localtime()[:6])
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with zip_file.open(zinfo, 'w') as target:
+                target.write(header)
+                separator, batch = b'', []
+                for point in track:
+                    batch.append(_compact_json.encode(point[1:]))
+                    if len(batch) == GPS_CHUNK_SIZE:
+                        target.write(separator + ','.join(batch).encode())
+                        separator, batch = b',', []
+                        yield
+                if batch:
+                    target.write(separator + ','.join(batch).encode())
+                target.write(b']}')
+            yield
+
     @staticmethod
-    def _export_maintenance_logs(zip_file, user):
+    def _export_maintenance_logs(zip_file, user, since=None):
         """Export maintenance logs as JSON and CSV. Include files."""
-        maint_logs = MaintenanceLog.objects.filter(user=user)
-        if not maint_logs.exists():
+        maint_logs = ExportService._rows(
+            ExportService._changed(MaintenanceLog.objects.filter(user=user), since), 'uav__drone_name'
+        )
+        if not maint_logs:
             return
-        
-        logs_data = MaintenanceLogSerializer(maint_logs, many=True).data
-        json_content = json.dumps(logs_data, indent=2)
-        zip_file.writestr('maintenance_logs/maintenance_logs.json', json_content)
-        
-        if maint_logs.exists():
-            output = StringIO()
-            writer = csv.writer(output)
-            header = [
-                'maintenance_id', 'uav_id', 'drone_name', 'event_type', 
-                'description', 'event_date', 'file_path'
-            ]
-            writer.writerow(header)
-            for log in maint_logs:
-                file_path = log.file.name if log.file else ''
-                row = [
-                    log.maintenance_id, log.uav_id, log.uav.drone_name, 
-                    log.event_type, log.description, log.event_date, file_path
-                ]
-                writer.writerow(row)
-                # Add maintenance file to ZIP if present
-                if log.file and os.path.exists(log.file.path):
-                    file_name = os.path.basename(log.file.name)
-                    zip_file.write(log.file.path, f'maintenance_logs/files/{file_name}')
-            zip_file.writestr('maintenance_logs/maintenance_logs.csv', output.getvalue())
-    
+
+        ExportService._write_json(zip_file, 'maintenance_logs/maintenance_logs.json', maint_logs, exclude={'uav__drone_name'})
+        yield
+
+        rows = []
+        for log in maint_logs:
+            rows.append([
+                log['maintenance_id'], log['uav'], log['uav__drone_name'],
+                log['event_type'], log['description'], log['event_date'], log['file'] or ''
+            ])
+            # Add maintenance file to ZIP if present
+            if log['file']:
+                path = os.path.join(settings.MEDIA_ROOT, log['file'])
+                if os.path.exists(path):
+                    file_name = os.path.basename(log['file'])
+                    yield from ExportService._write_file(zip_file, path, f'maintenance_logs/files/{file_name}')
+        ExportService._write_csv(zip_file, 'maintenance_logs/maintenance_logs.csv', [
+            'maintenance_id', 'uav_id', 'drone_name', 'event_type',
+            'description', 'event_date', 'file_path'
+        ], rows)
+        yield
+
     @staticmethod
-    def _export_maintenance_reminders(zip_file, user):
+    def _export_maintenance_reminders(zip_file, user, since=None):
         """Export maintenance reminders as JSON and CSV."""
-        reminders = MaintenanceReminder.objects.filter(uav__user=user)
-        if not reminders.exists():
+        reminders = ExportService._rows(
+            ExportService._changed(MaintenanceReminder.objects.filter(uav__user=user), since), 'uav__drone_name'
+        )
+        if not reminders:
             return
-        
-        reminders_data = MaintenanceReminderSerializer(reminders, many=True).data
-        json_content = json.dumps(reminders_data, indent=2)
-        zip_file.writestr('maintenance_reminders/reminders.json', json_content)
-        
-        if reminders.exists():
-            output = StringIO()
-            writer = csv.writer(output)
-            header = [
-                'reminder_id', 'uav_id', 'drone_name', 'component', 
-                'last_maintenance', 'next_maintenance', 'reminder_active'
+
+        ExportService._write_json(zip_file, 'maintenance_reminders/reminders.json', reminders, exclude={'uav__drone_name'})
+        yield
+
+        ExportService._write_csv(zip_file, 'maintenance_reminders/reminders.csv', [
+            'reminder_id', 'uav_id', 'drone_name', 'component',
+            'last_maintenance', 'next_maintenance', 'reminder_active'
+        ], [
+            [
+                reminder['reminder_id'], reminder['uav'], reminder['uav__drone_name'], reminder['component'],
+                reminder['last_maintenance'], reminder['next_maintenance'], reminder['reminder_active']
             ]
-            writer.writerow(header)
-            for reminder in reminders:
-                row = [
-                    reminder.reminder_id, reminder.uav_id, reminder.uav.drone_name,
-                    reminder.component, reminder.last_maintenance,
-                    reminder.next_maintenance, reminder.reminder_active
-                ]
-                writer.writerow(row)
-            zip_file.writestr('maintenance_reminders/reminders.csv', output.getvalue())
+            for reminder in reminders
+        ])
+        yield
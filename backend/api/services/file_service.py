@@ -1,9 +1,13 @@
 import os
+import re
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 
 class FileService:
     # Directory name for UAV configs
     UAV_CONFIGS_DIR = 'uav_configs'
+    # Read size for streamed downloads
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
     
     @staticmethod
     def get_files_queryset(user, query_params=None):
@@ -78,3 +82,53 @@ class FileService:
                 os.remove(file_path)
         except (ValueError, OSError) as e:
             pass
+
+    @staticmethod
+    def _parse_range(range_header, file_size):
+        """Return (start, end) of a single `bytes=` range, None without one, or False if unsatisfiable."""
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', (range_header or '').strip())
+        if not match or match.groups() == ('', ''):
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), file_size - 1) if last else file_size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(file_size - int(last), 0)
+            end = file_size - 1
+        if start > end or start >= file_size:
+            return False
+        return start, end
+
+    @staticmethod
+    def range_file_response(file_path, range_header, content_type, filename):
+        """Stream a file, honouring a single-range Range header so downloads can resume."""
+        file_size = os.path.getsize(file_path)
+        byte_range = FileService._parse_range(range_header, file_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{file_size}'
+            return response
+
+        start, end = byte_range or (0, file_size - 1)
+
+        def read_range():
+            with open(file_path, 'rb') as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = f.read(min(FileService.DOWNLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+        response = StreamingHttpResponse(read_range(), status=206 if byte_range else 200, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+        return response
@@ -1,6 +1,50 @@
+import csv
+import io
+import re
+from datetime import datetime
 from django.db import transaction
+from django.utils import timezone
+
+# Rows per INSERT when attaching TeleLog files
+GPS_INSERT_BATCH_SIZE = 5000
+
+# Columns of a radio TeleLog, mapped to FlightGPSLog fields and their type
+TELELOG_COLUMNS = [
+    ('time', 'timestamp', int), ('GPS_numSat', 'num_sat', int), ('GPS_coord[0]', 'latitude', float),
+    ('GPS_coord[1]', 'longitude', float), ('GPS_altitude', 'altitude', float), ('GPS_speed', 'speed', float),
+    ('GPS_ground_course', 'ground_course', float), ('VSpd', 'vertical_speed', float), ('Pitch', 'pitch', float),
+    ('Roll', 'roll', float), ('Yaw', 'yaw', float), ('RxBt', 'receiver_battery', float), ('Curr', 'current', float),
+    ('Capa', 'capacity', float), ('RQly', 'receiver_quality', int), ('TQly', 'transmitter_quality', int),
+    ('TPWR', 'transmitter_power', int), ('Ail', 'aileron', float), ('Ele', 'elevator', float),
+    ('Thr', 'throttle', float), ('Rud', 'rudder', float),
+]
+
+# <modelName>_TeleLog_<YYYYMMDD>_<HHMMSS>.csv as written by the radio-side Lua script
+TELELOG_NAME = re.compile(r'^(?P<model>[\w-]+)_TeleLog_(?P<date>\d{8})_(?P<time>\d{6})\.csv$', re.ASCII | re.IGNORECASE)
+
+
+def _telelog_model_name(name):
+    # Same substitution as the Lua script: keep alphanumerics, underscore and hyphen
+    return re.sub(r'[^\w-]', '_', name or '', flags=re.ASCII).lower()
+
+
+def _telelog_value(parse, value):
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        return int(float(value)) if parse is int else float(value)
+    except ValueError:
+        return None
+
 
 class GPSService:
+    @staticmethod
+    def _touch_flight_log(flight_log):
+        # GPS rows have no timestamp of their own; mark the flight log as changed for delta exports
+        from ..models import FlightLog
+        FlightLog.objects.filter(pk=flight_log.pk).update(updated_at=timezone.now())
+
     @staticmethod
     def get_gps_logs(flight_log):
         # Return all GPS logs for the given flight log
@@ -14,6 +58,7 @@ class GPSService:
         from ..models import FlightGPSLog
         
         FlightGPSLog.objects.filter(flight_log=flight_log).delete()
+        GPSService._touch_flight_log(flight_log)
         
         gps_logs = []
         
@@ -57,4 +102,100 @@ class GPSService:
         from ..models import FlightGPSLog
         
         deleted_count, _ = FlightGPSLog.objects.filter(flight_log=flight_log).delete()
+        GPSService._touch_flight_log(flight_log)
         return deleted_count
+
+    @staticmethod
+    def parse_telelog(telelog_file):
+        """Return the GPS points of an uploaded TeleLog CSV, read as a stream."""
+        text = io.TextIOWrapper(telelog_file, encoding='utf-8', newline='')
+        try:
+            reader = csv.reader(text)
+            header = [column.strip() for column in next(reader, [])]
+            if header != [column for column, _, _ in TELELOG_COLUMNS]:
+                raise ValueError('The file header does not match the expected TeleLog format')
+
+            points = []
+            for row in reader:
+                point = {
+                    field: _telelog_value(parse, value)
+                    for (_, field, parse), value in zip(TELELOG_COLUMNS, row)
+                }
+                if point.get('latitude') is None or point.get('longitude') is None:
+                    continue
+                point['timestamp'] = point['timestamp'] or 0
+                points.append(point)
+        finally:
+            text.detach()
+
+        if not points:
+            raise ValueError('No valid GPS coordinates found in the file')
+        return points
+
+    @staticmethod
+    def _match_telelogs(user, files):
+        """Map each TeleLog file to a flight log of user by its model name and departure date/time."""
+        from ..models import FlightLog
+
+        wanted = {}
+        for telelog_file in files:
+            match = TELELOG_NAME.match(telelog_file.name)
+            if not match:
+                continue
+            try:
+                departure = datetime.strptime(match['date'] + match['time'], '%Y%m%d%H%M%S')
+            except ValueError:
+                continue
+            wanted[telelog_file.name] = (match['model'].lower(), departure.date(), departure.time())
+
+        flight_logs = {}
+        candidates = FlightLog.objects.filter(
+            user=user, departure_date__in={departure_date for _, departure_date, _ in wanted.values()}
+        ).select_related('uav').only('flightlog_id', 'departure_date', 'departure_time', 'uav__drone_name', 'uav__serial_number')
+        for flight_log in candidates:
+            for name in (flight_log.uav.drone_name, flight_log.uav.serial_number):
+                if name:
+                    key = (_telelog_model_name(name), flight_log.departure_date, flight_log.departure_time)
+                    flight_logs.setdefault(key, flight_log)
+
+        return {file_name: flight_logs.get(key) for file_name, key in wanted.items()}
+
+    @staticmethod
+    def attach_telelogs(user, files):
+        """Attach many TeleLog files to the matching flight logs of user.
+
+        Files are parsed and written one at a time, each in its own transaction
+        replacing the GPS data already stored; unreadable files are reported.
+        """
+        from ..models import FlightGPSLog, FlightLog
+
+        matches = GPSService._match_telelogs(user, files)
+        result = {'attached': [], 'unmatched': [], 'failed': []}
+
+        claimed = set()
+        for telelog_file in files:
+            flight_log = matches.get(telelog_file.name)
+            if flight_log is None:
+                result['unmatched'].append(telelog_file.name)
+                continue
+            if flight_log.pk in claimed:
+                result['failed'].append({'file': telelog_file.name, 'error': 'Another file matches the same flight log'})
+                continue
+            claimed.add(flight_log.pk)
+
+            try:
+                points = GPSService.parse_telelog(telelog_file)
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                result['failed'].append({'file': telelog_file.name, 'error': str(e)})
+                continue
+
+            with transaction.atomic():
+                FlightGPSLog.objects.filter(flight_log=flight_log).delete()
+                FlightGPSLog.objects.bulk_create(
+                    (FlightGPSLog(flight_log=flight_log, **point) for point in points),
+                    batch_size=GPS_INSERT_BATCH_SIZE
+                )
+                FlightLog.objects.filter(pk=flight_log.pk).update(updated_at=timezone.now())
+            result['attached'].append({'file': telelog_file.name, 'flightlog_id': flight_log.pk, 'points': len(points)})
+
+        return result
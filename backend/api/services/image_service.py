@@ -0,0 +1,163 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+from django.conf import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow missing: pictures are served at their original size only
+    Image = None
+
+# Upper bound for the base64 data URI of a UAV image (a 256x256 picture stays
+# far below this; the limit only guards against oversized payloads).
+MAX_UAV_IMAGE_LENGTH = 2 * 1024 * 1024
+
+DATA_URI = re.compile(r'^data:image/([a-zA-Z0-9.+-]+);base64,(.*)$', re.DOTALL)
+
+# Served file extension -> content type
+IMAGE_CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+# Edge lengths in pixels of the WebP thumbnails made of every picture
+UAV_THUMBNAIL_SIZES = (32, 64, 256)
+
+# Names are content hashes, so a URL never changes meaning
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class UAVImageService:
+    """UAV pictures as files under MEDIA_ROOT named by the hash of their content."""
+
+    # Directory name for UAV pictures
+    UAV_IMAGES_DIR = 'uav_images'
+
+    @staticmethod
+    def extension_for(subtype):
+        """File extension for an image/<subtype> content type, or None if not served."""
+        extension = {'jpeg': 'jpg'}.get(subtype.lower(), subtype.lower())
+        return extension if extension in IMAGE_CONTENT_TYPES else None
+
+    @staticmethod
+    def _write_atomically(path, write):
+        # Write under a temporary name so a reader never sees a partial file
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def store(content, extension):
+        """Write a picture and its thumbnails once and return its path relative to MEDIA_ROOT."""
+        if len(content) > MAX_UAV_IMAGE_LENGTH * 3 // 4:
+            raise ValueError("Image is too large.")
+
+        name = f'{hashlib.sha256(content).hexdigest()}.{extension}'
+        directory = os.path.join(settings.MEDIA_ROOT, UAVImageService.UAV_IMAGES_DIR)
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            os.makedirs(directory, exist_ok=True)
+            UAVImageService._write_atomically(path, lambda f: f.write(content))
+        image = f'{UAVImageService.UAV_IMAGES_DIR}/{name}'
+        UAVImageService.write_thumbnails(image)
+        return image
+
+    @staticmethod
+    def _thumbnail_name(image, size):
+        return f'{os.path.splitext(os.path.basename(image))[0]}_{size}.webp'
+
+    @staticmethod
+    def write_thumbnails(image):
+        """Create the missing WebP thumbnails of a stored picture (needs Pillow)."""
+        source_path = UAVImageService.file_path(image)
+        if Image is None or not source_path:
+            return
+
+        directory = os.path.dirname(source_path)
+        missing = [
+            size for size in UAV_THUMBNAIL_SIZES
+            if not os.path.isfile(os.path.join(directory, UAVImageService._thumbnail_name(image, size)))
+        ]
+        if not missing:
+            return
+
+        try:
+            with Image.open(source_path) as source:
+                source = source.convert('RGBA')
+                for size in missing:
+                    thumbnail = source.copy()
+                    thumbnail.thumbnail((size, size), Image.LANCZOS)
+                    UAVImageService._write_atomically(
+                        os.path.join(directory, UAVImageService._thumbnail_name(image, size)),
+                        lambda f: thumbnail.save(f, 'WEBP', quality=80, method=6)
+                    )
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # Not a raster format Pillow reads (e.g. SVG): the original is served alone
+            pass
+
+    @staticmethod
+    def thumbnails(image):
+        """{size: thumbnail path relative to MEDIA_ROOT} of the thumbnails a picture has."""
+        if not image:
+            return {}
+        directory = os.path.join(settings.MEDIA_ROOT, UAVImageService.UAV_IMAGES_DIR)
+        result = {}
+        for size in UAV_THUMBNAIL_SIZES:
+            name = UAVImageService._thumbnail_name(image, size)
+            if os.path.isfile(os.path.join(directory, name)):
+                result[size] = f'{UAVImageService.UAV_IMAGES_DIR}/{name}'
+        return result
+
+    @staticmethod
+    def decode_data_uri(data_uri):
+        """(content, extension) of a base64 data URI as sent by the client; raises ValueError if it isn't one."""
+        match = DATA_URI.match(data_uri or '')
+        if not match:
+            raise ValueError("Image must be a base64 data URI (data:image/...).")
+
+        if len(data_uri) > MAX_UAV_IMAGE_LENGTH:
+            raise ValueError("Image is too large.")
+
+        subtype, payload = match.groups()
+        extension = UAVImageService.extension_for(subtype)
+        if extension is None:
+            raise ValueError(f"Unsupported image type: {subtype}")
+        try:
+            content = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("Image is not valid base64.")
+        return content, extension
+
+    @staticmethod
+    def store_data_uri(data_uri):
+        """Store a base64 data URI as sent by the client; raises ValueError if it isn't one."""
+        return UAVImageService.store(*UAVImageService.decode_data_uri(data_uri))
+
+    @staticmethod
+    def file_path(image):
+        """Absolute path of a stored picture, or None if it doesn't exist."""
+        if not image:
+            return None
+        path = os.path.join(settings.MEDIA_ROOT, UAVImageService.UAV_IMAGES_DIR, os.path.basename(image))
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def release(image):
+        """Delete a picture and its thumbnails once no UAV refers to it any more."""
+        from ..models import UAV
+        path = UAVImageService.file_path(image)
+        if path and not UAV.objects.filter(image=image).exists():
+            # A concurrent release of the same picture may have removed files already
+            for file_path in [
+                *(os.path.join(settings.MEDIA_ROOT, thumbnail) for thumbnail in UAVImageService.thumbnails(image).values()),
+                path,
+            ]:
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
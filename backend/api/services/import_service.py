@@ -1,31 +1,248 @@
 import os
 import json
-import base64
+import shutil
 import zipfile
+import posixpath
 import tempfile
-from django.db import transaction
-from django.core.files.base import ContentFile
+import threading
+from contextlib import ExitStack
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.utils.dateparse import parse_date, parse_time
 from django.core.files.storage import default_storage
 from django.conf import settings
-from ..models import UAV, FlightLog, MaintenanceLog, MaintenanceReminder, FlightGPSLog, UAVConfig
-from ..serializers import MAX_UAV_IMAGE_LENGTH
+from ..models import (UAV, FlightLog, MaintenanceLog, MaintenanceReminder, FlightGPSLog, UAVConfig,
+                      ImportedRecord, ImportJob, TRACKED_MODEL_NAMES)
+from .image_service import UAVImageService
+
+# Read size when copying archive members and uploads
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# Rows per INSERT when creating imported records
+IMPORT_BATCH_SIZE = 1000
+
+# Sample records listed per outcome in a dry run
+IMPORT_PREVIEW_SAMPLES = 5
+
+# Skipped-record messages kept in an import's result; the rest are only counted
+IMPORT_RECORD_ERRORS_KEPT = 100
+
+# Maintenance dates of exported UAVs; imported as reminders, not UAV fields
+UAV_MAINTENANCE_FIELDS = [
+    'props_maint_date', 'motor_maint_date', 'frame_maint_date',
+    'props_reminder_date', 'motor_reminder_date', 'frame_reminder_date',
+    'props_reminder_active', 'motor_reminder_active', 'frame_reminder_active'
+]
+
+# Phases of an import, in the order they run and are reported in job progress
+IMPORT_PHASES = [
+    'uavs', 'uav_configs', 'flight_logs', 'gps_data', 'blackbox_files',
+    'maintenance_logs', 'maintenance_reminders', 'deletions'
+]
+
+# Archive fields that aren't set on a new record: relations and files are
+# linked separately and GPS data comes from its own files
+ARCHIVE_ONLY_FIELDS = {'uav', 'uav_id', 'created_at', 'file', 'gps_logs', 'blackbox_log', 'has_gps_log'}
+
+# Never copied onto an existing record when a delta archive updates it
+NON_UPDATABLE_FIELDS = {'user', 'created_at', 'updated_at', 'file', 'image', 'blackbox_log'}
+
+
+def _as_date(value):
+    """Archive dates are ISO strings; compare them as dates."""
+    if isinstance(value, str):
+        try:
+            return parse_date(value) or value
+        except ValueError:
+            return value
+    return value
+
+
+def _as_time(value):
+    if isinstance(value, str):
+        try:
+            return parse_time(value) or value
+        except ValueError:
+            return value
+    return value
+
+
+class _KeyIndex:
+    """In-memory natural keys for duplicate detection during an import.
+
+    Records are grouped by an exact key; optional values only have to match
+    when the incoming record has them. Entries are existing primary keys or
+    not yet saved instances, so duplicates within one archive are caught too.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def add(self, key, optional, record):
+        self._entries.setdefault(key, []).append((optional, record))
+
+    def match(self, key, optional):
+        """The first record (lowest id, like .first()) matching key and every given optional value."""
+        for existing, record in self._entries.get(key, ()):
+            if all(not value or value == other for value, other in zip(optional, existing)):
+                return record
+        return None
+
+    @staticmethod
+    def pk(record):
+        return getattr(record, 'pk', record)
+
+
+class _SyncState:
+    """Archive id -> local id mapping of one import, persisted per exporting account.
+
+    Archives without a manifest have no source; they are matched by content only.
+    """
+
+    def __init__(self, user, manifest):
+        self.user = user
+        self.source = manifest.get('source')
+        self.delta = manifest.get('type') == 'delta'
+        self.updated = 0
+        self.mapping = {}
+        self._records = {}
+        self._pending = {}
+        if self.source:
+            self.mapping = {
+                (model_name, source_id): local_id
+                for model_name, source_id, local_id in ImportedRecord.objects.filter(
+                    user=user, source=self.source
+                ).values_list('model_name', 'source_id', 'local_id')
+            }
+
+    @staticmethod
+    def _user_records(model, user):
+        if model is MaintenanceReminder:
+            return model.objects.filter(uav__user=user)
+        return model.objects.filter(user=user)
+
+    def find(self, model, source_id):
+        """The local record an archive record was imported into before, if it still exists."""
+        model_name = TRACKED_MODEL_NAMES[model]
+        local_id = self.mapping.get((model_name, source_id))
+        if local_id is None:
+            return None
+        if model not in self._records:
+            # All mapped records of a model are loaded together on first use
+            local_ids = [local for (name, _), local in self.mapping.items() if name == model_name]
+            self._records[model] = self._user_records(model, self.user).in_bulk(local_ids)
+        return self._records[model].get(local_id)
+
+    def remember(self, model, source_id, local_id):
+        """Queue the mapping of an archive record; written by flush()."""
+        if not self.source or source_id is None:
+            return
+        key = (TRACKED_MODEL_NAMES[model], source_id)
+        if self.mapping.get(key) == local_id:
+            return
+        self.mapping[key] = local_id
+        self._pending[key] = local_id
+
+    def flush(self):
+        if not self._pending:
+            return
+        ImportedRecord.objects.bulk_create(
+            [
+                ImportedRecord(user=self.user, source=self.source, model_name=model_name, source_id=source_id, local_id=local_id)
+                for (model_name, source_id), local_id in self._pending.items()
+            ],
+            batch_size=IMPORT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['user', 'source', 'model_name', 'source_id'],
+            update_fields=['local_id'],
+        )
+        self._pending.clear()
+
+    def uav_mapping(self):
+        """Initial archive UAV id -> local UAV id mapping for the importers."""
+        source_ids = {
+            source_id: local_id for (model_name, source_id), local_id in self.mapping.items()
+            if model_name == TRACKED_MODEL_NAMES[UAV]
+        }
+        existing = set(UAV.objects.filter(user=self.user, uav_id__in=source_ids.values()).values_list('uav_id', flat=True))
+        return {source_id: local_id for source_id, local_id in source_ids.items() if local_id in existing}
+
+    def update(self, instance, data):
+        """Copy the archive's values onto a matched record when applying a delta archive."""
+        if not self.delta:
+            return False
+        for field in instance._meta.concrete_fields:
+            if field.primary_key or field.name in NON_UPDATABLE_FIELDS:
+                continue
+            if field.attname in data:
+                setattr(instance, field.attname, data[field.attname])
+            elif field.name in data and not field.is_relation:
+                setattr(instance, field.name, data[field.name])
+        instance.save()
+        self.updated += 1
+        return True
+
+    def apply_deletions(self, deletions):
+        """Delete the local copies of records deleted in the source account."""
+        models = {name: model for model, name in TRACKED_MODEL_NAMES.items()}
+        deleted = 0
+        for deletion in deletions:
+            model = models.get(deletion.get('model'))
+            if model is None:
+                continue
+            instance = self.find(model, deletion.get('id'))
+            if instance is not None:
+                instance.delete()
+                deleted += 1
+            ImportedRecord.objects.filter(
+                user=self.user, source=self.source, model_name=deletion['model'], source_id=deletion.get('id')
+            ).delete()
+        return deleted
+
+
+class _Preview:
+    """Outcome counts of one section of a dry run, with a few sample records each."""
+
+    OUTCOMES = ('new', 'duplicate', 'unmapped', 'invalid')
+
+    def __init__(self):
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+        self.samples = {outcome: [] for outcome in self.OUTCOMES}
+
+    def add(self, outcome, sample):
+        self.counts[outcome] += 1
+        if len(self.samples[outcome]) < IMPORT_PREVIEW_SAMPLES:
+            self.samples[outcome].append(sample)
+
+    def as_dict(self):
+        return {**self.counts, 'samples': self.samples}
+
 
 class ImportService:
     @staticmethod
-    def _get_new_uav_id(user, old_uav_id, uav_mapping, data):
+    def _archive_uav_id(data):
+        """UAV id of an archive record, stored flat or as a nested UAV."""
+        if data.get('uav_id'):
+            return data['uav_id']
+        return data['uav'].get('uav_id') if isinstance(data.get('uav'), dict) else data.get('uav')
+
+    @staticmethod
+    def _uav_ids_by_name(user):
+        """drone_name -> uav_id of the user's UAVs, in id order, for _get_new_uav_id."""
+        return dict(UAV.objects.filter(user=user).order_by('uav_id').values_list('drone_name', 'uav_id'))
+
+    @staticmethod
+    def _get_new_uav_id(old_uav_id, uav_mapping, data, uav_ids_by_name):
         # Helper to resolve new UAV ID from old ID or drone name
         if old_uav_id is not None and old_uav_id in uav_mapping:
             return uav_mapping[old_uav_id]
         elif 'drone_name' in data:
-            drone_name = data.get('drone_name')
-            matching_uavs = UAV.objects.filter(user=user, drone_name=drone_name)
-            if matching_uavs.exists():
-                return matching_uavs.first().uav_id
+            return uav_ids_by_name.get(data.get('drone_name'))
         else:
-            existing_uavs = UAV.objects.filter(user=user)
-            if existing_uavs.exists():
-                return existing_uavs.first().uav_id
-        return None
+            return next(iter(uav_ids_by_name.values()), None)
 
     @staticmethod
     def _remove_conflict_fields(data, fields):
@@ -34,23 +251,163 @@ class ImportService:
             data.pop(field, None)
 
     @staticmethod
-    def _save_file_to_storage(model_instance, file_name, file_content, path_func):
-        # Save file to storage using model's path function
+    def _save_file_to_storage(model_instance, file_name, source, path_func):
+        # Save a file object to storage (copied in chunks) using model's path function
         new_path = path_func(model_instance, file_name)
-        saved_path = default_storage.save(new_path, ContentFile(file_content))
+        saved_path = default_storage.save(new_path, File(source, name=file_name))
         return saved_path
 
     @staticmethod
-    def import_user_data(user, zip_file):
+    def _archive_source(zip_file, stack):
+        """Something zipfile can seek in, without copying uploads that already are one.
+
+        Large uploads are temporary files on disk and small ones are held in
+        memory by Django; only non-seekable streams are spooled to disk once.
+        """
+        if isinstance(zip_file, str):
+            if not os.path.exists(zip_file):
+                raise ValueError("Invalid zip file provided")
+            return zip_file
+        if hasattr(zip_file, 'temporary_file_path'):
+            return zip_file.temporary_file_path()
+        if not hasattr(zip_file, 'read'):
+            raise ValueError("Invalid zip file provided")
+        if zip_file.seekable():
+            zip_file.seek(0)
+            return zip_file
+
+        spool = stack.enter_context(tempfile.TemporaryFile())
+        shutil.copyfileobj(zip_file, spool, FILE_CHUNK_SIZE)
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    def _read_json(archive, name):
+        with archive.open(name) as f:
+            return json.load(f)
+
+    @staticmethod
+    def create_import_job(user, upload):
+        """Store the upload and queue a background import; it starts once the surrounding transaction commits."""
+        job = ImportJob.objects.create(user=user, progress={phase: 'pending' for phase in IMPORT_PHASES})
+
+        os.makedirs(settings.IMPORT_ROOT, exist_ok=True)
+        job.file_path = f"import_{job.import_id}.zip"
+        with open(os.path.join(settings.IMPORT_ROOT, job.file_path), 'wb') as f:
+            for chunk in upload.chunks(FILE_CHUNK_SIZE):
+                f.write(chunk)
+        job.save(update_fields=['file_path'])
+
+        transaction.on_commit(lambda: threading.Thread(
+            target=ImportService._run_import_job_thread, args=(job.import_id,), daemon=True
+        ).start())
+        return job
+
+    @staticmethod
+    def _run_import_job_thread(import_id):
+        try:
+            ImportService.run_import_job(import_id)
+        finally:
+            # Release the database connection opened by this thread
+            connection.close()
+
+    @staticmethod
+    def run_import_job(import_id):
+        """Import the stored archive of a job, recording progress per phase and the final result.
+
+        Any error marks the job failed, so clients polling it don't wait forever.
+        """
+        try:
+            return ImportService._run_import(import_id)
+        except Exception as e:
+            ImportService._remove_upload(import_id)
+            ImportJob.objects.filter(import_id=import_id, status__in=['pending', 'running']).update(
+                status='failed', error=str(e), completed_at=timezone.now()
+            )
+            return ImportJob.objects.filter(import_id=import_id).first()
+
+    @staticmethod
+    def _remove_upload(import_id):
+        path = os.path.join(settings.IMPORT_ROOT, f"import_{import_id}.zip")
+        if os.path.exists(path):
+            os.unlink(path)
+
+    @staticmethod
+    def fail_stale_import_jobs():
+        """Mark jobs failed whose worker stopped reporting progress (cron job)."""
+        cutoff = timezone.now() - timedelta(minutes=settings.IMPORT_JOB_TIMEOUT_MINUTES)
+        stale = ImportJob.objects.filter(status__in=['pending', 'running'], updated_at__lte=cutoff)
+        for import_id in stale.values_list('import_id', flat=True):
+            # Only remove the upload of a job this sweep actually failed
+            if stale.filter(import_id=import_id).update(
+                status='failed', error='The import was interrupted. Please start it again.',
+                completed_at=timezone.now()
+            ):
+                ImportService._remove_upload(import_id)
+
+    @staticmethod
+    def _run_import(import_id):
+        job = ImportJob.objects.select_related('user').get(import_id=import_id)
+        path = os.path.join(settings.IMPORT_ROOT, job.file_path or '')
+        try:
+            if job.cancel_requested:
+                job.status = 'cancelled'
+                return job
+
+            job.status = 'running'
+            job.save(update_fields=['status', 'updated_at'])
+
+            def on_phase(phase, state):
+                job.progress[phase] = state
+                job.save(update_fields=['progress', 'updated_at'])
+
+            def is_cancelled():
+                return ImportJob.objects.filter(import_id=import_id, cancel_requested=True).exists()
+
+            job.result = ImportService.import_user_data(job.user, path, on_phase, is_cancelled)
+            if job.result.get('cancelled'):
+                job.status = 'cancelled'
+            elif job.result['success']:
+                job.status = 'completed'
+            else:
+                job.status = 'failed'
+                job.error = job.result['message']
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.completed_at = timezone.now()
+            # A job the sweep has failed meanwhile stays failed
+            if not ImportJob.objects.filter(import_id=import_id, status__in=['pending', 'running']).update(
+                status=job.status, result=job.result, error=job.error,
+                completed_at=job.completed_at, updated_at=job.completed_at
+            ):
+                job.refresh_from_db()
+            if job.file_path and os.path.exists(path):
+                os.unlink(path)
+        return job
+
+    @staticmethod
+    def cancel_import_job(job):
+        """Ask a job to stop before its next phase."""
+        if job.status in ('pending', 'running'):
+            job.cancel_requested = True
+            job.save(update_fields=['cancel_requested'])
+        return job
+
+    @staticmethod
+    def import_user_data(user, zip_file, on_phase=None, is_cancelled=None):
         """
         Import drone data (UAVs, flight logs, maintenance logs, reminders) from a ZIP file
         
         Parameters:
         - user: User object
-        - zip_file: Django UploadedFile object
+        - zip_file: Django UploadedFile object or path of the archive
+        - on_phase: optional callback(phase, state) as each phase starts and finishes
+        - is_cancelled: optional callable checked before each phase
         """
-        # Use temp directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # Members are read straight from the archive; nothing is extracted
+        with ExitStack() as stack:
             try:
                 result = {
                     'success': True,
@@ -58,110 +415,108 @@ class ImportService:
                         'uavs_imported': 0,
                         'uav_configs_imported': 0,
                         'flight_logs_imported': 0,
+                        'gps_points_imported': 0,
                         'blackbox_files_imported': 0,
                         'maintenance_logs_imported': 0,
                         'maintenance_reminders_imported': 0,
+                        'records_updated': 0,
+                        'records_deleted': 0,
                         'errors': []
                     }
                 }
                 
-                # Write uploaded file to temp file
-                temp_zip = os.path.join(temp_dir, 'uploaded_data.zip')
-                with open(temp_zip, 'wb') as f:
-                    # Handle Django UploadedFile or file path
-                    if hasattr(zip_file, 'read'):
-                        f.write(zip_file.read())
-                    elif isinstance(zip_file, str) and os.path.exists(zip_file):
-                        with open(zip_file, 'rb') as src:
-                            f.write(src.read())
-                    else:
-                        raise ValueError("Invalid zip file provided")
-                
-                # Extract ZIP
-                with zipfile.ZipFile(temp_zip, 'r') as z:
-                    z.extractall(temp_dir)
-                
-                # UAV import
-                uav_mapping = {}  # old_id -> new_id
-                uavs_path = os.path.join(temp_dir, 'uavs', 'uavs.json')
-                if os.path.exists(uavs_path):
-                    try:
-                        with transaction.atomic():
-                            imported_count = ImportService._import_uavs(
-                                user, uavs_path, uav_mapping, temp_dir
-                            )
-                            result['details']['uavs_imported'] = imported_count
-                    except Exception as e:
-                        result['details']['errors'].append(f"UAVs import error: {str(e)}")
-                
-                # UAV config import
-                uav_configs_path = os.path.join(temp_dir, 'uav_configs', 'uav_configs.json')
-                if os.path.exists(uav_configs_path):
-                    try:
-                        with transaction.atomic():
-                            imported_count = ImportService._import_uav_configs(
-                                user, uav_configs_path, uav_mapping, temp_dir
-                            )
-                            result['details']['uav_configs_imported'] = imported_count
-                    except Exception as e:
-                        result['details']['errors'].append(f"UAV configuration files import error: {str(e)}")
-                
-                # Flight log import
-                flight_logs_path = os.path.join(temp_dir, 'flight_logs', 'flight_logs.json')
-                if os.path.exists(flight_logs_path):
-                    try:
-                        with transaction.atomic():
-                            flight_log_mapping = {}   # old_id -> new_id
-                            blackbox_mapping = {}     # new_id -> old relative path
-                            imported_count = ImportService._import_flight_logs(
-                                user, flight_logs_path, uav_mapping, flight_log_mapping, blackbox_mapping
-                            )
-                            result['details']['flight_logs_imported'] = imported_count
-
-                            # Import GPS data for flight logs
-                            gps_dir = os.path.join(temp_dir, 'flight_logs', 'gps_data')
-                            if os.path.exists(gps_dir):
-                                ImportService._import_gps_data(gps_dir, flight_log_mapping)
-
-                            # Import blackbox files for flight logs
-                            blackbox_dir = os.path.join(temp_dir, 'flight_logs', 'blackbox')
-                            if os.path.exists(blackbox_dir) and blackbox_mapping:
-                                bb_count = ImportService._import_blackbox_files(blackbox_dir, blackbox_mapping)
-                                result['details']['blackbox_files_imported'] = bb_count
-
-                            # Import original blackbox files
-                            blackbox_original_dir = os.path.join(temp_dir, 'flight_logs', 'blackbox-original')
-                            if os.path.exists(blackbox_original_dir) and blackbox_mapping:
-                                ImportService._import_blackbox_original_files(blackbox_original_dir, blackbox_mapping)
-                    except Exception as e:
-                        result['details']['errors'].append(f"Flight logs import error: {str(e)}")
-                
-                # Maintenance log import
-                maintenance_logs_path = os.path.join(temp_dir, 'maintenance_logs', 'maintenance_logs.json')
-                if os.path.exists(maintenance_logs_path):
-                    try:
-                        with transaction.atomic():
-                            imported_count = ImportService._import_maintenance_logs(
-                                user, maintenance_logs_path, uav_mapping, temp_dir
-                            )
-                            result['details']['maintenance_logs_imported'] = imported_count
-                    except Exception as e:
-                        result['details']['errors'].append(f"Maintenance logs import error: {str(e)}")
-                
-                # Maintenance reminder import
-                reminders_path = os.path.join(temp_dir, 'maintenance_reminders', 'reminders.json')
-                if os.path.exists(reminders_path):
+                archive = stack.enter_context(zipfile.ZipFile(ImportService._archive_source(zip_file, stack)))
+                names = set(archive.namelist())
+
+                # Delta archives and id mappings from earlier imports of the same account
+                manifest = {}
+                if 'manifest.json' in names:
+                    manifest = ImportService._read_json(archive, 'manifest.json')
+                sync = _SyncState(user, manifest)
+
+                details = result['details']
+                uav_mapping = sync.uav_mapping()  # old_id -> new_id
+                flight_log_mapping = {}           # old_id -> new_id
+                blackbox_mapping = {}             # new_id -> old relative path
+                record_errors = []                # records the importers skipped, and why
+
+                def import_uavs():
+                    details['uavs_imported'] = ImportService._import_uavs(user, archive, uav_mapping, sync)
+
+                def import_uav_configs():
+                    details['uav_configs_imported'] = ImportService._import_uav_configs(
+                        user, archive, uav_mapping, sync, record_errors
+                    )
+
+                def import_flight_logs():
+                    details['flight_logs_imported'] = ImportService._import_flight_logs(
+                        user, archive, uav_mapping, flight_log_mapping, blackbox_mapping, sync, record_errors
+                    )
+
+                def import_gps_data():
+                    details['gps_points_imported'] = ImportService._import_gps_data(archive, flight_log_mapping)
+
+                def import_blackbox_files():
+                    details['blackbox_files_imported'] = ImportService._import_blackbox_files(archive, blackbox_mapping)
+                    ImportService._import_blackbox_original_files(archive, blackbox_mapping)
+
+                def import_maintenance_logs():
+                    details['maintenance_logs_imported'] = ImportService._import_maintenance_logs(
+                        user, archive, uav_mapping, sync, record_errors
+                    )
+
+                def import_maintenance_reminders():
+                    details['maintenance_reminders_imported'] = ImportService._import_maintenance_reminders(
+                        user, archive, uav_mapping, sync, record_errors
+                    )
+
+                def apply_deletions():
+                    details['records_deleted'] = sync.apply_deletions(ImportService._read_json(archive, 'deleted.json'))
+
+                # (phase, runs when, step, error label); deletions of a delta archive come last
+                phases = [
+                    ('uavs', lambda: 'uavs/uavs.json' in names, import_uavs, "UAVs import error"),
+                    ('uav_configs', lambda: 'uav_configs/uav_configs.json' in names, import_uav_configs,
+                     "UAV configuration files import error"),
+                    ('flight_logs', lambda: 'flight_logs/flight_logs.json' in names, import_flight_logs,
+                     "Flight logs import error"),
+                    ('gps_data', lambda: bool(flight_log_mapping), import_gps_data, "GPS data import error"),
+                    ('blackbox_files', lambda: bool(blackbox_mapping), import_blackbox_files, "Blackbox files import error"),
+                    ('maintenance_logs', lambda: 'maintenance_logs/maintenance_logs.json' in names, import_maintenance_logs,
+                     "Maintenance logs import error"),
+                    ('maintenance_reminders', lambda: 'maintenance_reminders/reminders.json' in names,
+                     import_maintenance_reminders, "Maintenance reminders import error"),
+                    ('deletions', lambda: bool(sync.source) and 'deleted.json' in names, apply_deletions,
+                     "Deletions import error"),
+                ]
+
+                # Each phase commits on its own, so a cancelled import keeps the phases already done
+                for phase, runs, step, error_label in phases:
+                    if is_cancelled and is_cancelled():
+                        result['cancelled'] = True
+                        break
+                    if not runs():
+                        if on_phase:
+                            on_phase(phase, 'skipped')
+                        continue
+                    if on_phase:
+                        on_phase(phase, 'running')
                     try:
                         with transaction.atomic():
-                            imported_count = ImportService._import_maintenance_reminders(
-                                user, reminders_path, uav_mapping
-                            )
-                            result['details']['maintenance_reminders_imported'] = imported_count
+                            step()
                     except Exception as e:
-                        result['details']['errors'].append(f"Maintenance reminders import error: {str(e)}")
+                        details['errors'].append(f"{error_label}: {str(e)}")
+                    if on_phase:
+                        on_phase(phase, 'done')
+                details['records_updated'] = sync.updated
+                details['skipped_records'] = len(record_errors)
+                details['record_errors'] = record_errors[:IMPORT_RECORD_ERRORS_KEPT]
                 
                 # Compose result message
-                if result['details']['errors']:
+                if result.get('cancelled'):
+                    result['success'] = False
+                    result['message'] = "Import cancelled"
+                elif result['details']['errors']:
                     result['success'] = False
                     result['message'] = "Import completed with errors"
                 else:
@@ -185,6 +540,12 @@ class ImportService:
                     
                     if result['details']['maintenance_reminders_imported'] > 0:
                         import_parts.append(f"{result['details']['maintenance_reminders_imported']} maintenance reminders")
+
+                    if result['details']['records_updated'] > 0:
+                        import_parts.append(f"{result['details']['records_updated']} updated records")
+
+                    if result['details']['records_deleted'] > 0:
+                        import_parts.append(f"{result['details']['records_deleted']} deleted records")
                     
                     if len(import_parts) > 0:
                         if len(import_parts) == 1:
@@ -207,6 +568,201 @@ class ImportService:
                     'details': {'errors': [str(e)]}
                 }
 
+    @staticmethod
+    def preview_user_data(user, zip_file):
+        """
+        Dry run of import_user_data: classify every archive record as new, duplicate,
+        unmapped (no UAV to attach it to) or invalid, without writing anything.
+
+        Uses the importers' mapping and natural keys against the account's data
+        loaded once per section, so even large archives are checked quickly.
+        """
+        with ExitStack() as stack:
+            try:
+                archive = stack.enter_context(zipfile.ZipFile(ImportService._archive_source(zip_file, stack)))
+                names = set(archive.namelist())
+                manifest = {}
+                if 'manifest.json' in names:
+                    manifest = ImportService._read_json(archive, 'manifest.json')
+                sync = _SyncState(user, manifest)
+                uav_mapping = sync.uav_mapping()
+                uav_ids_by_name = ImportService._uav_ids_by_name(user)
+
+                sections = {}
+                if 'uavs/uavs.json' in names:
+                    sections['uavs'] = ImportService._preview_uavs(
+                        user, ImportService._read_json(archive, 'uavs/uavs.json'), uav_mapping, uav_ids_by_name, sync
+                    )
+
+                # (section, archive member, model, id field, existing records, key, sample fields)
+                for section, member, model, id_field, existing, key, fields in (
+                    ('uav_configs', 'uav_configs/uav_configs.json', UAVConfig, 'config_id',
+                     ImportService._existing_configs, ImportService._config_key, ('name', 'upload_date')),
+                    ('flight_logs', 'flight_logs/flight_logs.json', FlightLog, 'flightlog_id',
+                     ImportService._existing_flight_logs, ImportService._flight_log_key,
+                     ('departure_date', 'departure_time', 'departure_place')),
+                    ('maintenance_logs', 'maintenance_logs/maintenance_logs.json', MaintenanceLog, 'maintenance_id',
+                     ImportService._existing_maintenance_logs, ImportService._maintenance_log_key,
+                     ('event_date', 'event_type')),
+                    ('maintenance_reminders', 'maintenance_reminders/reminders.json', MaintenanceReminder, 'reminder_id',
+                     ImportService._existing_reminders, ImportService._reminder_key, ('component',)),
+                ):
+                    if member in names:
+                        sections[section] = ImportService._preview_records(
+                            user, ImportService._read_json(archive, member), model, id_field, existing(user), key,
+                            fields, uav_mapping, uav_ids_by_name, sync
+                        )
+
+                totals = dict.fromkeys(_Preview.OUTCOMES, 0)
+                for section in sections.values():
+                    for outcome in _Preview.OUTCOMES:
+                        totals[outcome] += section[outcome]
+
+                return {
+                    'success': True,
+                    'dry_run': True,
+                    'message': (
+                        f"Dry run: {totals['new']} new, {totals['duplicate']} duplicate, "
+                        f"{totals['unmapped']} unmapped and {totals['invalid']} invalid records."
+                    ),
+                    'details': {
+                        **totals,
+                        'sections': sections,
+                        'gps_tracks': sum(1 for name in names if name.startswith('flight_logs/gps_data/')),
+                        'blackbox_files': sum(1 for name in names if name.startswith('flight_logs/blackbox/')),
+                        'deletions': (
+                            len(ImportService._read_json(archive, 'deleted.json'))
+                            if sync.source and 'deleted.json' in names else 0
+                        ),
+                    }
+                }
+            except Exception as e:
+                return {
+                    'success': False,
+                    'dry_run': True,
+                    'message': f"Import failed: {str(e)}",
+                    'details': {'errors': [str(e)]}
+                }
+
+    @staticmethod
+    def validate_record(instance):
+        """Raise ValueError for values of an unsaved record the database would reject."""
+        for field in instance._meta.concrete_fields:
+            if field.primary_key or field.is_relation or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+            value = getattr(instance, field.attname)
+            if value is None:
+                if not field.null:
+                    raise ValueError(f"Missing required field: {field.name}")
+                continue
+            try:
+                value = field.to_python(value)
+            except ValidationError as e:
+                raise ValueError(f"{field.name}: {'; '.join(e.messages)}")
+            if isinstance(value, str) and field.max_length and len(value) > field.max_length:
+                raise ValueError(f"{field.name}: longer than {field.max_length} characters")
+
+    @staticmethod
+    def _build_record(model, data, uav_id, user):
+        """Unsaved record of a UAV's archive entry; raises for one the database would reject.
+
+        The importers and their dry run both build records here, so a preview
+        counts exactly the records an import creates.
+        """
+        values = {
+            field: value for field, value in data.items()
+            if field != model._meta.pk.name and field not in ARCHIVE_ONLY_FIELDS
+        }
+        values['uav_id'] = uav_id
+        if model is not MaintenanceReminder:
+            values['user'] = user
+        record = model(**values)
+        ImportService.validate_record(record)
+        return record
+
+    @staticmethod
+    def _preview_uavs(user, uavs_data, uav_mapping, uav_ids_by_name, sync):
+        """Dry run of _import_uavs, matching by serial number, then by name and manufacturer."""
+        by_serial = {}
+        by_name = _KeyIndex()
+        for uav_id, serial_number, drone_name, manufacturer in UAV.objects.filter(user=user).order_by(
+            'uav_id'
+        ).values_list('uav_id', 'serial_number', 'drone_name', 'manufacturer'):
+            if serial_number:
+                by_serial.setdefault(serial_number, uav_id)
+            by_name.add((drone_name,), (manufacturer,), uav_id)
+
+        preview = _Preview()
+        for uav_data in uavs_data:
+            old_id = uav_data.get('uav_id')
+            drone_name = uav_data.get('drone_name')
+            serial_number = uav_data.get('serial_number')
+            sample = {'uav_id': old_id, 'drone_name': drone_name, 'serial_number': serial_number}
+
+            existing = sync.find(UAV, old_id)
+            existing = existing.uav_id if existing else None
+            if existing is None and serial_number and serial_number.strip():
+                existing = by_serial.get(serial_number)
+            if existing is None:
+                existing = by_name.match((drone_name,), (uav_data.get('manufacturer'),))
+            if existing is not None:
+                if old_id:
+                    uav_mapping[old_id] = existing
+                preview.add('duplicate', sample)
+                continue
+
+            data = {
+                field: value for field, value in uav_data.items()
+                if field not in ('uav_id', 'image') and field not in UAV_MAINTENANCE_FIELDS
+            }
+            try:
+                ImportService.validate_record(UAV(**{**data, 'user': user}))
+            except Exception as e:
+                preview.add('invalid', {**sample, 'reason': str(e)})
+                continue
+
+            # Stands in for the id the UAV would get, so later sections map onto it
+            new_id = ('new', old_id)
+            if old_id:
+                uav_mapping[old_id] = new_id
+            uav_ids_by_name[drone_name] = new_id
+            if serial_number:
+                by_serial.setdefault(serial_number, new_id)
+            by_name.add((drone_name,), (uav_data.get('manufacturer'),), new_id)
+            preview.add('new', sample)
+
+        return preview.as_dict()
+
+    @staticmethod
+    def _preview_records(user, records, model, id_field, existing, key_func, fields, uav_mapping, uav_ids_by_name, sync):
+        """Dry run of one of the importers of records that belong to a UAV."""
+        preview = _Preview()
+        for data in records:
+            old_id = data.get(id_field)
+            old_uav_id = ImportService._archive_uav_id(data)
+            sample = {id_field: old_id, 'uav_id': old_uav_id, **{field: data.get(field) for field in fields}}
+
+            uav_id = ImportService._get_new_uav_id(old_uav_id, uav_mapping, data, uav_ids_by_name)
+            if uav_id is None:
+                preview.add('unmapped', sample)
+                continue
+
+            key, optional = key_func(uav_id, data)
+            if sync.find(model, old_id) or existing.match(key, optional) is not None:
+                preview.add('duplicate', sample)
+                continue
+
+            try:
+                ImportService._build_record(model, data, uav_id, user)
+            except Exception as e:
+                preview.add('invalid', {**sample, 'reason': str(e)})
+                continue
+
+            existing.add(key, optional, ('new', old_id))
+            preview.add('new', sample)
+
+        return preview.as_dict()
+
     @staticmethod
     def _cleanup_empty_directories(path):
         """Recursively remove all empty directories under the given path."""
@@ -221,62 +777,58 @@ class ImportService:
                         pass  # Ignore if directory is no longer empty
 
     @staticmethod
-    def _resolve_uav_image(uav_data, old_id, temp_dir):
-        """Return the picture of an imported UAV as a data URI, or None.
+    def _resolve_uav_image(uav_data, old_id, archive):
+        """Store the picture of an imported UAV and return its image path, or None.
 
-        Prefers the value carried in uavs.json; falls back to the picture file
-        the export writes alongside it (uavs/images/uav_<id>.<ext>), so an
-        archive stays importable either way.
+        Reads the picture file the export writes (uavs/images/uav_<id>.<ext>);
+        archives of older versions carry a data URI in uavs.json instead.
         """
         image = uav_data.get('image')
         if isinstance(image, str) and image.startswith('data:image/'):
-            return image if len(image) <= MAX_UAV_IMAGE_LENGTH else None
+            try:
+                return UAVImageService.store_data_uri(image)
+            except ValueError:
+                return None
 
         if old_id is None:
             return None
 
-        images_dir = os.path.join(temp_dir, 'uavs', 'images')
-        if not os.path.isdir(images_dir):
-            return None
-
-        for file_name in os.listdir(images_dir):
+        for info in archive.infolist():
+            directory, file_name = posixpath.split(info.filename)
             stem, extension = os.path.splitext(file_name)
-            if stem != f'uav_{old_id}' or not extension:
+            if directory != 'uavs/images' or stem != f'uav_{old_id}' or not extension:
                 continue
 
-            file_path = os.path.join(images_dir, file_name)
-            if os.path.getsize(file_path) > MAX_UAV_IMAGE_LENGTH * 3 // 4:
+            extension = UAVImageService.extension_for(extension.lstrip('.'))
+            if extension is None:
+                return None
+            try:
+                return UAVImageService.store(archive.read(info), extension)
+            except ValueError:
                 return None
-
-            with open(file_path, 'rb') as f:
-                payload = base64.b64encode(f.read()).decode('ascii')
-
-            extension = extension.lstrip('.').lower()
-            subtype = {'jpg': 'jpeg', 'svg': 'svg+xml'}.get(extension, extension)
-            return f'data:image/{subtype};base64,{payload}'
 
         return None
 
     @staticmethod
-    def _import_uavs(user, uavs_path, uav_mapping, temp_dir):
+    def _import_uavs(user, archive, uav_mapping, sync):
         """Import UAVs from JSON and return old->new ID mapping."""
-        with open(uavs_path, 'r') as f:
-            uavs_data = json.load(f)
+        uavs_data = ImportService._read_json(archive, 'uavs/uavs.json')
 
         imported_count = 0
         skipped_count = 0
 
         for uav_data in uavs_data:
             old_id = uav_data.get('uav_id')
-            image = ImportService._resolve_uav_image(uav_data, old_id, temp_dir)
+            image = ImportService._resolve_uav_image(uav_data, old_id, archive)
 
             drone_name = uav_data.get('drone_name')
             manufacturer = uav_data.get('manufacturer')
             serial_number = uav_data.get('serial_number')
             
-            # Prefer match by serial number if available
-            existing_uav = None
-            if serial_number and serial_number.strip():
+            # Prefer the UAV this archive record was imported into before,
+            # then match by serial number if available
+            existing_uav = sync.find(UAV, old_id)
+            if not existing_uav and serial_number and serial_number.strip():
                 existing_uav = UAV.objects.filter(
                     user=user, 
                     serial_number=serial_number
@@ -295,37 +847,36 @@ class ImportService:
                 existing_uav = existing_uavs.first()
             
             if existing_uav:
-                # The UAV itself is left untouched, but an archive may still
-                # carry a picture for one that doesn't have any yet.
+                # A delta archive carries the UAV's current state; otherwise the
+                # UAV is left untouched, but an archive may still carry a
+                # picture for one that doesn't have any yet.
+                previous_image = existing_uav.image
+                if sync.delta and image:
+                    existing_uav.image = image
+                sync.update(existing_uav, uav_data)
                 if image and not existing_uav.image:
                     existing_uav.image = image
-                    existing_uav.save(update_fields=['image'])
+                    existing_uav.save(update_fields=['image', 'updated_at'])
+                # Drop whichever picture file ended up unused
+                for unused in {previous_image, image} - {existing_uav.image, None}:
+                    UAVImageService.release(unused)
 
                 # Add mapping for reference in logs
                 if old_id:
                     uav_mapping[old_id] = existing_uav.uav_id
+                sync.remember(UAV, old_id, existing_uav.uav_id)
 
                 skipped_count += 1
                 continue
 
             # Extract maintenance reminder fields before removing them
             maintenance_data = {}
-            maintenance_fields = [
-                'props_maint_date', 'motor_maint_date', 'frame_maint_date',
-                'props_reminder_date', 'motor_reminder_date', 'frame_reminder_date',
-                'props_reminder_active', 'motor_reminder_active', 'frame_reminder_active'
-            ]
-            
-            for field in maintenance_fields:
+            for field in UAV_MAINTENANCE_FIELDS:
                 if field in uav_data:
                     maintenance_data[field] = uav_data[field]
             
             # Remove fields that may cause conflicts
-            ImportService._remove_conflict_fields(uav_data, [
-                'uav_id', 'props_maint_date', 'motor_maint_date', 'frame_maint_date',
-                'props_reminder_date', 'motor_reminder_date', 'frame_reminder_date',
-                'props_reminder_active', 'motor_reminder_active', 'frame_reminder_active'
-            ])
+            ImportService._remove_conflict_fields(uav_data, ['uav_id', *UAV_MAINTENANCE_FIELDS])
             uav_data['user'] = user
 
             # Replace whatever the JSON held with the validated picture, so a
@@ -345,6 +896,7 @@ class ImportService:
                 
                 if old_id:
                     uav_mapping[old_id] = new_uav.uav_id
+                sync.remember(UAV, old_id, new_uav.uav_id)
                 
                 imported_count += 1
             except TypeError as e:
@@ -363,85 +915,143 @@ class ImportService:
                         
                         if old_id:
                             uav_mapping[old_id] = new_uav.uav_id
+                        sync.remember(UAV, old_id, new_uav.uav_id)
                         
                         imported_count += 1
                 else:
                     raise
+        sync.flush()
         
         return imported_count
 
+    # Natural keys for duplicate detection, shared by the importers and the dry run.
+    # Each record has an exact key and optional values (see _KeyIndex).
+
+    @staticmethod
+    def _existing_flight_logs(user):
+        # Same UAV and date, and time/place when the record has them, counts as a duplicate
+        index = _KeyIndex()
+        for flightlog_id, uav_id, departure_date, departure_time, departure_place in FlightLog.objects.filter(
+            user=user
+        ).order_by('flightlog_id').values_list('flightlog_id', 'uav_id', 'departure_date', 'departure_time', 'departure_place'):
+            index.add((uav_id, departure_date), (departure_time, departure_place), flightlog_id)
+        return index
+
+    @staticmethod
+    def _flight_log_key(uav_id, data):
+        return (uav_id, _as_date(data.get('departure_date'))), (_as_time(data.get('departure_time')), data.get('departure_place'))
+
+    @staticmethod
+    def _existing_maintenance_logs(user):
+        # Same UAV, date and event type, and description when the record has one, is a duplicate
+        index = _KeyIndex()
+        for maintenance_id, uav_id, event_date, event_type, description in MaintenanceLog.objects.filter(
+            user=user
+        ).order_by('maintenance_id').values_list('maintenance_id', 'uav_id', 'event_date', 'event_type', 'description'):
+            index.add((uav_id, event_date, event_type), (description,), maintenance_id)
+        return index
+
+    @staticmethod
+    def _maintenance_log_key(uav_id, data):
+        return (uav_id, _as_date(data.get('event_date')), data.get('event_type')), (data.get('description'),)
+
     @staticmethod
-    def _import_flight_logs(user, logs_path, uav_mapping, flight_log_mapping, blackbox_mapping=None):
+    def _existing_reminders(user):
+        # A UAV has at most one reminder per component (unique constraint)
+        index = _KeyIndex()
+        for reminder_id, uav_id, component in MaintenanceReminder.objects.filter(
+            uav__user=user
+        ).order_by('reminder_id').values_list('reminder_id', 'uav_id', 'component'):
+            index.add((uav_id, component), (), reminder_id)
+        return index
+
+    @staticmethod
+    def _reminder_key(uav_id, data):
+        return (uav_id, data.get('component')), ()
+
+    @staticmethod
+    def _existing_configs(user):
+        # Same UAV and name, and upload date when the record has one, is a duplicate
+        index = _KeyIndex()
+        for config_id, uav_id, name, upload_date in UAVConfig.objects.filter(
+            user=user
+        ).order_by('config_id').values_list('config_id', 'uav_id', 'name', 'upload_date'):
+            index.add((uav_id, name), (upload_date,), config_id)
+        return index
+
+    @staticmethod
+    def _config_key(uav_id, data):
+        return (uav_id, data.get('name')), (_as_date(data.get('upload_date')),)
+
+    @staticmethod
+    def _import_flight_logs(user, archive, uav_mapping, flight_log_mapping, blackbox_mapping, sync, errors):
         """Import flight logs from JSON file."""
-        with open(logs_path, 'r') as f:
-            logs_data = json.load(f)
+        logs_data = ImportService._read_json(archive, 'flight_logs/flight_logs.json')
+        uav_ids_by_name = ImportService._uav_ids_by_name(user)
+
+        existing_logs = ImportService._existing_flight_logs(user)
 
-        imported_count = 0
         skipped_count = 0
-        errors = []
+        new_logs = []   # (old_id, unsaved log, old blackbox path)
+        matched = []    # (old_id, existing id or unsaved log)
 
         for log_data in logs_data:
             try:
                 old_id = log_data.get('flightlog_id')
-                old_uav_id = log_data.get('uav_id') or (log_data['uav'].get('uav_id') if isinstance(log_data.get('uav'), dict) else log_data.get('uav'))
-                new_uav_id = ImportService._get_new_uav_id(user, old_uav_id, uav_mapping, log_data)
+                old_uav_id = ImportService._archive_uav_id(log_data)
+                new_uav_id = ImportService._get_new_uav_id(old_uav_id, uav_mapping, log_data, uav_ids_by_name)
 
                 if new_uav_id is None:
                     errors.append(f"No suitable UAV found for flight log {old_id}")
                     continue
 
-                departure_date = log_data.get('departure_date')
-                departure_time = log_data.get('departure_time')
-                departure_place = log_data.get('departure_place')
-
-                # Check for existing log with same UAV, date, and optionally time/place
-                existing_logs = FlightLog.objects.filter(
-                    user=user,
-                    uav_id=new_uav_id,
-                    departure_date=departure_date
-                )
-
-                if departure_time:
-                    existing_logs = existing_logs.filter(departure_time=departure_time)
-
-                if departure_place:
-                    existing_logs = existing_logs.filter(departure_place=departure_place)
+                existing_log = sync.find(FlightLog, old_id)
+                if existing_log:
+                    log_data['uav_id'] = new_uav_id
+                    if sync.update(existing_log, log_data) and log_data.get('blackbox_log'):
+                        blackbox_mapping[existing_log.flightlog_id] = log_data['blackbox_log']
+                    flight_log_mapping[old_id] = existing_log.flightlog_id
+                    skipped_count += 1
+                    continue
 
-                if existing_logs.exists():
+                key, optional = ImportService._flight_log_key(new_uav_id, log_data)
+                existing_log = existing_logs.match(key, optional)
+                if existing_log is not None:
                     if old_id:
-                        flight_log_mapping[old_id] = existing_logs.first().flightlog_id
+                        matched.append((old_id, existing_log))
                     skipped_count += 1
                     continue
 
-                # Save blackbox path before stripping it from the data
                 old_blackbox_log = log_data.get('blackbox_log')
-
-                ImportService._remove_conflict_fields(log_data, [
-                    'flightlog_id', 'uav', 'created_at', 'gps_logs', 'blackbox_log', 'has_gps_log'
-                ])
-                log_data['uav_id'] = new_uav_id
-                log_data['user'] = user
-
-                new_log = FlightLog.objects.create(**log_data)
-
-                if old_id:
-                    flight_log_mapping[old_id] = new_log.flightlog_id
-
-                # Record blackbox mapping so the file can be copied afterwards
-                if blackbox_mapping is not None and old_blackbox_log:
-                    blackbox_mapping[new_log.flightlog_id] = old_blackbox_log
-
-                imported_count += 1
+                # Invalid records are rejected here, so one doesn't fail the section's bulk insert
+                new_log = ImportService._build_record(FlightLog, log_data, new_uav_id, user)
+                existing_logs.add(key, optional, new_log)
+                new_logs.append((old_id, new_log, old_blackbox_log))
             except Exception as e:
                 errors.append(f"Error importing flight log: {str(e)}")
 
-        return imported_count
+        FlightLog.objects.bulk_create([new_log for _, new_log, _ in new_logs], batch_size=IMPORT_BATCH_SIZE)
+
+        for old_id, new_log, old_blackbox_log in new_logs:
+            matched.append((old_id, new_log))
+            # Record blackbox mapping so the file can be copied afterwards
+            if old_blackbox_log:
+                blackbox_mapping[new_log.flightlog_id] = old_blackbox_log
+        for old_id, record in matched:
+            if old_id:
+                flight_log_mapping[old_id] = _KeyIndex.pk(record)
+            sync.remember(FlightLog, old_id, _KeyIndex.pk(record))
+        sync.flush()
+
+        return len(new_logs)
 
     @staticmethod
-    def _import_gps_data(gps_dir, flight_log_mapping):
-        """Import GPS data for flight logs."""
-        for filename in os.listdir(gps_dir):
-            if filename.endswith('_gps.json'):
+    def _import_gps_data(archive, flight_log_mapping):
+        """Import GPS data for flight logs, returning the number of points."""
+        imported_count = 0
+        for name in archive.namelist():
+            directory, filename = posixpath.split(name)
+            if directory == 'flight_logs/gps_data' and filename.endswith('_gps.json'):
                 try:
                     parts = filename.split('_')
                     old_flight_id = int(parts[1])
@@ -453,27 +1063,44 @@ class ImportService:
                     continue
                 
                 new_flight_id = flight_log_mapping[old_flight_id]
-                flight_log = FlightLog.objects.get(flightlog_id=new_flight_id)
                 
-                with open(os.path.join(gps_dir, filename), 'r') as f:
-                    gps_data = json.load(f)
+                gps_data = ImportService._read_json(archive, name)
+                # Columnar layout of newer archives; older ones hold a list of points
+                if isinstance(gps_data, dict):
+                    columns = gps_data.get('columns', [])
+                    gps_data = [dict(zip(columns, row)) for row in gps_data.get('rows', [])]
+
+                # The archive holds the complete track, so it replaces what a matched flight had
+                FlightGPSLog.objects.filter(flight_log_id=new_flight_id).delete()
                 
+                points = []
                 for point in gps_data:
                     point.pop('id', None)
                     point.pop('flight_log', None)
-                    FlightGPSLog.objects.create(flight_log=flight_log, **point)
+                    points.append(FlightGPSLog(flight_log_id=new_flight_id, **point))
+                FlightGPSLog.objects.bulk_create(points, batch_size=IMPORT_BATCH_SIZE)
+                imported_count += len(points)
+
+        return imported_count
 
     @staticmethod
-    def _import_blackbox_files(blackbox_dir, blackbox_mapping):
-        """Copy blackbox CSV files from the ZIP extract dir to media storage and link them."""
+    def _copy_member(archive, name, dest_path):
+        """Stream an archive member to dest_path in chunks."""
+        with archive.open(name) as source, open(dest_path, 'wb') as target:
+            shutil.copyfileobj(source, target, FILE_CHUNK_SIZE)
+
+    @staticmethod
+    def _import_blackbox_files(archive, blackbox_mapping):
+        """Copy blackbox CSV files from the archive to media storage and link them."""
         imported_count = 0
+        names = set(archive.namelist())
 
         for new_log_id, old_relative_path in blackbox_mapping.items():
             try:
                 file_name = os.path.basename(old_relative_path)
-                src_path = os.path.join(blackbox_dir, file_name)
+                member = f'flight_logs/blackbox/{file_name}'
 
-                if not os.path.exists(src_path):
+                if member not in names:
                     continue
 
                 flight_log = FlightLog.objects.get(flightlog_id=new_log_id)
@@ -489,11 +1116,10 @@ class ImportService:
                 os.makedirs(dest_dir, exist_ok=True)
                 dest_path = os.path.join(dest_dir, dest_filename)
 
-                import shutil as _shutil
-                _shutil.copy2(src_path, dest_path)
+                ImportService._copy_member(archive, member, dest_path)
 
                 flight_log.blackbox_log = f"blackbox/{dest_filename}"
-                flight_log.save(update_fields=['blackbox_log'])
+                flight_log.save(update_fields=['blackbox_log', 'updated_at'])
 
                 imported_count += 1
             except Exception:
@@ -502,220 +1128,219 @@ class ImportService:
         return imported_count
 
     @staticmethod
-    def _import_blackbox_original_files(blackbox_original_dir, blackbox_mapping):
-        """Copy original blackbox files from the ZIP extract dir to upload/blackbox-original/."""
+    def _import_blackbox_original_files(archive, blackbox_mapping):
+        """Copy original blackbox files from the archive to upload/blackbox-original/."""
         import re as _re
-        import shutil as _shutil
+        names = set(archive.namelist())
 
         for new_log_id, old_relative_path in blackbox_mapping.items():
             try:
                 old_stem = os.path.splitext(os.path.basename(old_relative_path))[0]
                 old_stem = _re.sub(r'-\d+$', '', old_stem)
-                src_filename = f"{old_stem}.txt"
-                src_path = os.path.join(blackbox_original_dir, src_filename)
+                member = f"flight_logs/blackbox-original/{old_stem}.txt"
 
-                if not os.path.exists(src_path):
+                if member not in names:
                     # Also try with old ID suffix
                     old_stem_with_id = os.path.splitext(os.path.basename(old_relative_path))[0]
-                    src_path = os.path.join(blackbox_original_dir, f"{old_stem_with_id}.txt")
-                    if not os.path.exists(src_path):
+                    member = f"flight_logs/blackbox-original/{old_stem_with_id}.txt"
+                    if member not in names:
                         continue
 
                 dest_filename = f"{old_stem}-{new_log_id}.txt"
                 dest_dir = settings.BLACKBOX_ORIGINAL_ROOT
                 os.makedirs(dest_dir, exist_ok=True)
-                _shutil.copy2(src_path, os.path.join(dest_dir, dest_filename))
+                ImportService._copy_member(archive, member, os.path.join(dest_dir, dest_filename))
             except Exception:
                 pass
 
     @staticmethod
-    def _import_maintenance_logs(user, logs_path, uav_mapping, temp_dir):
+    def _import_maintenance_logs(user, archive, uav_mapping, sync, errors):
         """Import maintenance logs from JSON file."""
-        with open(logs_path, 'r') as f:
-            logs_data = json.load(f)
+        logs_data = ImportService._read_json(archive, 'maintenance_logs/maintenance_logs.json')
+        names = set(archive.namelist())
+        uav_ids_by_name = ImportService._uav_ids_by_name(user)
+
+        existing_logs = ImportService._existing_maintenance_logs(user)
         
-        imported_count = 0
         skipped_count = 0
-        errors = []
-        files_dir = os.path.join(temp_dir, 'maintenance_logs', 'files')
+        new_logs = []   # (old_id, unsaved log, file path in the archive)
+        matched = []    # (old_id, existing id or unsaved log)
         
         for log_data in logs_data:
             try:
                 old_maintenance_id = log_data.get('maintenance_id')
-                old_uav_id = log_data.get('uav_id') or (log_data['uav'].get('uav_id') if isinstance(log_data.get('uav'), dict) else log_data.get('uav'))
-                new_uav_id = ImportService._get_new_uav_id(user, old_uav_id, uav_mapping, log_data)
+                old_uav_id = ImportService._archive_uav_id(log_data)
+                new_uav_id = ImportService._get_new_uav_id(old_uav_id, uav_mapping, log_data, uav_ids_by_name)
                 
                 if new_uav_id is None:
                     errors.append(f"No suitable UAV found for maintenance log {old_maintenance_id}")
                     continue
                 
-                event_type = log_data.get('event_type')
-                event_date = log_data.get('event_date')
-                description = log_data.get('description')
-                
-                # Check for existing log with same UAV, date, event type, and description
-                existing_logs = MaintenanceLog.objects.filter(
-                    user=user,
-                    uav_id=new_uav_id,
-                    event_date=event_date,
-                    event_type=event_type
-                )
-                
-                if description:
-                    existing_logs = existing_logs.filter(description=description)
-                
-                if existing_logs.exists():
+                existing_log = sync.find(MaintenanceLog, old_maintenance_id)
+                if existing_log:
+                    log_data['uav_id'] = new_uav_id
+                    sync.update(existing_log, log_data)
+                    skipped_count += 1
+                    continue
+
+                key, optional = ImportService._maintenance_log_key(new_uav_id, log_data)
+                existing_log = existing_logs.match(key, optional)
+                if existing_log is not None:
+                    matched.append((old_maintenance_id, existing_log))
                     skipped_count += 1
                     continue
                 
-                ImportService._remove_conflict_fields(log_data, ['maintenance_id', 'uav'])
-                file_path = log_data.pop('file', None)
-                log_data['uav_id'] = new_uav_id
-                log_data['user'] = user
-                
-                # Create log without file first
-                new_log = MaintenanceLog.objects.create(**log_data)
-                
-                # Attach file if present
-                if file_path and files_dir:
-                    file_name = os.path.basename(file_path)
-                    
-                    # Try multiple possible locations for the file
-                    possible_paths = [
-                        os.path.join(files_dir, file_name),
-                        os.path.join(temp_dir, file_path.lstrip('/')),
-                    ]
-                    
-                    file_found = False
-                    for full_path in possible_paths:
-                        if os.path.exists(full_path):
-                            with open(full_path, 'rb') as f:
-                                file_content = f.read()
-                            
-                            from ..models import maintenance_log_path
-                            saved_path = ImportService._save_file_to_storage(new_log, file_name, file_content, maintenance_log_path)
-                            new_log.file = saved_path
-                            new_log.save()
-                            file_found = True
-                            break
-                
-                imported_count += 1
+                # Created without file first
+                file_path = log_data.get('file')
+                new_log = ImportService._build_record(MaintenanceLog, log_data, new_uav_id, user)
+                existing_logs.add(key, optional, new_log)
+                new_logs.append((old_maintenance_id, new_log, file_path))
             except Exception as e:
                 errors.append(f"Error importing maintenance log: {str(e)}")
+
+        MaintenanceLog.objects.bulk_create([new_log for _, new_log, _ in new_logs], batch_size=IMPORT_BATCH_SIZE)
+
+        for old_maintenance_id, new_log, file_path in new_logs:
+            matched.append((old_maintenance_id, new_log))
+            # Attach file if present
+            if file_path:
+                file_name = os.path.basename(file_path)
+                
+                # Try multiple possible locations for the file
+                possible_members = [
+                    f'maintenance_logs/files/{file_name}',
+                    file_path.lstrip('/'),
+                ]
+                
+                for member in possible_members:
+                    if member in names:
+                        from ..models import maintenance_log_path
+                        with archive.open(member) as source:
+                            saved_path = ImportService._save_file_to_storage(new_log, file_name, source, maintenance_log_path)
+                        new_log.file = saved_path
+                        new_log.save()
+                        break
+        for old_maintenance_id, record in matched:
+            sync.remember(MaintenanceLog, old_maintenance_id, _KeyIndex.pk(record))
+        sync.flush()
         
-        return imported_count
+        return len(new_logs)
 
     @staticmethod
-    def _import_maintenance_reminders(user, reminders_path, uav_mapping):
+    def _import_maintenance_reminders(user, archive, uav_mapping, sync, errors):
         """Import maintenance reminders from JSON file."""
-        with open(reminders_path, 'r') as f:
-            reminders_data = json.load(f)
+        reminders_data = ImportService._read_json(archive, 'maintenance_reminders/reminders.json')
+        uav_ids_by_name = ImportService._uav_ids_by_name(user)
+
+        existing_reminders = ImportService._existing_reminders(user)
         
-        imported_count = 0
         skipped_count = 0
-        errors = []
+        new_reminders = []  # (old_id, unsaved reminder)
+        matched = []        # (old_id, existing id or unsaved reminder)
         
         for reminder_data in reminders_data:
             try:
                 old_reminder_id = reminder_data.get('reminder_id')
-                old_uav_id = reminder_data.get('uav_id') or (reminder_data['uav'].get('uav_id') if isinstance(reminder_data.get('uav'), dict) else reminder_data.get('uav'))
-                new_uav_id = ImportService._get_new_uav_id(user, old_uav_id, uav_mapping, reminder_data)
+                old_uav_id = ImportService._archive_uav_id(reminder_data)
+                new_uav_id = ImportService._get_new_uav_id(old_uav_id, uav_mapping, reminder_data, uav_ids_by_name)
                 
                 if new_uav_id is None:
                     errors.append(f"No suitable UAV found for reminder {old_reminder_id}")
                     continue
                 
-                component = reminder_data.get('component')
-                next_maintenance = reminder_data.get('next_maintenance')
-                
-                # Check for existing reminder with same UAV, component, and next maintenance
-                existing_reminders = MaintenanceReminder.objects.filter(
-                    uav_id=new_uav_id,
-                    component=component
-                )
-                
-                if next_maintenance:
-                    existing_reminders = existing_reminders.filter(next_maintenance=next_maintenance)
-                
-                if existing_reminders.exists():
+                existing_reminder = sync.find(MaintenanceReminder, old_reminder_id)
+                if existing_reminder:
+                    reminder_data['uav_id'] = new_uav_id
+                    sync.update(existing_reminder, reminder_data)
+                    skipped_count += 1
+                    continue
+
+                key, optional = ImportService._reminder_key(new_uav_id, reminder_data)
+                existing_reminder = existing_reminders.match(key, optional)
+                if existing_reminder is not None:
+                    matched.append((old_reminder_id, existing_reminder))
                     skipped_count += 1
                     continue
                 
-                ImportService._remove_conflict_fields(reminder_data, ['reminder_id', 'uav'])
-                reminder_data['uav_id'] = new_uav_id
-                
-                MaintenanceReminder.objects.create(**reminder_data)
-                imported_count += 1
+                new_reminder = ImportService._build_record(MaintenanceReminder, reminder_data, new_uav_id, user)
+                existing_reminders.add(key, optional, new_reminder)
+                new_reminders.append((old_reminder_id, new_reminder))
             except Exception as e:
                 errors.append(f"Error importing maintenance reminder: {str(e)}")
+
+        MaintenanceReminder.objects.bulk_create([reminder for _, reminder in new_reminders], batch_size=IMPORT_BATCH_SIZE)
+
+        for old_reminder_id, record in matched + new_reminders:
+            sync.remember(MaintenanceReminder, old_reminder_id, _KeyIndex.pk(record))
+        sync.flush()
         
-        return imported_count
+        return len(new_reminders)
 
     @staticmethod
-    def _import_uav_configs(user, configs_path, uav_mapping, temp_dir):
+    def _import_uav_configs(user, archive, uav_mapping, sync, errors):
         """Import UAV configuration files from JSON file."""
-        with open(configs_path, 'r') as f:
-            configs_data = json.load(f)
+        configs_data = ImportService._read_json(archive, 'uav_configs/uav_configs.json')
+        names = set(archive.namelist())
+        uav_ids_by_name = ImportService._uav_ids_by_name(user)
+
+        existing_configs = ImportService._existing_configs(user)
         
-        imported_count = 0
         skipped_count = 0
-        errors = []
-        files_dir = os.path.join(temp_dir, 'uav_configs', 'files')
+        new_configs = []  # (old_id, unsaved config, file path in the archive)
+        matched = []      # (old_id, existing id or unsaved config)
         
         for config_data in configs_data:
             try:
                 old_config_id = config_data.get('config_id')
-                old_uav_id = config_data.get('uav_id') or (config_data['uav'].get('uav_id') if isinstance(config_data.get('uav'), dict) else config_data.get('uav'))
-                new_uav_id = ImportService._get_new_uav_id(user, old_uav_id, uav_mapping, config_data)
+                old_uav_id = ImportService._archive_uav_id(config_data)
+                new_uav_id = ImportService._get_new_uav_id(old_uav_id, uav_mapping, config_data, uav_ids_by_name)
                 
                 if new_uav_id is None:
                     errors.append(f"No suitable UAV found for configuration {old_config_id}")
                     continue
                 
-                config_name = config_data.get('name')
-                upload_date = config_data.get('upload_date')
-                
-                # Check for existing config with same UAV, name, and upload date
-                existing_configs = UAVConfig.objects.filter(
-                    user=user,
-                    uav_id=new_uav_id,
-                    name=config_name
-                )
-                
-                if upload_date:
-                    existing_configs = existing_configs.filter(upload_date=upload_date)
-                
-                if existing_configs.exists():
+                existing_config = sync.find(UAVConfig, old_config_id)
+                if existing_config:
+                    config_data['uav_id'] = new_uav_id
+                    sync.update(existing_config, config_data)
+                    skipped_count += 1
+                    continue
+
+                key, optional = ImportService._config_key(new_uav_id, config_data)
+                existing_config = existing_configs.match(key, optional)
+                if existing_config is not None:
+                    matched.append((old_config_id, existing_config))
                     skipped_count += 1
                     continue
                 
-                ImportService._remove_conflict_fields(config_data, ['config_id', 'uav'])
-                file_path = config_data.pop('file', None)
-                config_data['uav_id'] = new_uav_id
-                config_data['user'] = user
-                
-                new_config = UAVConfig.objects.create(**config_data)
-                
-                # Attach file if present
-                if file_path and files_dir:
-                    file_name = os.path.basename(file_path)
-                    full_path = os.path.join(files_dir, file_name)
-                    
-                    if os.path.exists(full_path):
-                        with open(full_path, 'rb') as f:
-                            file_content = f.read()
-                            
-                        from ..models import uav_config_path
-                        saved_path = ImportService._save_file_to_storage(new_config, file_name, file_content, uav_config_path)
-                        
-                        new_config.file = saved_path
-                        new_config.save()
-                
-                imported_count += 1
+                file_path = config_data.get('file')
+                new_config = ImportService._build_record(UAVConfig, config_data, new_uav_id, user)
+                existing_configs.add(key, optional, new_config)
+                new_configs.append((old_config_id, new_config, file_path))
             except Exception as e:
                 errors.append(f"Error importing UAV configuration: {str(e)}")
+
+        UAVConfig.objects.bulk_create([config for _, config, _ in new_configs], batch_size=IMPORT_BATCH_SIZE)
+
+        for old_config_id, new_config, file_path in new_configs:
+            matched.append((old_config_id, new_config))
+            # Attach file if present
+            if file_path:
+                file_name = os.path.basename(file_path)
+                member = f'uav_configs/files/{file_name}'
+                
+                if member in names:
+                    from ..models import uav_config_path
+                    with archive.open(member) as source:
+                        saved_path = ImportService._save_file_to_storage(new_config, file_name, source, uav_config_path)
+                    
+                    new_config.file = saved_path
+                    new_config.save()
+        for old_config_id, record in matched:
+            sync.remember(UAVConfig, old_config_id, _KeyIndex.pk(record))
+        sync.flush()
         
-        return imported_count
+        return len(new_configs)
 
     @staticmethod
     def validate_upload_file(file, required_extension):
@@ -0,0 +1,208 @@
+import csv
+from datetime import datetime
+from io import StringIO
+from django.db.models import Count, Q, Sum
+from django.http import StreamingHttpResponse
+from .pdf_writer import PdfPage, PdfStreamWriter
+
+# Rows fetched per database round trip while streaming
+EXPORT_CHUNK_SIZE = 500
+
+# Same columns as flight_logs.csv in the full data export, so the file can be re-imported
+CSV_FIELDS = [
+    'flightlog_id', 'uav_id', 'drone_name', 'departure_place', 'departure_date',
+    'departure_time', 'landing_place', 'landing_time', 'flight_duration',
+    'takeoffs', 'landings', 'light_conditions', 'ops_conditions', 'pilot_type',
+    'comments'
+]
+
+# (header, field, width in points) of the PDF logbook table
+PDF_COLUMNS = [
+    ('Date', 'departure_date', 52),
+    ('UAV', 'drone_name', 80),
+    ('T/O Place', 'departure_place', 95),
+    ('T/O Time', 'departure_time', 44),
+    ('LDG Place', 'landing_place', 95),
+    ('LDG Time', 'landing_time', 44),
+    ('Duration (min)', 'flight_duration', 66),
+    ('T/O', 'takeoffs', 26),
+    ('LDG', 'landings', 26),
+    ('Pilot Type', 'pilot_type', 52),
+    ('Light', 'light_conditions', 40),
+    ('OPS', 'ops_conditions', 40),
+    ('Comments', 'comments', 126),
+]
+
+PDF_MARGIN = 28
+PDF_HEADER_COLOR = (13, 110, 253)
+PDF_ROW_HEIGHT = 14
+
+
+def _format_seconds(seconds):
+    seconds = seconds or 0
+    return f"{seconds // 3600}h {(seconds % 3600) // 60}min {seconds % 60}sec"
+
+
+class LogbookService:
+    @staticmethod
+    def _rows(queryset):
+        """Flat logbook rows, fetched in chunks without model instances."""
+        return queryset.values(*CSV_FIELDS[:2], 'uav__drone_name', *CSV_FIELDS[3:]).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+
+    @staticmethod
+    def get_summary(queryset):
+        """Logbook totals for the overview page in a single aggregate query."""
+        def duration(**condition):
+            return Sum('flight_duration', filter=Q(**condition))
+
+        def flights(**condition):
+            return Count('flightlog_id', filter=Q(**condition))
+
+        summary = queryset.order_by().aggregate(
+            total_flights=Count('flightlog_id'),
+            total_takeoffs=Sum('takeoffs'),
+            total_landings=Sum('landings'),
+            total_flight_time=Sum('flight_duration'),
+            pic_time=duration(pilot_type='PIC'),
+            dual_time=duration(pilot_type='Dual'),
+            instruction_time=duration(pilot_type='Instruction'),
+            day_time=duration(light_conditions='Day'),
+            night_time=duration(light_conditions='Night'),
+            uav_count=Count('uav', distinct=True),
+            vlos_flights=flights(ops_conditions='VLOS'),
+            bvlos_flights=flights(ops_conditions='BVLOS'),
+            evlos_flights=flights(ops_conditions='EVLOS'),
+            pic_flights=flights(pilot_type='PIC'),
+            dual_flights=flights(pilot_type='Dual'),
+            instruction_flights=flights(pilot_type='Instruction'),
+        )
+        return {key: value or 0 for key, value in summary.items()}
+
+    @staticmethod
+    def stream_csv(queryset):
+        """Yield the logbook as CSV, one chunk of rows at a time."""
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+
+        for count, row in enumerate(LogbookService._rows(queryset), start=1):
+            writer.writerow([row['uav__drone_name'] if field == 'drone_name' else row[field] for field in CSV_FIELDS])
+            if count % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    @staticmethod
+    def stream_pdf(queryset, user):
+        """Yield the logbook as a PDF: an overview page, then the flight table page by page."""
+        writer = PdfStreamWriter()
+        yield writer.start()
+        yield writer.page(LogbookService._draw_overview(writer.new_page(), user, LogbookService.get_summary(queryset)))
+
+        page = None
+        y = 0
+        for row in LogbookService._rows(queryset):
+            if page is None:
+                page = writer.new_page()
+                y = LogbookService._draw_table_header(page)
+            LogbookService._draw_row(page, y, row)
+            y += PDF_ROW_HEIGHT
+            if y + PDF_ROW_HEIGHT > page.height - PDF_MARGIN:
+                yield writer.page(page)
+                page = None
+
+        if page is not None:
+            yield writer.page(page)
+        yield writer.finish()
+
+    @staticmethod
+    def _draw_overview(page, user, summary):
+        left, right = PDF_MARGIN, 300
+        page.text(left, 40, 'Flight Log Overview', size=14, bold=True)
+
+        y = 62
+        for left_text, right_text in (
+            (f"Name: {user.first_name or ''} {user.last_name or ''}", f"Email: {user.email or ''}"),
+            (f"Company: {user.company or ''}", f"Phone: {user.phone or ''}"),
+            (f"City: {user.city or ''}", f"Country: {user.country or ''}"),
+        ):
+            page.text(left, y, left_text)
+            page.text(right, y, right_text)
+            y += 16
+
+        sections = [
+            ('Total Flight Times', [
+                ('Total Flight Time:', _format_seconds(summary['total_flight_time'])),
+                ('PIC Flight Time:', _format_seconds(summary['pic_time'])),
+                ('Dual Flight Time:', _format_seconds(summary['dual_time'])),
+                ('Instructor Flight Time:', _format_seconds(summary['instruction_time'])),
+                ('Day Flight Time:', _format_seconds(summary['day_time'])),
+                ('Night Flight Time:', _format_seconds(summary['night_time'])),
+            ]),
+            ('Total Flights per Conditions', [
+                ('Total Flights:', summary['total_flights']),
+                ('Total Landings:', summary['total_landings']),
+                ('Total Takeoffs:', summary['total_takeoffs']),
+                ('Different UAVs:', summary['uav_count']),
+                ('Flights in VLOS Conditions:', summary['vlos_flights']),
+                ('Flights in BVLOS Conditions:', summary['bvlos_flights']),
+                ('Flights in EVLOS Conditions:', summary['evlos_flights']),
+                ('Flights PIC:', summary['pic_flights']),
+                ('Flights Dual:', summary['dual_flights']),
+                ('Flights Instruction:', summary['instruction_flights']),
+            ]),
+        ]
+        for title, rows in sections:
+            page.line(left, y, page.width - PDF_MARGIN, y, gray=0.4)
+            y += 20
+            page.text(left, y, title, size=12, bold=True)
+            y += 16
+            for label, value in rows:
+                page.text(left, y, label, size=11)
+                page.text(right, y, value, size=11)
+                y += 14
+            y += 4
+
+        page.text(left, page.height - 20, f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", size=9)
+        return page
+
+    @staticmethod
+    def _draw_table_header(page):
+        """Draw the title and column headers, returning the y of the first row."""
+        page.text(PDF_MARGIN, 30, 'Flight Log Entries', size=14, bold=True)
+        page.rect(PDF_MARGIN, 40, sum(width for _, _, width in PDF_COLUMNS), PDF_ROW_HEIGHT + 2, PDF_HEADER_COLOR)
+
+        x = PDF_MARGIN
+        for header, _, width in PDF_COLUMNS:
+            page.text(x + 2, 51, PdfPage.fit(header, width, 8), size=8, bold=True, color=(255, 255, 255))
+            x += width
+        return 40 + PDF_ROW_HEIGHT + 2
+
+    @staticmethod
+    def _draw_row(page, y, row):
+        x = PDF_MARGIN
+        for _, field, width in PDF_COLUMNS:
+            if field == 'drone_name':
+                value = row['uav__drone_name']
+            elif field == 'flight_duration':
+                value = f"{row[field] / 60:.1f}" if row[field] else ''
+            else:
+                value = row[field]
+            page.text(x + 2, y + 10, PdfPage.fit(value, width - 4, 8), size=8)
+            x += width
+        page.line(PDF_MARGIN, y + PDF_ROW_HEIGHT, x, y + PDF_ROW_HEIGHT, gray=0.85)
+
+    @staticmethod
+    def export_response(queryset, user, file_format):
+        """Stream the logbook as a pdf or csv file download."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if file_format == 'pdf':
+            response = StreamingHttpResponse(LogbookService.stream_pdf(queryset, user), content_type='application/pdf')
+        else:
+            response = StreamingHttpResponse(LogbookService.stream_csv(queryset), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="flightlog_export_{timestamp}.{file_format}"'
+        return response
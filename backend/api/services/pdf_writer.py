@@ -0,0 +1,131 @@
+import zlib
+
+# A4 landscape in points
+LANDSCAPE_A4 = (842, 595)
+
+# Object ids reserved up front; page objects follow
+CATALOG_ID = 1
+PAGES_ID = 2
+FONT_ID = 3
+BOLD_FONT_ID = 4
+
+
+def _escape(text):
+    """Encode text for a PDF string literal using the standard fonts' WinAnsi encoding."""
+    data = str(text).encode('cp1252', errors='replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)').replace(b'\r', b'').replace(b'\n', b' ')
+
+
+class PdfPage:
+    """Drawing operations for one page, using top-left based coordinates like the browser export."""
+
+    def __init__(self, size=LANDSCAPE_A4):
+        self.width, self.height = size
+        self._operations = []
+
+    def text(self, x, y, value, size=10, bold=False, color=(0, 0, 0)):
+        font = 'F2' if bold else 'F1'
+        self._operations.append(
+            b'BT %s rg /%s %d Tf %.2f %.2f Td (%s) Tj ET' % (
+                self._color(color), font.encode(), size, x, self.height - y, _escape(value)
+            )
+        )
+
+    def line(self, x1, y1, x2, y2, gray=0.6):
+        self._operations.append(
+            b'%.2f G %.2f %.2f m %.2f %.2f l S' % (gray, x1, self.height - y1, x2, self.height - y2)
+        )
+
+    def rect(self, x, y, width, height, color):
+        self._operations.append(
+            b'%s rg %.2f %.2f %.2f %.2f re f' % (self._color(color), x, self.height - y - height, width, height)
+        )
+
+    @staticmethod
+    def _color(color):
+        return b'%.3f %.3f %.3f' % tuple(channel / 255 for channel in color)
+
+    @staticmethod
+    def fit(value, width, size):
+        """Shorten value so it roughly fits width points at the given font size."""
+        value = '' if value is None else str(value)
+        max_chars = int(width / (size * 0.55))
+        if len(value) <= max_chars:
+            return value
+        return value[:max(max_chars - 3, 0)] + '...'
+
+    def render(self):
+        return b'\n'.join(self._operations)
+
+
+class PdfStreamWriter:
+    """Write a PDF incrementally: each page is emitted as soon as it is drawn.
+
+    Only the byte offsets of the written objects are kept, so memory stays
+    bounded by one page regardless of the document length.
+    """
+
+    def __init__(self, size=LANDSCAPE_A4):
+        self.size = size
+        self._offset = 0
+        self._offsets = {}
+        self._page_ids = []
+        self._next_id = BOLD_FONT_ID + 1
+
+    def _emit(self, data):
+        self._offset += len(data)
+        return data
+
+    def _object(self, object_id, body):
+        self._offsets[object_id] = self._offset
+        return self._emit(b'%d 0 obj\n' % object_id + body + b'\nendobj\n')
+
+    def start(self):
+        """Return the file header and the shared font objects."""
+        return b''.join([
+            self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'),
+            self._object(FONT_ID, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'),
+            self._object(BOLD_FONT_ID, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>'),
+        ])
+
+    def new_page(self):
+        return PdfPage(self.size)
+
+    def page(self, page):
+        """Return the bytes of a finished page."""
+        content = zlib.compress(page.render())
+        content_id, page_id = self._next_id, self._next_id + 1
+        self._next_id += 2
+        self._page_ids.append(page_id)
+
+        return b''.join([
+            self._object(
+                content_id,
+                b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) + content + b'\nendstream'
+            ),
+            self._object(
+                page_id,
+                b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>' % (
+                    PAGES_ID, self.size[0], self.size[1], FONT_ID, BOLD_FONT_ID, content_id
+                )
+            ),
+        ])
+
+    def finish(self):
+        """Return the page tree, catalog, cross-reference table and trailer."""
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self._page_ids)
+        parts = [
+            self._object(PAGES_ID, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self._page_ids))),
+            self._object(CATALOG_ID, b'<< /Type /Catalog /Pages %d 0 R >>' % PAGES_ID),
+        ]
+
+        xref_offset = self._offset
+        size = self._next_id
+        xref = [b'xref\n0 %d\n' % size, b'0000000000 65535 f \n']
+        xref.extend(b'%010d 00000 n \n' % self._offsets[object_id] for object_id in range(1, size))
+        parts.append(self._emit(b''.join(xref)))
+        parts.append(self._emit(
+            b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, CATALOG_ID, xref_offset)
+        ))
+        return b''.join(parts)
@@ -0,0 +1,46 @@
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+
+class SearchService:
+    # Text columns covered by the global `q=` search. They carry pg_trgm GIN
+    # indexes on Postgres (migration 0007), which also serve `__icontains`.
+    FLIGHTLOG_SEARCH_FIELDS = ['departure_place', 'landing_place', 'comments']
+    UAV_SEARCH_FIELDS = [
+        'drone_name', 'manufacturer', 'type', 'motor_type', 'video_system',
+        'firmware', 'firmware_version', 'gps', 'mag', 'baro', 'gyro', 'acc',
+        'registration_number', 'serial_number'
+    ]
+
+    @staticmethod
+    def apply_search(queryset, term, fields):
+        """Restrict queryset to rows matching term in any of fields, annotated with search_rank."""
+        term = (term or '').strip()
+        if not term:
+            return queryset
+
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f"{field}__icontains": term})
+        queryset = queryset.filter(condition)
+
+        return queryset.annotate(search_rank=SearchService._rank_expression(queryset.db, term, fields))
+
+    @staticmethod
+    def _rank_expression(alias, term, fields):
+        if connections[alias].vendor == 'postgresql':
+            # Best word similarity over all columns, so a close hit on one field wins
+            from django.contrib.postgres.search import TrigramWordSimilarity
+            similarities = [Coalesce(TrigramWordSimilarity(term, field), Value(0.0)) for field in fields]
+            return Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+        # Other backends: rank by the number of columns containing the term
+        matches = [
+            Case(When(**{f"{field}__icontains": term}, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+            for field in fields
+        ]
+        rank = matches[0]
+        for match in matches[1:]:
+            rank = rank + match
+        return rank
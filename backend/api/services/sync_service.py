@@ -0,0 +1,123 @@
+from datetime import timedelta
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ..models import UAV, UAVConfig, FlightLog, MaintenanceLog, MaintenanceReminder, DeletedRecord
+
+# Records returned per sync request, over all sections
+SYNC_PAGE_SIZE = 1000
+
+# A finished sync window restarts this far back, so rows of transactions that
+# committed after the window closed are not missed. Clients upsert by id, so
+# records seen twice are harmless.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+SYNC_CURSOR_SALT = 'api.sync-cursor'
+
+# (section, model, owner lookup, change timestamp field), in the order clients apply them
+SYNC_SECTIONS = [
+    ('uavs', UAV, 'user', 'updated_at'),
+    ('uav_configs', UAVConfig, 'user', 'updated_at'),
+    ('flight_logs', FlightLog, 'user', 'updated_at'),
+    ('maintenance_logs', MaintenanceLog, 'user', 'updated_at'),
+    ('maintenance_reminders', MaintenanceReminder, 'uav__user', 'updated_at'),
+    ('deleted', DeletedRecord, 'user_id', 'deleted_at'),
+]
+
+
+class SyncService:
+    """Incremental changes of a user's records, paged with a signed cursor.
+
+    A sync window covers the changes in [since, until); it is walked section by
+    section in (timestamp, pk) order, so every page is a keyset query on the
+    (user, updated_at) indexes.
+    """
+
+    @staticmethod
+    def _encode_cursor(user, since, until=None, section=0, after=None):
+        return signing.dumps({
+            'user': user.pk,
+            'since': since.isoformat() if since else None,
+            'until': until.isoformat() if until else None,
+            'section': section,
+            'after': [after[0].isoformat(), after[1]] if after else None,
+        }, salt=SYNC_CURSOR_SALT)
+
+    @staticmethod
+    def _decode_cursor(user, cursor):
+        try:
+            state = signing.loads(cursor, salt=SYNC_CURSOR_SALT)
+        except signing.BadSignature:
+            raise ValueError("Invalid sync cursor")
+        if state.get('user') != user.pk:
+            raise ValueError("Invalid sync cursor")
+
+        def moment(value):
+            return parse_datetime(value) if value else None
+
+        after = state.get('after')
+        return (
+            moment(state.get('since')),
+            moment(state.get('until')),
+            state.get('section', 0),
+            (moment(after[0]), after[1]) if after else None,
+        )
+
+    @staticmethod
+    def _section_rows(user, section, since, until, after, limit):
+        _, model, owner, changed = SYNC_SECTIONS[section]
+        queryset = model.objects.filter(**{owner: user.pk, f'{changed}__lt': until})
+        if since:
+            queryset = queryset.filter(**{f'{changed}__gte': since})
+        if after:
+            queryset = queryset.filter(Q(**{f'{changed}__gt': after[0]}) | Q(**{changed: after[0], 'pk__gt': after[1]}))
+
+        fields = [field.attname for field in model._meta.concrete_fields]
+        return list(queryset.order_by(changed, 'pk').values(*fields)[:limit])
+
+    @staticmethod
+    def get_changes(user, cursor=None, limit=SYNC_PAGE_SIZE):
+        """Return one page of changes after cursor, or of all records without one.
+
+        Raises ValueError for a cursor that was not issued to user.
+        """
+        now = timezone.now()
+        if cursor:
+            since, until, section, after = SyncService._decode_cursor(user, cursor)
+        else:
+            since, until, section, after = None, None, 0, None
+        # A cursor from a finished window opens a new one ending now
+        until = until or now
+
+        result = {name: [] for name, _, _, _ in SYNC_SECTIONS}
+        remaining = limit
+        while section < len(SYNC_SECTIONS) and remaining > 0:
+            name, model, _, changed = SYNC_SECTIONS[section]
+            # Without a since there is nothing to delete on the client
+            rows = [] if model is DeletedRecord and since is None else SyncService._section_rows(
+                user, section, since, until, after, remaining
+            )
+            if len(rows) == remaining:
+                after = (rows[-1][changed], rows[-1][model._meta.pk.attname])
+            else:
+                section += 1
+                after = None
+            remaining -= len(rows)
+
+            if model is DeletedRecord:
+                rows = [{'model': row['model_name'], 'id': row['object_id'], 'deleted_at': row['deleted_at']} for row in rows]
+            result[name].extend(rows)
+
+        has_more = section < len(SYNC_SECTIONS)
+        if has_more:
+            next_cursor = SyncService._encode_cursor(user, since, until, section, after)
+        else:
+            next_cursor = SyncService._encode_cursor(user, until - SYNC_OVERLAP)
+
+        return {
+            'changes': {name: rows for name, rows in result.items() if name != 'deleted'},
+            'deleted': result['deleted'],
+            'cursor': next_cursor,
+            'has_more': has_more,
+        }
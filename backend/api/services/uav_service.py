@@ -1,13 +1,86 @@
+import calendar
 import csv
-from django.db.models import Exists, Sum, Count, Value, IntegerField, OuterRef, Q
+import io
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, time
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, Sum, Count, Value, IntegerField, OuterRef, Q
 from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_time
 from ..models import UAV, FlightLog, MaintenanceReminder, FlightGPSLog
+from .search_service import SearchService
+
+# Rows per INSERT when importing CSV files
+CSV_IMPORT_BATCH_SIZE = 1000
+
+# Sample rows listed per outcome by a dry run of the CSV importers
+CSV_PREVIEW_SAMPLES = 5
+
+# Duplicates named in the flight log import message
+DUPLICATE_MESSAGE_ENTRIES = 5
+
+# Operations accepted by one bulk flight log request
+FLIGHTLOG_BULK_MAX_OPERATIONS = 1000
+
+# Heavy columns list endpoints leave out unless asked for with ?include=
+UAV_LIST_DEFERRED_FIELDS = ('custom_attributes',)
+
+
+@contextmanager
+def _csv_rows(csv_file):
+    """DictReader over an uploaded file, decoded as it is read."""
+    text = io.TextIOWrapper(csv_file, encoding='utf-8', newline='')
+    try:
+        yield csv.DictReader(text)
+    finally:
+        # Leave the upload itself open; Django closes it
+        text.detach()
+
+
+def _csv_preview_samples():
+    return {'new': [], 'duplicate': [], 'unmapped': [], 'invalid': []}
+
+
+def _parse_or_none(parse, value):
+    """parse_date / parse_time that also returns None for impossible values."""
+    try:
+        return parse(value) if value else None
+    except ValueError:
+        return None
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _add_sample(results, outcome, sample):
+    """Keep the first few rows of each outcome of a dry run."""
+    samples = results.get('samples')
+    if samples is not None and len(samples[outcome]) < CSV_PREVIEW_SAMPLES:
+        samples[outcome].append(sample)
 
 class UAVService:
+    @staticmethod
+    def list_deferred_fields(query_params, fields):
+        """Fields a list leaves out, less those named in ?include=a,b."""
+        include = (query_params or {}).get('include') or ''
+        included = {name.strip() for name in include.split(',')}
+        return [field for field in fields if field not in included]
+
     @staticmethod
     def get_uav_queryset(user, query_params=None):
-        """Return UAV queryset filtered by user and optional query parameters."""
-        queryset = UAV.objects.filter(user=user)
+        """Return UAV list queryset filtered by user and optional query parameters."""
+        queryset = UAV.objects.filter(user=user).defer(
+            *UAVService.list_deferred_fields(query_params, UAV_LIST_DEFERRED_FIELDS)
+        )
 
         # Annotate with aggregated takeoffs and landings, defaulting to 0 if no logs exist
         queryset = queryset.annotate(
@@ -83,6 +156,10 @@ class UAVService:
                     queryset = queryset.filter(total_landings_agg=landings_val)
                 except (ValueError, TypeError):
                     pass # Ignore if not a valid integer
+
+            # Global search over all text columns, ranked by match quality
+            if query_params.get('q'):
+                queryset = SearchService.apply_search(queryset, query_params['q'], SearchService.UAV_SEARCH_FIELDS)
         
         return queryset
 
@@ -126,8 +203,14 @@ class UAVService:
             return uav_data
 
     @staticmethod
-    def import_uavs_from_csv(csv_file, user):
-        """Import UAVs from CSV file"""
+    def import_uavs_from_csv(csv_file, user, dry_run=False):
+        """Import UAVs from CSV file
+
+        Rows are checked against the user's drone names loaded once and the
+        new UAVs are inserted together in one transaction. With dry_run nothing
+        is saved and 'success_count' is what would be imported.
+        """
+        from .import_service import ImportService
         results = {
             'total': 0,
             'success_count': 0,
@@ -136,91 +219,114 @@ class UAVService:
             'errors': [],
             'duplicate_message': ''
         }
+        if dry_run:
+            results['dry_run'] = True
+            results['samples'] = _csv_preview_samples()
         
         try:
-            csv_text = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(csv_text.splitlines())
-            
             duplicates = []
-            
-            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 for human-readable row numbers
-                results['total'] += 1
+            new_uavs = []
+            drone_names = set(UAV.objects.filter(user=user).values_list('drone_name', flat=True))
+
+            with transaction.atomic(), _csv_rows(csv_file) as csv_reader:
+                for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 for human-readable row numbers
+                    results['total'] += 1
                 
-                try:
-                    # Check for required fields
-                    required_fields = ['drone_name', 'type', 'motors']
-                    for field in required_fields:
-                        if not row.get(field):
-                            raise ValueError(f"Missing required field: {field}")
+                    try:
+                        # Check for required fields
+                        required_fields = ['drone_name', 'type', 'motors']
+                        for field in required_fields:
+                            if not row.get(field):
+                                raise ValueError(f"Missing required field: {field}")
                     
-                    # Check for duplicate drone_name
-                    drone_name = row.get('drone_name')
-                    serial_number = row.get('serial_number', '')
+                        # Check for duplicate drone_name
+                        drone_name = row.get('drone_name')
+                        serial_number = row.get('serial_number', '')
+                        sample = {'row': row_num, 'drone_name': drone_name, 'serial_number': serial_number}
                     
-                    # Check if drone with same name already exists
-                    existing_uav = UAV.objects.filter(user=user, drone_name=drone_name).first()
-                    if existing_uav:
-                        results['duplicate_count'] += 1
-                        duplicates.append(drone_name)
-                        continue
+                        # Check if drone with same name already exists, in the account or earlier in the file
+                        if drone_name in drone_names:
+                            results['duplicate_count'] += 1
+                            duplicates.append(drone_name)
+                            _add_sample(results, 'duplicate', sample)
+                            continue
                     
-                    # Convert motors to int
-                    try:
-                        motors = int(row.get('motors', 0))
-                    except ValueError:
-                        motors = 0
+                        # Convert motors to int
+                        try:
+                            motors = int(row.get('motors', 0))
+                        except ValueError:
+                            motors = 0
                     
-                    # Create UAV object with all fields from CSV
-                    uav = UAV(
-                        user=user,
-                        drone_name=drone_name,
-                        manufacturer=row.get('manufacturer', ''),
-                        type=row.get('type', ''),
-                        motors=motors,
-                        motor_type=row.get('motor_type', ''),
-                        video=row.get('video', ''),
-                        video_system=row.get('video_system', ''),
-                        esc=row.get('esc', ''),
-                        esc_firmware=row.get('esc_firmware', ''),
-                        receiver=row.get('receiver', ''),
-                        receiver_firmware=row.get('receiver_firmware', ''),
-                        flight_controller=row.get('flight_controller', ''),
-                        firmware=row.get('firmware', ''),
-                        firmware_version=row.get('firmware_version', ''),
-                        gps=row.get('gps', ''),
-                        mag=row.get('mag', ''),
-                        baro=row.get('baro', ''),
-                        gyro=row.get('gyro', ''),
-                        acc=row.get('acc', ''),
-                        registration_number=row.get('registration_number', ''),
-                        serial_number=serial_number,
-                    )
-                    uav.save()
-                    results['success_count'] += 1
+                        # Create UAV object with all fields from CSV
+                        uav = UAV(
+                            user=user,
+                            drone_name=drone_name,
+                            manufacturer=row.get('manufacturer', ''),
+                            type=row.get('type', ''),
+                            motors=motors,
+                            motor_type=row.get('motor_type', ''),
+                            video=row.get('video', ''),
+                            video_system=row.get('video_system', ''),
+                            esc=row.get('esc', ''),
+                            esc_firmware=row.get('esc_firmware', ''),
+                            receiver=row.get('receiver', ''),
+                            receiver_firmware=row.get('receiver_firmware', ''),
+                            flight_controller=row.get('flight_controller', ''),
+                            firmware=row.get('firmware', ''),
+                            firmware_version=row.get('firmware_version', ''),
+                            gps=row.get('gps', ''),
+                            mag=row.get('mag', ''),
+                            baro=row.get('baro', ''),
+                            gyro=row.get('gyro', ''),
+                            acc=row.get('acc', ''),
+                            registration_number=row.get('registration_number', ''),
+                            serial_number=serial_number,
+                        )
+                        # Saved together below, so a bad row must be caught here
+                        ImportService.validate_record(uav)
+
+                        drone_names.add(drone_name)
+                        new_uavs.append(uav)
+                        results['success_count'] += 1
+                        _add_sample(results, 'new', sample)
                     
-                except Exception as e:
-                    results['error_count'] += 1
-                    results['errors'].append(f"Row {row_num}: {str(e)}")
+                    except Exception as e:
+                        results['error_count'] += 1
+                        results['errors'].append(f"Row {row_num}: {str(e)}")
+                        _add_sample(results, 'invalid', {'row': row_num, 'reason': str(e)})
+
+                    # Written a batch at a time; the transaction keeps the import all or nothing
+                    if len(new_uavs) >= CSV_IMPORT_BATCH_SIZE and not dry_run:
+                        UAV.objects.bulk_create(new_uavs)
+                        new_uavs = []
+
+                if not dry_run:
+                    UAV.objects.bulk_create(new_uavs)
             
             if duplicates:
                 results['duplicate_message'] = f"Duplicates found with drone names: {', '.join(duplicates)}"
                 
             return results
         except Exception as e:
+            results['success_count'] = 0
             results['error_count'] += 1
             results['errors'].append(f"Error processing file: {str(e)}")
             return results
 
 
 class FlightLogService:
+    @staticmethod
+    def get_owner_id(user, query_params=None):
+        """Id of the user whose flight logs are listed."""
+        # Admin-Override: If user is staff and 'user' is in query_params, list this user's logs
+        if query_params and hasattr(user, 'is_staff') and user.is_staff and query_params.get('user'):
+            return query_params['user']
+        return user.pk
+
     @staticmethod
     def get_flightlog_queryset(user, query_params=None):
         """Filter FlightLog queryset based on user and query parameters"""
-        # Admin-Override: If user is staff and 'user' is in query_params, filter by this user ID
-        if query_params and hasattr(user, 'is_staff') and user.is_staff and query_params.get('user'):
-            queryset = FlightLog.objects.filter(user_id=query_params['user'])
-        else:
-            queryset = FlightLog.objects.filter(user=user)
+        queryset = FlightLog.objects.filter(user_id=FlightLogService.get_owner_id(user, query_params))
 
         queryset = queryset.annotate(
             has_gps_log=Exists(
@@ -264,12 +370,33 @@ class FlightLogService:
                 if value:
                     queryset = queryset.filter(**{f"{field}__icontains": value})
             
-            # Time fields - use more flexible matching for time fields
+            # Time fields - a partial time such as "10" or "10:3" matches the
+            # range it is a prefix of, so the column index can be used
             for field in ['departure_time', 'landing_time']:
                 value = query_params.get(field)
                 if value:
-                    # Add flexible time matching - look for times that contain this value
-                    queryset = queryset.filter(**{f"{field}__contains": value})
+                    time_range = FlightLogService.parse_time_prefix(value)
+                    if time_range is None:
+                        queryset = queryset.none()
+                    else:
+                        queryset = queryset.filter(**{f"{field}__range": time_range})
+
+                time_from = FlightLogService.parse_time_prefix(query_params.get(f"{field}_from"))
+                if time_from:
+                    queryset = queryset.filter(**{f"{field}__gte": time_from[0]})
+
+                time_to = FlightLogService.parse_time_prefix(query_params.get(f"{field}_to"))
+                if time_to:
+                    queryset = queryset.filter(**{f"{field}__lte": time_to[1]})
+
+            # Flight duration range in seconds
+            duration_min = query_params.get('duration_min')
+            if duration_min and duration_min.isdigit():
+                queryset = queryset.filter(flight_duration__gte=int(duration_min))
+
+            duration_max = query_params.get('duration_max')
+            if duration_max and duration_max.isdigit():
+                queryset = queryset.filter(flight_duration__lte=int(duration_max))
             
             # Exact match fields for non-time fields
             for field in ['light_conditions', 'ops_conditions', 'pilot_type']:
@@ -283,33 +410,136 @@ class FlightLogService:
                 if value and value.isdigit():
                     queryset = queryset.filter(**{field: int(value)})
             
-            # Date field - departure_date - use more flexible matching for dates
+            # Date field - a year, year-month or any other prefix of YYYY-MM-DD
+            # becomes a date range on the (user, departure_date) index
             departure_date = query_params.get('departure_date')
             if departure_date:
-                try:
-                    # If it's a complete date, use exact match
-                    if len(departure_date) == 10 and departure_date.count('-') == 2:
-                        queryset = queryset.filter(departure_date=departure_date)
-                    # If it looks like a year (4 digits), match by year
-                    elif len(departure_date) == 4 and departure_date.isdigit():
-                        queryset = queryset.filter(departure_date__year=int(departure_date))
-                    # If it looks like a year-month (YYYY-MM)
-                    elif len(departure_date) == 7 and departure_date.count('-') == 1:
-                        year, month = departure_date.split('-')
-                        if year.isdigit() and month.isdigit():
-                            queryset = queryset.filter(
-                                departure_date__year=int(year),
-                                departure_date__month=int(month)
-                            )
-                    # Otherwise use a contains search on the string representation
-                    else:
-                        queryset = queryset.filter(departure_date__contains=departure_date)
-                except Exception:
-                    # If any error occurs, use a simple contains filter as fallback
-                    queryset = queryset.filter(departure_date__contains=departure_date)
-            
+                date_range = FlightLogService.parse_date_prefix(departure_date)
+                if date_range is None:
+                    queryset = queryset.none()
+                else:
+                    queryset = queryset.filter(departure_date__range=date_range)
+
+            # Global search over the text columns, ranked by match quality
+            if query_params.get('q'):
+                queryset = SearchService.apply_search(queryset, query_params['q'], SearchService.FLIGHTLOG_SEARCH_FIELDS)
+
         return queryset
-        
+
+    @staticmethod
+    def _prefix_bounds(value, low, high):
+        """Complete a prefix of a fixed-width format with the lowest and highest fill."""
+        if not value or len(value) > len(low):
+            return None
+        for char, template in zip(value, low):
+            if char.isdigit() != template.isdigit():
+                return None
+        return value + low[len(value):], value + high[len(value):]
+
+    @staticmethod
+    def parse_time_prefix(value):
+        """Return the (start, end) times covered by a partial HH:MM:SS value, or None if invalid."""
+        value = (value or '').strip()
+        if len(value) > 1 and value[1] == ':':
+            value = f"0{value}"  # Accept 9:30 for 09:30
+        bounds = FlightLogService._prefix_bounds(value, '00:00:00', '99:99:99')
+        if bounds is None:
+            return None
+
+        start = [int(part) for part in bounds[0].split(':')]
+        end = [min(int(part), limit) for part, limit in zip(bounds[1].split(':'), (23, 59, 59))]
+        if start[0] > 23 or start[1] > 59 or start[2] > 59:
+            return None
+        return time(*start), time(*end, 999999)
+
+    @staticmethod
+    def parse_date_prefix(value):
+        """Return the (first, last) dates covered by a partial YYYY-MM-DD value, or None if invalid."""
+        bounds = FlightLogService._prefix_bounds((value or '').strip(), '0000-00-00', '9999-19-39')
+        if bounds is None:
+            return None
+
+        start_year, start_month, start_day = (int(part) for part in bounds[0].split('-'))
+        end_year, end_month, end_day = (int(part) for part in bounds[1].split('-'))
+        # A complete year, month or day of zero (0000, 2025-00, 2025-03-00) covers no date
+        if min(end_year, end_month, end_day) < 1:
+            return None
+        start_year, start_month, start_day = max(start_year, 1), max(start_month, 1), max(start_day, 1)
+        end_month = min(end_month, 12)
+        try:
+            if start_month > 12 or start_day > calendar.monthrange(start_year, start_month)[1]:
+                return None
+            end_day = min(end_day, calendar.monthrange(end_year, end_month)[1])
+            return date(start_year, start_month, start_day), date(end_year, end_month, end_day)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def stable_ordering(ordering):
+        """Append a primary key tie-break so rows sharing a date/time keep a fixed order."""
+        pk_name = FlightLog._meta.pk.name
+        ordering = [str(term) for term in ordering]
+        if not any(term.lstrip('-') == pk_name for term in ordering):
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    @staticmethod
+    def _keyset_filter(ordering, values, after):
+        """Build a Q matching the rows strictly after (or before) `values` in `ordering`.
+
+        Expands the lexicographic comparison over the ordering terms, so each
+        branch is a plain range predicate the (user, departure_date) index can seek on.
+        """
+        condition = Q()
+        equal = {}
+        for term in ordering:
+            field = term.lstrip('-')
+            descending = term.startswith('-')
+            lookup = 'lt' if descending == after else 'gt'
+            condition |= Q(**equal, **{f"{field}__{lookup}": values[field]})
+            equal[field] = values[field]
+        return condition
+
+    @staticmethod
+    def get_flightlog_neighbors(queryset, flight_log, ordering, with_position=False):
+        """Return the ids around flight_log in an ordered flight log queryset.
+
+        `previousId` is the row listed right before the flight log and `nextId`
+        the one right after it, so the result matches the list view page order.
+        """
+        pk_name = FlightLog._meta.pk.name
+        ordering = FlightLogService.stable_ordering(ordering)
+
+        fields = [term.lstrip('-') for term in ordering]
+        # Read the sort keys through the queryset so annotations such as search_rank are included
+        values = queryset.filter(pk=flight_log.pk).values(*fields).first()
+        if values is None:
+            if any(not hasattr(flight_log, field) for field in fields):
+                # Not part of the ranked result set, so it has no place in that order
+                values = {'previousId': None, 'nextId': None}
+                if with_position:
+                    values.update(position=None, total=queryset.count())
+                return values
+            values = {field: getattr(flight_log, field) for field in fields}
+        reversed_ordering = [term[1:] if term.startswith('-') else f"-{term}" for term in ordering]
+
+        before = FlightLogService._keyset_filter(ordering, values, after=False)
+        after = FlightLogService._keyset_filter(ordering, values, after=True)
+
+        neighbors = {
+            'previousId': queryset.filter(before).order_by(*reversed_ordering)
+                                  .values_list(pk_name, flat=True).first(),
+            'nextId': queryset.filter(after).order_by(*ordering)
+                              .values_list(pk_name, flat=True).first(),
+        }
+
+        if with_position:
+            neighbors['position'] = queryset.filter(before).count() + 1
+            neighbors['total'] = queryset.count()
+
+        return neighbors
+
     @staticmethod
     def get_flight_stats_for_uav(uav_id):
         """Get flight statistics for a UAV"""
@@ -329,10 +559,163 @@ class FlightLogService:
         }
         
         return stats
+
+    @staticmethod
+    def get_calendar_days(queryset, first_day, last_day):
+        """Per-day flight aggregates between first_day and last_day from a single grouped query."""
+        rows = (
+            queryset.filter(departure_date__range=(first_day, last_day))
+            .order_by()
+            .values('departure_date', 'uav_id', 'light_conditions', 'ops_conditions')
+            .annotate(flights=Count('flightlog_id'), total_flight_time=Sum('flight_duration'))
+        )
+
+        days = {}
+        for row in rows:
+            day = days.setdefault(row['departure_date'], {
+                'date': row['departure_date'],
+                'flights': 0,
+                'total_flight_time': 0,
+                'uav_ids': [],
+                'light_conditions': {},
+                'ops_conditions': {},
+            })
+            day['flights'] += row['flights']
+            day['total_flight_time'] += row['total_flight_time'] or 0
+            if row['uav_id'] not in day['uav_ids']:
+                day['uav_ids'].append(row['uav_id'])
+            for field in ('light_conditions', 'ops_conditions'):
+                day[field][row[field]] = day[field].get(row[field], 0) + row['flights']
+
+        for day in days.values():
+            day['uav_ids'].sort()
+        return [days[key] for key in sorted(days)]
+
+    @staticmethod
+    def get_calendar_day_flights(queryset, day):
+        """Flat rows for one calendar day, without the nested UAV serialization of the list view."""
+        return list(
+            queryset.filter(departure_date=day)
+            .order_by('departure_time', 'flightlog_id')
+            .values(
+                'flightlog_id', 'departure_time', 'landing_time', 'flight_duration',
+                'departure_place', 'comments', 'uav_id', drone_name=F('uav__drone_name')
+            )
+        )
     
     @staticmethod
-    def import_logs_from_csv(csv_file, user):
-        """Import flight logs from CSV file"""
+    def delete_blackbox_files(blackbox_logs):
+        """Remove the decoded CSVs of deleted flight logs and their original uploads."""
+        for blackbox_log in blackbox_logs:
+            csv_path = os.path.join(settings.MEDIA_ROOT, blackbox_log)
+            if os.path.isfile(csv_path):
+                os.remove(csv_path)
+            original_filename = os.path.splitext(os.path.basename(blackbox_log))[0] + '.txt'
+            original_path = os.path.join(settings.BLACKBOX_ORIGINAL_ROOT, original_filename)
+            if os.path.isfile(original_path):
+                os.remove(original_path)
+
+    @staticmethod
+    def bulk_apply(user, operations):
+        """Create, update and delete many flight logs of user in one transaction.
+
+        Returns (result, errors); nothing is written unless every operation is valid.
+        """
+        from ..serializers import FlightLogBulkSerializer
+
+        create = operations.get('create') or []
+        update = operations.get('update') or []
+        delete = operations.get('delete') or []
+        if not all(isinstance(items, list) for items in (create, update, delete)):
+            return None, {'detail': 'create, update and delete must be lists'}
+        if len(create) + len(update) + len(delete) > FLIGHTLOG_BULK_MAX_OPERATIONS:
+            return None, {'detail': f'At most {FLIGHTLOG_BULK_MAX_OPERATIONS} operations per request'}
+
+        def ids(values):
+            return {value for value in map(_int_or_none, values) if value is not None}
+
+        items = [item for item in create + update if isinstance(item, dict)]
+        context = {'uav_ids': set(
+            UAV.objects.filter(user=user, uav_id__in=ids(item.get('uav_id') for item in items))
+            .values_list('uav_id', flat=True)
+        )}
+        flight_logs = FlightLog.objects.filter(user=user).in_bulk(
+            ids(item.get('flightlog_id') for item in update if isinstance(item, dict)) | ids(delete)
+        )
+
+        errors = {}
+        new_logs = []
+        for index, item in enumerate(create):
+            serializer = FlightLogBulkSerializer(data=item, context=context)
+            if serializer.is_valid():
+                new_logs.append(FlightLog(user=user, **serializer.validated_data))
+            else:
+                errors.setdefault('create', {})[index] = serializer.errors
+
+        changed_logs = {}
+        changed_fields = {'updated_at'}
+        for index, item in enumerate(update):
+            flight_log = flight_logs.get(_int_or_none(item.get('flightlog_id'))) if isinstance(item, dict) else None
+            if flight_log is None:
+                errors.setdefault('update', {})[index] = {'flightlog_id': ['Flight log not found']}
+                continue
+            serializer = FlightLogBulkSerializer(flight_log, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                errors.setdefault('update', {})[index] = serializer.errors
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(flight_log, attr, value)
+                changed_fields.add('uav' if attr == 'uav_id' else attr)
+            changed_logs[flight_log.pk] = flight_log
+
+        delete_ids = ids(delete)
+        missing = [value for value in delete if _int_or_none(value) not in flight_logs]
+        if missing:
+            errors['delete'] = [f"Flight log {value} not found" for value in missing]
+
+        if errors:
+            return None, errors
+
+        with transaction.atomic():
+            created = FlightLog.objects.bulk_create(new_logs, batch_size=CSV_IMPORT_BATCH_SIZE)
+
+            now = timezone.now()
+            for flight_log in changed_logs.values():
+                flight_log.updated_at = now
+            FlightLog.objects.bulk_update(changed_logs.values(), sorted(changed_fields), batch_size=CSV_IMPORT_BATCH_SIZE)
+
+            blackbox_logs = [flight_logs[pk].blackbox_log for pk in delete_ids if flight_logs[pk].blackbox_log]
+            FlightLog.objects.filter(pk__in=delete_ids).delete()
+            if blackbox_logs:
+                # Files go once the rows are gone for good, without holding up the response
+                transaction.on_commit(lambda: threading.Thread(
+                    target=FlightLogService.delete_blackbox_files, args=(blackbox_logs,),
+                    name='flightlog-file-cleanup', daemon=True
+                ).start())
+
+        return {
+            'created': [flight_log.pk for flight_log in created],
+            'updated': sorted(changed_logs),
+            'deleted': sorted(delete_ids),
+        }, None
+
+    @staticmethod
+    def _csv_date_value(row):
+        """Departure date of a CSV row (own export or EdgeTX flylog) as a date, or None."""
+        return _parse_or_none(parse_date, row.get('departure_date') or row.get('Date'))
+
+    @staticmethod
+    def import_logs_from_csv(csv_file, user, dry_run=False):
+        """Import flight logs from CSV file
+
+        The file is parsed as it is read and handled in batches of rows: the
+        user's UAVs are loaded once, the (uav, date, time) keys of existing logs
+        once per batch for its date range, and each batch's new logs are
+        inserted together.
+        With dry_run nothing is saved and each row is only classified as new,
+        duplicate, unmapped or invalid, 'success_count' being what would be imported.
+        """
+        from .import_service import ImportService
         results = {
             'total': 0,
             'success_count': 0,
@@ -344,140 +727,171 @@ class FlightLogService:
             'duplicate_message': '',  # Initialize this key
             'imported': []  # Created logs (id + identifying fields) for follow-up uploads
         }
+        if dry_run:
+            results['dry_run'] = True
+            results['samples'] = _csv_preview_samples()
 
         unmapped_uavs = set()
-        duplicate_entries = []
+        duplicate_entries = []  # the first few, for the message
         
         try:
-            csv_text = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(csv_text.splitlines())
-            
-            for row_num, row in enumerate(csv_reader, start=2):
-                results['total'] += 1
-                
-                try:
-                    # Try to find the UAV
-                    uav_identifier = (
-                        row.get('uav_serial', '') or
-                        row.get('drone_name', '') or
-                        row.get('ModelName', '')
-                    )
+            # Serial number first, then drone name; the lowest id wins like .first()
+            uavs_by_serial = {}
+            uavs_by_name = {}
+            for uav in UAV.objects.filter(user=user).order_by('uav_id').only('uav_id', 'drone_name', 'serial_number'):
+                if uav.serial_number:
+                    uavs_by_serial.setdefault(uav.serial_number, uav)
+                uavs_by_name.setdefault(uav.drone_name, uav)
+
+            # Rows are parsed as the file is read and handled a batch at a time,
+            # so memory does not grow with the file
+            dry_run_keys = set()  # a dry run saves nothing, so its keys are kept across batches
+            with _csv_rows(csv_file) as reader:
+                rows = enumerate(reader, start=2)
+                while True:
+                    chunk = list(islice(rows, CSV_IMPORT_BATCH_SIZE))
+                    if not chunk:
+                        break
+                    results['total'] += len(chunk)
+
+                    # Only logs within the batch's dates can be duplicates of its rows;
+                    # earlier batches are already saved and found here too
+                    existing_keys = dry_run_keys if dry_run else set()
+                    dates = [value for value in (FlightLogService._csv_date_value(row) for _, row in chunk) if value]
+                    if dates:
+                        existing_keys.update(
+                            FlightLog.objects.filter(
+                                user=user, departure_date__range=(min(dates), max(dates))
+                            ).values_list('uav_id', 'departure_date', 'departure_time')
+                        )
+                    new_logs = []  # (unsaved log, uav, departure date, departure time)
+
+                    for row_num, row in chunk:
+                        try:
+                            # Try to find the UAV
+                            uav_identifier = (
+                                row.get('uav_serial', '') or
+                                row.get('drone_name', '') or
+                                row.get('ModelName', '')
+                            )
                     
-                    uav = None
-                    if uav_identifier:
-                        # Try to match by serial or name
-                        uav = UAV.objects.filter(
-                            user=user,
-                            serial_number=uav_identifier
-                        ).first() or UAV.objects.filter(
-                            user=user,
-                            drone_name=uav_identifier
-                        ).first()
+                            uav = None
+                            if uav_identifier:
+                                # Try to match by serial or name
+                                uav = uavs_by_serial.get(uav_identifier) or uavs_by_name.get(uav_identifier)
                     
-                    if not uav:
-                        results['unmapped_count'] += 1
-                        unmapped_uavs.add(uav_identifier)
-                        continue
+                            if not uav:
+                                results['unmapped_count'] += 1
+                                unmapped_uavs.add(uav_identifier)
+                                _add_sample(results, 'unmapped', {'row': row_num, 'uav': uav_identifier})
+                                continue
 
-                    # Map CSV fields to FlightLog fields
-                    # Compose departure_place and landing_place from GPS fields if available
-                    if row.get('GPS-Arming-Lat') and row.get('GPS-Arming-Lon'):
-                        gps_departure = f"{row.get('GPS-Arming-Lat')},{row.get('GPS-Arming-Lon')}"
-                        if gps_departure == "0.000000,0.000000":
-                            departure_place = "Unknown"
-                        else:
-                            departure_place = gps_departure
-                    else:
-                        departure_place = row.get('departure_place', '') or row.get('Arming', '')
-                    if row.get('GPS-Disarming-Lat') and row.get('GPS-Disarming-Lon'):
-                        gps_landing = f"{row.get('GPS-Disarming-Lat')},{row.get('GPS-Disarming-Lon')}"
-                        if gps_landing == "0.000000,0.000000":
-                            landing_place = "Unknown"
-                        else:
-                            landing_place = gps_landing
-                    else:
-                        landing_place = row.get('landing_place', '') or row.get('Disarming', '')
-                    
-                    # Parse date and time values properly to ensure correct comparison
-                    departure_date_str = row.get('departure_date') or row.get('Date')
-                    departure_time_str = row.get('departure_time') or row.get('Timestamp-TO')
-                    landing_time_str = row.get('landing_time') or row.get('Timestamp-LDG')
+                            # Map CSV fields to FlightLog fields
+                            # Compose departure_place and landing_place from GPS fields if available
+                            if row.get('GPS-Arming-Lat') and row.get('GPS-Arming-Lon'):
+                                gps_departure = f"{row.get('GPS-Arming-Lat')},{row.get('GPS-Arming-Lon')}"
+                                if gps_departure == "0.000000,0.000000":
+                                    departure_place = "Unknown"
+                                else:
+                                    departure_place = gps_departure
+                            else:
+                                departure_place = row.get('departure_place', '') or row.get('Arming', '')
+                            if row.get('GPS-Disarming-Lat') and row.get('GPS-Disarming-Lon'):
+                                gps_landing = f"{row.get('GPS-Disarming-Lat')},{row.get('GPS-Disarming-Lon')}"
+                                if gps_landing == "0.000000,0.000000":
+                                    landing_place = "Unknown"
+                                else:
+                                    landing_place = gps_landing
+                            else:
+                                landing_place = row.get('landing_place', '') or row.get('Disarming', '')
                     
-                    if not departure_date_str or not departure_time_str:
-                        raise ValueError("Missing required date or departure time")
+                            # Parse date and time values properly to ensure correct comparison
+                            departure_date_str = row.get('departure_date') or row.get('Date')
+                            departure_time_str = row.get('departure_time') or row.get('Timestamp-TO')
+                            landing_time_str = row.get('landing_time') or row.get('Timestamp-LDG')
                     
-                    # Duration in CSV is float seconds, FlightLog expects int seconds
-                    duration_val = row.get('flight_duration') or row.get('Duration')
-                    try:
-                        flight_duration = int(float(duration_val)) if duration_val else 0
-                    except Exception:
-                        flight_duration = 0
+                            if not departure_date_str or not departure_time_str:
+                                raise ValueError("Missing required date or departure time")
                     
-                    # Check if a flight log with the same date, time, and UAV already exists
-                    try:
-                        existing_log = FlightLog.objects.filter(
-                            user=user,
-                            uav=uav,
-                            departure_date=departure_date_str,
-                            departure_time=departure_time_str
-                        ).first()
+                            # Duration in CSV is float seconds, FlightLog expects int seconds
+                            duration_val = row.get('flight_duration') or row.get('Duration')
+                            try:
+                                flight_duration = int(float(duration_val)) if duration_val else 0
+                            except Exception:
+                                flight_duration = 0
 
-                        if existing_log:
-                            # Skip this row as it's a duplicate
-                            results['duplicate_count'] += 1
-                            duplicate_info = f"{uav.drone_name} - {departure_date_str} {departure_time_str}"
-                            duplicate_entries.append(duplicate_info)
-                            continue
-                    except Exception as e:
-                        # If there's an error in the duplicate check, log it and continue with import
-                        results['errors'].append(f"Row {row_num}: Error checking for duplicates: {str(e)}")
-
-                    # Create flight log with parsed values
-                    flight_log = FlightLog(
-                        user=user,
-                        uav=uav,
-                        departure_place=departure_place,
-                        landing_place=landing_place,
-                        departure_date=departure_date_str,
-                        departure_time=departure_time_str,
-                        landing_time=landing_time_str,
-                        flight_duration=flight_duration, 
-                        takeoffs=int(row.get('takeoffs', 1)),
-                        landings=int(row.get('landings', 1)),
-                        light_conditions=row.get('light_conditions', 'Day'),
-                        ops_conditions=row.get('ops_conditions', 'VLOS'),
-                        pilot_type=row.get('pilot_type', 'PIC'),
-                        comments=row.get('comments', '')
-                    )
+                            sample = {
+                                'row': row_num,
+                                'uav': uav.drone_name,
+                                'departure_date': departure_date_str,
+                                'departure_time': departure_time_str,
+                            }
                     
-                    flight_log.save()
-                    results['success_count'] += 1
-
-                    # Record the created log so the client can attach the matching
-                    # TeleLog file to its flightlog_id afterwards.
-                    results['imported'].append({
-                        'flightlog_id': flight_log.flightlog_id,
-                        'uav_id': uav.uav_id,
-                        'drone_name': uav.drone_name,
-                        'serial_number': uav.serial_number,
-                        'departure_date': str(departure_date_str),
-                        'departure_time': str(departure_time_str),
-                    })
+                            # Check if a flight log with the same date, time, and UAV already exists
+                            key = (uav.uav_id, FlightLogService._csv_date_value(row), _parse_or_none(parse_time, departure_time_str))
+                            if key in existing_keys:
+                                # Skip this row as it's a duplicate
+                                results['duplicate_count'] += 1
+                                if len(duplicate_entries) < DUPLICATE_MESSAGE_ENTRIES:
+                                    duplicate_entries.append(f"{uav.drone_name} - {departure_date_str} {departure_time_str}")
+                                _add_sample(results, 'duplicate', sample)
+                                continue
+
+                            # Create flight log with parsed values
+                            flight_log = FlightLog(
+                                user=user,
+                                uav=uav,
+                                departure_place=departure_place,
+                                landing_place=landing_place,
+                                departure_date=departure_date_str,
+                                departure_time=departure_time_str,
+                                landing_time=landing_time_str,
+                                flight_duration=flight_duration, 
+                                takeoffs=int(row.get('takeoffs', 1)),
+                                landings=int(row.get('landings', 1)),
+                                light_conditions=row.get('light_conditions', 'Day'),
+                                ops_conditions=row.get('ops_conditions', 'VLOS'),
+                                pilot_type=row.get('pilot_type', 'PIC'),
+                                comments=row.get('comments', '')
+                            )
+                            # Rows are inserted in batches, so one bad row must not reach the database
+                            ImportService.validate_record(flight_log)
+
+                            existing_keys.add(key)
+                            results['success_count'] += 1
+                            _add_sample(results, 'new', sample)
+                            if not dry_run:
+                                new_logs.append((flight_log, uav, departure_date_str, departure_time_str))
                     
-                except Exception as e:
-                    results['error_count'] += 1
-                    results['errors'].append(f"Row {row_num}: {str(e)}")
+                        except Exception as e:
+                            results['error_count'] += 1
+                            results['errors'].append(f"Row {row_num}: {str(e)}")
+                            _add_sample(results, 'invalid', {'row': row_num, 'reason': str(e)})
+
+                    if dry_run:
+                        continue
+                    FlightLog.objects.bulk_create([flight_log for flight_log, _, _, _ in new_logs])
+
+                    # Record the created logs so the client can attach the matching
+                    # TeleLog files to their flightlog_id afterwards.
+                    for flight_log, uav, departure_date_str, departure_time_str in new_logs:
+                        results['imported'].append({
+                            'flightlog_id': flight_log.flightlog_id,
+                            'uav_id': uav.uav_id,
+                            'drone_name': uav.drone_name,
+                            'serial_number': uav.serial_number,
+                            'departure_date': str(departure_date_str),
+                            'departure_time': str(departure_time_str),
+                        })
             
             if unmapped_uavs:
                 results['unmapped_message'] = f"Could not map UAVs with identifiers: {', '.join(unmapped_uavs)}"
             
             if duplicate_entries:
                 # Add the first few duplicates to the message (limit to avoid overly long messages)
-                max_display = 5
-                display_entries = duplicate_entries[:max_display]
-                additional = len(duplicate_entries) - max_display
+                additional = results['duplicate_count'] - len(duplicate_entries)
                 
-                duplicate_msg = f"Skipped {len(duplicate_entries)} duplicate entries: {', '.join(display_entries)}"
+                duplicate_msg = f"Skipped {results['duplicate_count']} duplicate entries: {', '.join(duplicate_entries)}"
                 if additional > 0:
                     duplicate_msg += f" and {additional} more"
                 results['duplicate_message'] = duplicate_msg
@@ -304,6 +304,184 @@ class UAVAPITests(APITestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['drone_name'], 'User1 Drone')
 
+    def test_uav_image_is_served_from_a_content_hash_url(self):
+        """Pictures are stored as files and returned as immutable, cacheable URLs"""
+        import base64
+        import os
+        import tempfile
+        from django.test import override_settings
+        from .services.image_service import UAVImageService
+
+        uav = UAV.objects.create(
+            user=self.user, drone_name='Picture Drone', manufacturer='DJI', type='Quadcopter', motors=4
+        )
+        url = reverse('uav-detail', args=[uav.uav_id])
+        first = b'\x89PNG\r\n\x1a\nfirst'
+        second = b'\x89PNG\r\n\x1a\nsecond'
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            response = self.client.patch(
+                url, {'image': 'data:image/png;base64,' + base64.b64encode(first).decode()}, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            image_url = response.data['image']
+            uav.refresh_from_db()
+            self.assertTrue(uav.image.startswith('uav_images/'))
+            self.assertIn(os.path.basename(uav.image), image_url)
+
+            self.client.logout()
+            image = self.client.get(image_url)
+            self.assertEqual(image.status_code, status.HTTP_200_OK)
+            self.assertEqual(b''.join(image.streaming_content), first)
+            self.assertEqual(image['Content-Type'], 'image/png')
+            self.assertIn('immutable', image['Cache-Control'])
+            self.assertEqual(self.client.get(image_url, HTTP_IF_NONE_MATCH=image['ETag']).status_code, 304)
+            self.client.force_authenticate(user=self.user)
+
+            # Sending the URL back keeps the picture; a new one replaces and removes the old file
+            self.assertEqual(self.client.patch(url, {'image': image_url}, format='json').status_code, status.HTTP_200_OK)
+            old_file = UAVImageService.file_path(uav.image)
+            self.assertIsNotNone(old_file)
+            self.client.patch(url, {'image': 'data:image/png;base64,' + base64.b64encode(second).decode()}, format='json')
+            self.assertFalse(os.path.exists(old_file))
+
+            self.assertEqual(
+                self.client.patch(url, {'image': 'not an image'}, format='json').status_code,
+                status.HTTP_400_BAD_REQUEST
+            )
+            self.assertEqual(image['X-Content-Type-Options'], 'nosniff')
+            self.assertEqual(image['Content-Security-Policy'], 'sandbox')
+
+    def test_uav_image_is_stored_only_for_valid_requests(self):
+        """A rejected request leaves no picture behind, and SVG is not accepted"""
+        import base64
+        import os
+        import tempfile
+        from django.test import override_settings
+        from .services.image_service import UAVImageService
+
+        UAV.objects.create(user=self.user, drone_name='Taken', manufacturer='DJI', type='Quadcopter', motors=4)
+        picture = 'data:image/png;base64,' + base64.b64encode(b'\x89PNG\r\n\x1a\norphan').decode()
+
+        media_root = tempfile.mkdtemp()
+        with override_settings(MEDIA_ROOT=media_root):
+            response = self.client.post(reverse('uav-list'), {
+                'drone_name': 'Taken', 'manufacturer': 'DJI', 'type': 'Quadcopter', 'motors': 4, 'image': picture
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('drone_name', response.data)
+            self.assertFalse(os.path.exists(os.path.join(media_root, UAVImageService.UAV_IMAGES_DIR)))
+
+            svg = '<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+            response = self.client.post(reverse('uav-list'), {
+                'drone_name': 'Vector', 'manufacturer': 'DJI', 'type': 'Quadcopter', 'motors': 4,
+                'image': 'data:image/svg+xml;base64,' + base64.b64encode(svg.encode()).decode()
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('image', response.data)
+            self.assertFalse(UAV.objects.filter(drone_name='Vector').exists())
+
+    def test_uav_image_release_tolerates_missing_files(self):
+        """Releasing a picture whose files are already gone doesn't fail the delete"""
+        import base64
+        import os
+        import tempfile
+        from unittest import mock
+        from django.test import override_settings
+        from .services.image_service import UAVImageService
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            image = UAVImageService.store_data_uri(
+                'data:image/png;base64,' + base64.b64encode(b'\x89PNG\r\n\x1a\ngone').decode()
+            )
+            uav = UAV.objects.create(
+                user=self.user, drone_name='Picture Drone', manufacturer='DJI', type='Quadcopter', motors=4, image=image
+            )
+            path = UAVImageService.file_path(image)
+            # Another release removed a thumbnail between listing and deleting it
+            with mock.patch.object(UAVImageService, 'thumbnails', return_value={32: 'uav_images/missing_32.webp'}):
+                self.assertEqual(
+                    self.client.delete(reverse('uav-detail', args=[uav.uav_id])).status_code,
+                    status.HTTP_204_NO_CONTENT
+                )
+            self.assertFalse(os.path.exists(path))
+
+    def test_uav_image_thumbnails(self):
+        """Uploads get 32/64/256 px WebP thumbnails, listed as a srcset map"""
+        import base64
+        import io
+        import tempfile
+        from django.test import override_settings
+        from .services import image_service
+        from .services.image_service import UAVImageService, UAV_THUMBNAIL_SIZES
+
+        if image_service.Image is None:
+            self.skipTest('Pillow is not installed')
+
+        picture = io.BytesIO()
+        image_service.Image.new('RGB', (256, 256), (200, 30, 30)).save(picture, 'PNG')
+        uav = UAV.objects.create(
+            user=self.user, drone_name='Picture Drone', manufacturer='DJI', type='Quadcopter', motors=4
+        )
+        url = reverse('uav-detail', args=[uav.uav_id])
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            response = self.client.patch(
+                url, {'image': 'data:image/png;base64,' + base64.b64encode(picture.getvalue()).decode()}, format='json'
+            )
+            self.assertEqual(sorted(response.data['image_srcset']), list(UAV_THUMBNAIL_SIZES))
+
+            thumbnail = self.client.get(response.data['image_srcset'][32])
+            self.assertEqual(thumbnail['Content-Type'], 'image/webp')
+            with image_service.Image.open(io.BytesIO(b''.join(thumbnail.streaming_content))) as decoded:
+                self.assertEqual(decoded.size, (32, 32))
+
+            # Removing the picture removes its thumbnails too
+            uav.refresh_from_db()
+            self.client.patch(url, {'image': None}, format='json')
+            self.assertEqual(UAVImageService.thumbnails(uav.image), {})
+
+    def test_list_defers_heavy_fields(self):
+        """The UAV list leaves out custom_attributes unless included"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        UAV.objects.create(
+            user=self.user, drone_name='Heavy Drone', manufacturer='DJI', type='Quadcopter', motors=4,
+            custom_attributes={'notes': 'x' * 100}
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('uav-list'))
+        self.assertNotIn('custom_attributes', response.data['results'][0])
+        self.assertFalse(any('"custom_attributes"' in query['sql'] for query in queries))
+        response = self.client.get(reverse('uav-list'), {'include': 'custom_attributes'})
+        self.assertEqual(response.data['results'][0]['custom_attributes'], {'notes': 'x' * 100})
+
+    def test_admin_list_defers_heavy_fields(self):
+        """The admin UAV list leaves out custom_attributes without refetching it per row"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.user.is_staff = True
+        self.user.save()
+        for number in range(3):
+            UAV.objects.create(
+                user=self.user, drone_name=f'Heavy Drone {number}', manufacturer='DJI', type='Quadcopter',
+                motors=4, custom_attributes={'notes': 'x' * 100}
+            )
+
+        url = reverse('admin-uavs-list')
+        with CaptureQueriesContext(connection) as deferred:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('custom_attributes' in row for row in response.data['results']))
+        self.assertFalse(any('"custom_attributes"' in query['sql'] for query in deferred))
+
+        with CaptureQueriesContext(connection) as included:
+            response = self.client.get(url, {'include': 'custom_attributes'})
+        self.assertEqual(response.data['results'][0]['custom_attributes'], {'notes': 'x' * 100})
+        self.assertEqual(len(deferred), len(included))
 
 class FlightLogModelTests(TestCase):
     """FlightLog model tests"""
@@ -653,6 +831,1778 @@ class FlightLogAPITests(APITestCase):
         self.assertEqual(data[0]['departure_place'], 'User1 Location')
 
 
+class FlightLogNeighborsTests(APITestCase):
+    """Previous/next flight log navigation tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        # Two flights share a date and time to exercise the primary key tie-break
+        self.logs = [
+            self._create_log('2025-03-18', '09:00:00', 'Field A'),
+            self._create_log('2025-03-19', '10:00:00', 'Field B'),
+            self._create_log('2025-03-19', '10:00:00', 'Field A'),
+            self._create_log('2025-03-20', '08:00:00', 'Field A'),
+        ]
+
+    def _create_log(self, departure_date, departure_time, departure_place):
+        return FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place=departure_place,
+            departure_date=departure_date,
+            departure_time=departure_time,
+            landing_place=departure_place,
+            landing_time=departure_time,
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC'
+        )
+
+    def _walk(self, params=None):
+        """Follow nextId from the first list entry and return the visited ids."""
+        list_response = self.client.get(reverse('flightlog-list'), params or {})
+        ids = [log['flightlog_id'] for log in list_response.data['results']]
+        visited = [ids[0]]
+        while True:
+            url = reverse('flightlog-neighbors', args=[visited[-1]])
+            next_id = self.client.get(url, params or {}).data['nextId']
+            if next_id is None:
+                break
+            visited.append(next_id)
+        return ids, visited
+
+    def test_neighbors_follow_list_order(self):
+        """Walking nextId visits the flights in list order"""
+        ids, visited = self._walk()
+        self.assertEqual(visited, ids)
+
+        ids, visited = self._walk({'ordering': 'departure_date,departure_time'})
+        self.assertEqual(visited, ids)
+
+    def test_neighbors_honour_filters(self):
+        """Neighbors skip flights excluded by the list filters"""
+        ids, visited = self._walk({'departure_place': 'Field A'})
+        self.assertEqual(visited, ids)
+        self.assertEqual(len(visited), 3)
+
+    def test_neighbors_position(self):
+        """Position and total are returned on request"""
+        newest = self.logs[3]
+        url = reverse('flightlog-neighbors', args=[newest.flightlog_id])
+        response = self.client.get(url, {'position': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['previousId'])
+        self.assertEqual(response.data['position'], 1)
+        self.assertEqual(response.data['total'], 4)
+
+        self.assertNotIn('position', self.client.get(url).data)
+
+    def test_neighbors_of_other_users_flight(self):
+        """Neighbors of another user's flight log are not found"""
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(user=other)
+        url = reverse('flightlog-neighbors', args=[self.logs[0].flightlog_id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SearchTests(APITestCase):
+    """Global `q=` search tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Lakeside Quad',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        UAV.objects.create(
+            user=self.user,
+            drone_name='Wing',
+            manufacturer='Lakeside Aero',
+            type='Fixed Wing',
+            motors=1,
+            serial_number='TEST654321'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        # The newest flight only mentions the term in its comments
+        self.strong = self._create_log('2025-03-18', 'Lakeside', 'Lakeside', 'Evening at Lakeside')
+        self.weak = self._create_log('2025-03-20', 'Hill', 'Hill', 'Drove past Lakeside')
+        self._create_log('2025-03-19', 'Hill', 'Hill', '')
+
+    def _create_log(self, departure_date, departure_place, landing_place, comments):
+        return FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place=departure_place,
+            departure_date=departure_date,
+            departure_time='10:00:00',
+            landing_place=landing_place,
+            landing_time='10:10:00',
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC',
+            comments=comments
+        )
+
+    def test_flightlog_search_ranked(self):
+        """q matches any text column and the best match comes first"""
+        response = self.client.get(reverse('flightlog-list'), {'q': 'lakeside'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [log['flightlog_id'] for log in response.data['results']]
+        self.assertEqual(ids, [self.strong.flightlog_id, self.weak.flightlog_id])
+
+    def test_flightlog_search_explicit_ordering(self):
+        """An explicit ordering overrides the relevance order"""
+        response = self.client.get(reverse('flightlog-list'), {'q': 'lakeside', 'ordering': '-departure_date'})
+        ids = [log['flightlog_id'] for log in response.data['results']]
+        self.assertEqual(ids, [self.weak.flightlog_id, self.strong.flightlog_id])
+
+    def test_flightlog_search_neighbors(self):
+        """Neighbors follow the relevance order of a search"""
+        url = reverse('flightlog-neighbors', args=[self.strong.flightlog_id])
+        response = self.client.get(url, {'q': 'lakeside'})
+        self.assertIsNone(response.data['previousId'])
+        self.assertEqual(response.data['nextId'], self.weak.flightlog_id)
+
+    def test_uav_search(self):
+        """q searches the UAV name, manufacturer and component fields"""
+        response = self.client.get(reverse('uav-list'), {'q': 'lakeside'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(reverse('uav-list'), {'q': 'fixed'})
+        self.assertEqual([uav['drone_name'] for uav in response.data['results']], ['Wing'])
+
+
+class FlightLogFilterTests(APITestCase):
+    """Date, time and duration range filter tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.logs = {
+            'winter': self._create_log('2024-12-31', '09:15:00', 300),
+            'january': self._create_log('2025-01-15', '10:30:00', 600),
+            'march': self._create_log('2025-03-19', '10:45:30', 1200),
+            'evening': self._create_log('2025-03-20', '18:05:00', 1800),
+        }
+
+    def _create_log(self, departure_date, departure_time, flight_duration):
+        return FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place='Field',
+            departure_date=departure_date,
+            departure_time=departure_time,
+            landing_place='Field',
+            landing_time=departure_time,
+            flight_duration=flight_duration,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC'
+        )
+
+    def _filter(self, params):
+        response = self.client.get(reverse('flightlog-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {log['flightlog_id'] for log in response.data['results']}
+
+    def _ids(self, *names):
+        return {self.logs[name].flightlog_id for name in names}
+
+    def _explain(self, params):
+        from django.db import connection
+        from .services.uav_service import FlightLogService
+        queryset = FlightLogService.get_flightlog_queryset(self.user, params)
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be scanned sequentially
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_departure_date_prefixes(self):
+        """Year, year-month and full dates select the matching date range"""
+        self.assertEqual(self._filter({'departure_date': '2025'}), self._ids('january', 'march', 'evening'))
+        self.assertEqual(self._filter({'departure_date': '2025-03'}), self._ids('march', 'evening'))
+        self.assertEqual(self._filter({'departure_date': '2025-03-19'}), self._ids('march'))
+        self.assertEqual(self._filter({'departure_date': '2024-1'}), self._ids('winter'))
+        self.assertEqual(self._filter({'departure_date': '2025-13'}), set())
+        for value in ('2025-00', '2025-03-00', '0000'):
+            self.assertEqual(self._filter({'departure_date': value}), set())
+        self.assertEqual(self._filter({'departure_date': '2025-0'}), self._ids('january', 'march', 'evening'))
+
+    def test_time_filters(self):
+        """Partial times match their range and from/to bounds are inclusive"""
+        self.assertEqual(self._filter({'departure_time': '10'}), self._ids('january', 'march'))
+        self.assertEqual(self._filter({'departure_time': '10:45'}), self._ids('march'))
+        self.assertEqual(self._filter({'landing_time': '18:05:00'}), self._ids('evening'))
+        self.assertEqual(
+            self._filter({'departure_time_from': '10:30', 'departure_time_to': '18'}),
+            self._ids('january', 'march', 'evening')
+        )
+
+    def test_duration_range(self):
+        """duration_min and duration_max bound the flight duration"""
+        self.assertEqual(self._filter({'duration_min': '600', 'duration_max': '1200'}), self._ids('january', 'march'))
+        self.assertEqual(self._filter({'duration_min': '1500'}), self._ids('evening'))
+
+    def test_date_filters_use_user_date_index(self):
+        """Date filters are range predicates on the (user, departure_date) index"""
+        for params in (
+            {'departure_date': '2025'},
+            {'departure_date': '2025-03'},
+            {'departure_date': '2025-03-19'},
+            {'date_from': '2025-01-01', 'date_to': '2025-03-31'},
+        ):
+            with self.subTest(params=params):
+                self.assertIn('api_flightl_user_id_ea23d0_idx', self._explain(params))
+
+
+class FlightLogCalendarTests(APITestCase):
+    """Calendar aggregation endpoint tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.quad = UAV.objects.create(
+            user=self.user, drone_name='Quad', manufacturer='DJI', type='Quadcopter', motors=4, serial_number='Q1'
+        )
+        self.wing = UAV.objects.create(
+            user=self.user, drone_name='Wing', manufacturer='DJI', type='Fixed Wing', motors=1, serial_number='W1'
+        )
+        self._create_log(self.quad, '2025-03-19', '10:00:00', 600, 'Day')
+        self._create_log(self.wing, '2025-03-19', '09:00:00', 300, 'Night')
+        self._create_log(self.quad, '2025-03-19', '11:00:00', 900, 'Day')
+        self._create_log(self.quad, '2025-03-21', '10:00:00', 1200, 'Day')
+        self._create_log(self.quad, '2025-04-01', '10:00:00', 60, 'Day')
+
+    def _create_log(self, uav, departure_date, departure_time, flight_duration, light_conditions):
+        return FlightLog.objects.create(
+            user=self.user,
+            uav=uav,
+            departure_place='Field',
+            departure_date=departure_date,
+            departure_time=departure_time,
+            landing_place='Field',
+            landing_time=departure_time,
+            flight_duration=flight_duration,
+            takeoffs=1,
+            landings=1,
+            light_conditions=light_conditions,
+            ops_conditions='VLOS',
+            pilot_type='PIC'
+        )
+
+    def test_month_aggregates(self):
+        """A month is summarised per day in one query"""
+        url = reverse('flightlog-calendar')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'month': '2025-03'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        days = response.data['days']
+        self.assertEqual([str(day['date']) for day in days], ['2025-03-19', '2025-03-21'])
+        self.assertEqual(days[0]['flights'], 3)
+        self.assertEqual(days[0]['total_flight_time'], 1800)
+        self.assertEqual(days[0]['uav_ids'], sorted([self.quad.uav_id, self.wing.uav_id]))
+        self.assertEqual(days[0]['light_conditions'], {'Day': 2, 'Night': 1})
+        self.assertEqual(days[0]['ops_conditions'], {'VLOS': 3})
+
+    def test_day_flights(self):
+        """One day's flights are listed by departure time"""
+        response = self.client.get(reverse('flightlog-calendar'), {'date': '2025-03-19'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flights = response.data['flights']
+        self.assertEqual([flight['drone_name'] for flight in flights], ['Wing', 'Quad', 'Quad'])
+
+    def test_invalid_month(self):
+        """Malformed months and days are rejected"""
+        for params in ({'month': '2025-13'}, {'month': '2025-00'}, {'date': '2025-03-00'}):
+            response = self.client.get(reverse('flightlog-calendar'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class FlightLogExportTests(APITestCase):
+    """Streamed logbook export tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword',
+            first_name='Test',
+            last_name='Pilot'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        start = date(2025, 1, 1)
+        FlightLog.objects.bulk_create([
+            FlightLog(
+                user=self.user,
+                uav=self.uav,
+                departure_place='Field A' if i % 2 else 'Field (B)',
+                departure_date=start + timedelta(days=i),
+                departure_time='10:00:00',
+                landing_place='Field',
+                landing_time='10:10:00',
+                flight_duration=600,
+                takeoffs=1,
+                landings=1,
+                light_conditions='Day',
+                ops_conditions='VLOS',
+                pilot_type='PIC'
+            )
+            for i in range(60)
+        ])
+
+    def _download(self, file_format, params=None):
+        response = self.client.get(reverse('flightlog-export', args=[file_format]), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_export_honours_filters_and_ordering(self):
+        """CSV rows follow the list filters and ordering"""
+        import csv
+        content = self._download('csv', {'departure_place': 'Field A', 'ordering': 'departure_date'})
+        rows = list(csv.DictReader(content.decode().splitlines()))
+
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows[0]['departure_date'], '2025-01-02')
+        self.assertEqual(rows[0]['drone_name'], 'Test Drone')
+        self.assertTrue(all(row['departure_place'] == 'Field A' for row in rows))
+
+    def test_pdf_export_structure(self):
+        """The PDF has an overview page plus table pages and a valid cross-reference table"""
+        import re
+        content = self._download('pdf')
+
+        self.assertTrue(content.startswith(b'%PDF-1.4'))
+        self.assertTrue(content.rstrip().endswith(b'%%EOF'))
+        self.assertEqual(len(re.findall(rb'/Type /Page ', content)), 3)
+
+        xref_offset = int(content.rsplit(b'startxref', 1)[1].split()[0])
+        entries = content[xref_offset:].split(b'trailer')[0].splitlines()[3:]
+        for object_id, entry in enumerate(entries, start=1):
+            offset = int(entry.split()[0])
+            self.assertTrue(content[offset:].startswith(b'%d 0 obj' % object_id))
+
+    def test_invalid_export_format(self):
+        """Only pdf and csv are supported"""
+        response = self.client.get(reverse('flightlog-export', args=['xls']))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class UserDataExportTests(APITestCase):
+    """Full user data export tests"""
+
+    def setUp(self):
+        import tempfile
+        self.media_root = tempfile.mkdtemp()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _export(self):
+        import io
+        import zipfile
+        response = self.client.get(reverse('export-user-data'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_export_is_streamed_with_data_descriptors(self):
+        """The archive is streamed and stored files are copied into it"""
+        import os
+        from django.test import override_settings
+
+        blackbox = os.path.join(self.media_root, 'blackbox_logs', 'flight.csv')
+        os.makedirs(os.path.dirname(blackbox))
+        with open(blackbox, 'wb') as f:
+            f.write(b'time,alt\n' * 1000)
+        FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place='Field',
+            departure_date='2025-03-19',
+            departure_time='10:00:00',
+            landing_place='Field',
+            landing_time='10:10:00',
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC',
+            blackbox_log='blackbox_logs/flight.csv'
+        )
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            archive = self._export()
+
+        self.assertIsNone(archive.testzip())
+        self.assertIn('uavs/uavs.json', archive.namelist())
+        self.assertEqual(archive.read('flight_logs/blackbox/flight.csv'), b'time,alt\n' * 1000)
+        self.assertTrue(all(info.flag_bits & 0x08 for info in archive.infolist()))
+
+    def test_background_export_job(self):
+        """POST queues an export whose archive is downloadable in ranges through a signed link"""
+        import io
+        import zipfile
+        from django.test import override_settings
+        from .services.export_service import ExportService
+
+        with override_settings(EXPORT_ROOT=self.media_root):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                response = self.client.post(reverse('export-user-data'))
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(len(callbacks), 1)
+            self.assertEqual(response.data['status'], 'pending')
+            self.assertIsNone(response.data['download_url'])
+
+            # Run the job inline instead of in its background thread
+            export_id = response.data['export_id']
+            ExportService.run_export_job(export_id)
+
+            detail = self.client.get(reverse('export-job-detail', args=[export_id])).data
+            self.assertEqual(detail['status'], 'completed')
+            self.assertEqual(set(detail['progress'].values()), {'done'})
+            self.assertIn('gps_data', detail['progress'])
+
+            # The link works without credentials and supports resuming
+            anonymous = APIClient()
+            content = b''.join(anonymous.get(detail['download_url']).streaming_content)
+            self.assertIn('uavs/uavs.json', zipfile.ZipFile(io.BytesIO(content)).namelist())
+
+            partial = anonymous.get(detail['download_url'], HTTP_RANGE='bytes=10-')
+            self.assertEqual(partial.status_code, 206)
+            self.assertEqual(partial['Content-Range'], f'bytes 10-{len(content) - 1}/{len(content)}')
+            self.assertEqual(b''.join(partial.streaming_content), content[10:])
+
+            bad_token = anonymous.get(reverse('export-download', args=[export_id]), {'token': 'forged'})
+            self.assertEqual(bad_token.status_code, status.HTTP_404_NOT_FOUND)
+
+            other = User.objects.create_user(email='other@example.com', password='password123')
+            self.client.force_authenticate(user=other)
+            response = self.client.get(reverse('export-job-detail', args=[export_id]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_exports_are_removed(self):
+        """The cleanup job deletes expired archives and their links stop working"""
+        import os
+        from django.test import override_settings
+        from django.utils import timezone
+        from .models import ExportJob
+        from .services.export_service import ExportService
+
+        with override_settings(EXPORT_ROOT=self.media_root):
+            job = ExportJob.objects.create(user=self.user)
+            job = ExportService.run_export_job(job.export_id)
+            path = os.path.join(self.media_root, job.file_path)
+            url = reverse('export-download', args=[job.export_id])
+            token = ExportService.get_download_token(job)
+
+            job.expires_at = timezone.now() - timedelta(minutes=1)
+            job.save()
+            self.assertEqual(self.client.get(url, {'token': token}).status_code, status.HTTP_410_GONE)
+
+            ExportService.cleanup_expired_exports()
+            self.assertFalse(os.path.exists(path))
+            self.assertFalse(ExportJob.objects.filter(export_id=job.export_id).exists())
+
+    def test_interrupted_export_jobs_fail(self):
+        """Errors anywhere in a job, and jobs left behind by a dead worker, end as failed"""
+        import os
+        from unittest import mock
+        from django.test import override_settings
+        from django.utils import timezone
+        from .models import ExportJob
+        from .services.export_service import ExportService
+
+        # EXPORT_ROOT can't be created: the job fails before writing anything
+        blocked_root = os.path.join(self.media_root, 'blocked')
+        open(blocked_root, 'w').close()
+        with override_settings(EXPORT_ROOT=blocked_root):
+            job = ExportJob.objects.create(user=self.user)
+            job = ExportService.run_export_job(job.export_id)
+        self.assertEqual(job.status, 'failed')
+        self.assertTrue(job.error)
+
+        # Jobs are stale once their heartbeat stops, however long ago they started
+        long_ago = timezone.now() - timedelta(hours=2)
+        with override_settings(EXPORT_ROOT=self.media_root):
+            stale = ExportJob.objects.create(user=self.user, status='running')
+            slow = ExportJob.objects.create(user=self.user, status='running')
+            ExportJob.objects.filter(pk=stale.pk).update(created_at=long_ago, updated_at=long_ago)
+            ExportJob.objects.filter(pk=slow.pk).update(created_at=long_ago)
+            partials = [
+                os.path.join(self.media_root, f'dronelogbook_export_{job.export_id}_20250101_000000.zip.part')
+                for job in (stale, slow)
+            ]
+            for partial in partials:
+                open(partial, 'w').close()
+
+            ExportService.fail_stale_export_jobs()
+        stale.refresh_from_db()
+        slow.refresh_from_db()
+        self.assertEqual(stale.status, 'failed')
+        self.assertEqual(slow.status, 'running')
+        self.assertFalse(os.path.exists(partials[0]))
+        self.assertTrue(os.path.exists(partials[1]))
+
+        # A worker finishing after the sweep failed its job doesn't undo that
+        with override_settings(EXPORT_ROOT=self.media_root):
+            swept = ExportJob.objects.create(user=self.user)
+            original_section = ExportService._sections
+
+            def sweep_midway():
+                ExportJob.objects.filter(pk=swept.pk).update(status='failed', error='interrupted')
+                return original_section()
+
+            with mock.patch.object(ExportService, '_sections', side_effect=sweep_midway):
+                job = ExportService.run_export_job(swept.export_id)
+        self.assertEqual((job.status, job.error), ('failed', 'interrupted'))
+        self.assertFalse(job.file_path)
+        self.assertEqual([name for name in os.listdir(self.media_root) if f'_{swept.export_id}_' in name], [])
+
+    def _create_flight(self, departure_date, comments='', uav=None):
+        return FlightLog.objects.create(
+            user=self.user,
+            uav=uav or self.uav,
+            departure_place='Field',
+            departure_date=departure_date,
+            departure_time='10:00:00',
+            landing_place='Field',
+            landing_time='10:10:00',
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC',
+            comments=comments
+        )
+
+    def test_compressed_formats_are_stored(self):
+        """Large files are deflated as they stream; images and blackbox originals are stored"""
+        import os
+        import random
+        import zipfile
+        from django.test import override_settings
+        from .services.image_service import UAVImageService
+
+        rng = random.Random(0)
+        data = b''.join(f'{index},{rng.randint(0, 9999)},alt\n'.encode() for index in range(200000))
+        blackbox = os.path.join(self.media_root, 'blackbox', 'flight-1.csv')
+        original_root = os.path.join(self.media_root, 'blackbox-original')
+        os.makedirs(os.path.dirname(blackbox))
+        os.makedirs(original_root)
+        with open(blackbox, 'wb') as f:
+            f.write(data)
+        with open(os.path.join(original_root, 'flight-1.txt'), 'wb') as f:
+            f.write(b'H Product:Blackbox flight data recorder\n' * 100)
+        flight = self._create_flight('2025-03-01')
+        flight.blackbox_log = 'blackbox/flight-1.csv'
+        flight.save()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            self.uav.image = UAVImageService.store(b'\x89PNG\r\n\x1a\n', 'png')
+        self.uav.save()
+
+        with override_settings(MEDIA_ROOT=self.media_root, BLACKBOX_ORIGINAL_ROOT=original_root, EXPORT_COMPRESSION_LEVEL=1):
+            archive = self._export()
+
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read('flight_logs/blackbox/flight-1.csv'), data)
+        self.assertEqual(archive.getinfo('flight_logs/blackbox/flight-1.csv').compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(archive.getinfo('flight_logs/blackbox/flight-1.csv').compress_size, len(data) // 2)
+        self.assertEqual(archive.getinfo('flight_logs/blackbox-original/flight-1.txt').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo('uavs/images/uav_%d.png' % self.uav.uav_id).compress_type, zipfile.ZIP_STORED)
+
+    def test_export_query_count_is_constant(self):
+        """The export runs a fixed number of queries however many records there are"""
+        import io
+        import json
+        import zipfile
+        from django.test import override_settings
+        from .models import UAVConfig
+        from .services.export_service import ExportService
+
+        def add_records(count):
+            for index in range(count):
+                uav = UAV.objects.create(
+                    user=self.user, drone_name=f'Drone {UAV.objects.count()}', manufacturer='DJI',
+                    type='Quadcopter', motors=4
+                )
+                self._create_flight('2025-03-01', uav=uav)
+                self._create_flight('2025-03-02', uav=uav)
+                UAVConfig.objects.create(user=self.user, uav=uav, name='Config', upload_date='2025-03-01', file='configs/c.txt')
+                MaintenanceLog.objects.create(user=self.user, uav=uav, event_type='Repair', description='Props', event_date='2025-03-01')
+                MaintenanceReminder.objects.create(
+                    uav=uav, component='props', last_maintenance='2025-03-01', next_maintenance='2025-06-01'
+                )
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            add_records(1)
+            with self.assertNumQueries(7):
+                b''.join(ExportService.stream_user_data(self.user))
+
+            add_records(5)
+            with self.assertNumQueries(7):
+                content = b''.join(ExportService.stream_user_data(self.user))
+
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        uavs = json.loads(archive.read('uavs/uavs.json'))
+        self.assertEqual(uavs[1]['props_reminder_date'], '2025-06-01')
+        flights = archive.read('flight_logs/flight_logs.csv').decode().splitlines()
+        self.assertEqual(len(flights), 13)
+        self.assertIn('Drone 1', flights[2])
+
+    def test_gps_export_uses_one_query(self):
+        """GPS tracks of all flights are read in one query and round-trip through the import"""
+        import io
+        import json
+        import zipfile
+        from .models import FlightGPSLog
+        from .services.export_service import ExportService, _ZipStreamSink
+        from .services.import_service import ImportService
+
+        flights = [self._create_flight('2025-03-01'), self._create_flight('2025-03-02')]
+        for flight in flights:
+            FlightGPSLog.objects.bulk_create([
+                FlightGPSLog(flight_log=flight, timestamp=index, latitude=48.0 + index, longitude=11.0, altitude=None)
+                for index in (2, 0, 1)
+            ])
+
+        sink = _ZipStreamSink()
+        with zipfile.ZipFile(sink, 'w') as zip_file:
+            with self.assertNumQueries(1):
+                list(ExportService._export_gps_data(zip_file, self.user))
+        archive = zipfile.ZipFile(io.BytesIO(sink.pop()))
+
+        track = json.loads(archive.read(f'flight_logs/gps_data/flight_{flights[0].flightlog_id}_gps.json'))
+        self.assertEqual(track['columns'][:4], ['timestamp', 'latitude', 'longitude', 'altitude'])
+        self.assertEqual([row[:4] for row in track['rows']], [[0, 48.0, 11.0, None], [1, 49.0, 11.0, None], [2, 50.0, 11.0, None]])
+
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        result = ImportService.import_user_data(other, io.BytesIO(b''.join(ExportService.stream_user_data(self.user))))
+        self.assertTrue(result['success'], result)
+        imported = FlightLog.objects.get(user=other, departure_date='2025-03-01')
+        self.assertEqual(list(imported.gps_logs.values_list('timestamp', 'latitude')), [(0, 48.0), (1, 49.0), (2, 50.0)])
+
+    def test_import_reads_members_from_the_upload(self):
+        """Files are copied straight out of the uploaded archive into storage"""
+        import os
+        import tempfile
+        import zipfile
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from .models import UAVConfig
+        from .services.export_service import ExportService
+        from .services.import_service import ImportService
+
+        original_root = os.path.join(self.media_root, 'blackbox-original')
+        for path, content in (
+            ('blackbox/flight-7.csv', b'time,alt\n1,2\n'),
+            ('blackbox-original/flight-7.txt', b'H Product:Blackbox\n'),
+            ('uav_configs/diff.txt', b'set gyro_lpf = 100\n'),
+        ):
+            os.makedirs(os.path.join(self.media_root, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(self.media_root, path), 'wb') as f:
+                f.write(content)
+        flight = self._create_flight('2025-03-01')
+        flight.blackbox_log = 'blackbox/flight-7.csv'
+        flight.save()
+        UAVConfig.objects.create(user=self.user, uav=self.uav, name='Diff', upload_date='2025-03-01', file='uav_configs/diff.txt')
+
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        target_root = tempfile.mkdtemp(dir=self.media_root)
+        with override_settings(MEDIA_ROOT=self.media_root, BLACKBOX_ORIGINAL_ROOT=original_root):
+            content = b''.join(ExportService.stream_user_data(self.user))
+        self.client.force_authenticate(user=other)
+        with override_settings(MEDIA_ROOT=target_root, BLACKBOX_ORIGINAL_ROOT=os.path.join(target_root, 'originals'),
+                               IMPORT_ROOT=self.media_root), \
+                mock.patch.object(zipfile.ZipFile, 'extractall', side_effect=AssertionError('extractall')):
+            with self.captureOnCommitCallbacks(execute=False):
+                response = self.client.post(
+                    reverse('import-user-data'),
+                    {'file': SimpleUploadedFile('export.zip', content, content_type='application/zip')},
+                    format='multipart'
+                )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+            job = ImportService.run_import_job(response.data['import_id'])
+            self.assertEqual(job.status, 'completed', job.result)
+
+            imported = FlightLog.objects.get(user=other)
+            with open(os.path.join(target_root, imported.blackbox_log), 'rb') as f:
+                self.assertEqual(f.read(), b'time,alt\n1,2\n')
+            with open(os.path.join(target_root, 'originals', f'flight-{imported.flightlog_id}.txt'), 'rb') as f:
+                self.assertEqual(f.read(), b'H Product:Blackbox\n')
+            config = UAVConfig.objects.get(user=other)
+            with config.file.open('rb') as f:
+                self.assertEqual(f.read(), b'set gyro_lpf = 100\n')
+
+    def test_background_import_job(self):
+        """POST queues an import whose per-phase progress and result stay queryable"""
+        import os
+        import tempfile
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from .services.export_service import ExportService
+        from .services.import_service import ImportService
+
+        self._create_flight('2025-03-01')
+        content = b''.join(ExportService.stream_user_data(self.user))
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(user=other)
+
+        import_root = tempfile.mkdtemp(dir=self.media_root)
+        with override_settings(IMPORT_ROOT=import_root):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                response = self.client.post(
+                    reverse('import-user-data'),
+                    {'file': SimpleUploadedFile('export.zip', content, content_type='application/zip')},
+                    format='multipart'
+                )
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(len(callbacks), 1)
+            self.assertEqual(response.data['status'], 'pending')
+
+            # Run the job inline instead of in its background thread
+            import_id = response.data['import_id']
+            ImportService.run_import_job(import_id)
+
+            detail = self.client.get(reverse('import-job-detail', args=[import_id])).data
+            self.assertEqual(detail['status'], 'completed')
+            self.assertEqual(detail['progress']['flight_logs'], 'done')
+            self.assertEqual(detail['progress']['deletions'], 'skipped')
+            self.assertEqual(detail['result']['details']['flight_logs_imported'], 1)
+            self.assertEqual(detail['result']['details']['errors'], [])
+            self.assertEqual(os.listdir(import_root), [])
+
+        # Jobs of other users are not visible
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('import-job-detail', args=[import_id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_import_job(self):
+        """A cancelled import stops before its next phase and keeps the phases already done"""
+        import os
+        import tempfile
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from .models import ImportJob
+        from .services.export_service import ExportService
+        from .services.import_service import ImportService
+
+        self._create_flight('2025-03-01')
+        content = b''.join(ExportService.stream_user_data(self.user))
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self.client.force_authenticate(user=other)
+
+        import_root = tempfile.mkdtemp(dir=self.media_root)
+        with override_settings(IMPORT_ROOT=import_root):
+            with self.captureOnCommitCallbacks(execute=False):
+                import_id = self.client.post(
+                    reverse('import-user-data'),
+                    {'file': SimpleUploadedFile('export.zip', content, content_type='application/zip')},
+                    format='multipart'
+                ).data['import_id']
+
+            # Request the cancellation once the UAVs are in
+            import_uavs = ImportService._import_uavs
+
+            def import_uavs_then_cancel(*args):
+                count = import_uavs(*args)
+                self.client.post(reverse('import-job-cancel', args=[import_id]))
+                return count
+
+            with mock.patch.object(ImportService, '_import_uavs', side_effect=import_uavs_then_cancel):
+                job = ImportService.run_import_job(import_id)
+
+        self.assertEqual(job.status, 'cancelled')
+        self.assertEqual(job.progress['uavs'], 'done')
+        self.assertEqual(job.progress['flight_logs'], 'pending')
+        self.assertTrue(job.result['cancelled'])
+        self.assertEqual(UAV.objects.filter(user=other).count(), 1)
+        self.assertFalse(FlightLog.objects.filter(user=other).exists())
+
+        # Finished jobs cannot be cancelled any more
+        response = self.client.post(reverse('import-job-cancel', args=[import_id]))
+        self.assertEqual(response.data['status'], 'cancelled')
+        self.assertEqual(ImportJob.objects.get(import_id=import_id).status, 'cancelled')
+
+    def test_interrupted_import_jobs_fail(self):
+        """Errors anywhere in a job, and jobs left behind by a dead worker, end as failed"""
+        import os
+        import tempfile
+        from unittest import mock
+        from django.db import DatabaseError
+        from django.test import override_settings
+        from django.utils import timezone
+        from .models import ImportJob
+        from .services.import_service import ImportService
+
+        import_root = tempfile.mkdtemp(dir=self.media_root)
+        with override_settings(IMPORT_ROOT=import_root):
+            job = ImportJob.objects.create(user=self.user, file_path='import_missing.zip')
+            with mock.patch.object(ImportJob, 'save', side_effect=DatabaseError('connection lost')):
+                job = ImportService.run_import_job(job.import_id)
+            self.assertEqual(job.status, 'failed')
+            self.assertEqual(job.error, 'connection lost')
+
+            # Jobs are stale once their heartbeat stops, however long ago they started
+            long_ago = timezone.now() - timedelta(hours=2)
+            stale = ImportJob.objects.create(user=self.user, status='running')
+            slow = ImportJob.objects.create(user=self.user, status='running')
+            ImportJob.objects.filter(pk=stale.pk).update(created_at=long_ago, updated_at=long_ago)
+            ImportJob.objects.filter(pk=slow.pk).update(created_at=long_ago)
+            uploads = [os.path.join(import_root, f'import_{job.import_id}.zip') for job in (stale, slow)]
+            for upload in uploads:
+                open(upload, 'w').close()
+
+            ImportService.fail_stale_import_jobs()
+            stale.refresh_from_db()
+            slow.refresh_from_db()
+            self.assertEqual(stale.status, 'failed')
+            self.assertIsNotNone(stale.completed_at)
+            self.assertEqual(slow.status, 'running')
+            self.assertFalse(os.path.exists(uploads[0]))
+            self.assertTrue(os.path.exists(uploads[1]))
+
+            # A worker finishing after the sweep failed its job doesn't undo that
+            swept = ImportJob.objects.create(user=self.user)
+
+            def sweep_midway(*args, **kwargs):
+                ImportJob.objects.filter(pk=swept.pk).update(status='failed', error='interrupted')
+                return {'success': True, 'message': 'Import successful', 'details': {'errors': []}}
+
+            with mock.patch.object(ImportService, 'import_user_data', side_effect=sweep_midway):
+                job = ImportService.run_import_job(swept.import_id)
+            self.assertEqual((job.status, job.error), ('failed', 'interrupted'))
+            swept.refresh_from_db()
+            self.assertEqual(swept.status, 'failed')
+
+    def test_import_dry_run(self):
+        """?dry_run=1 classifies the archive's records without writing anything"""
+        import io
+        import json
+        import zipfile
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ImportJob
+        from .services.export_service import ExportService
+
+        self._create_flight('2025-03-01')
+        self._create_flight('2025-03-02')
+        exported = zipfile.ZipFile(io.BytesIO(b''.join(ExportService.stream_user_data(self.user))))
+
+        # Add a flight with an unreadable date
+        flights = json.loads(exported.read('flight_logs/flight_logs.json'))
+        flights.append({**flights[0], 'flightlog_id': 9001, 'departure_date': 'yesterday'})
+
+        def dry_run(user, skip=()):
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w') as archive:
+                for name in exported.namelist():
+                    if name not in skip:
+                        data = json.dumps(flights) if name == 'flight_logs/flight_logs.json' else exported.read(name)
+                        archive.writestr(name, data)
+
+            self.client.force_authenticate(user=user)
+            response = self.client.post(
+                f"{reverse('import-user-data')}?dry_run=1",
+                {'file': SimpleUploadedFile('export.zip', buffer.getvalue(), content_type='application/zip')},
+                format='multipart'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            self.assertTrue(response.data['dry_run'])
+            return response.data['details']['sections']
+
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        sections = dry_run(other)
+        self.assertEqual(sections['uavs']['new'], 1)
+        flight_logs = sections['flight_logs']
+        self.assertEqual((flight_logs['new'], flight_logs['invalid']), (2, 1))
+        self.assertEqual(flight_logs['samples']['invalid'][0]['flightlog_id'], 9001)
+        self.assertIn('departure_date', flight_logs['samples']['invalid'][0]['reason'])
+        self.assertFalse(UAV.objects.filter(user=other).exists())
+        self.assertFalse(ImportJob.objects.exists())
+
+        # Without its UAVs the flights have nothing to attach to
+        sections = dry_run(other, skip={'uavs/uavs.json'})
+        self.assertEqual(sections['flight_logs']['unmapped'], 3)
+
+        # The same archive against its own account only holds duplicates
+        sections = dry_run(self.user)
+        self.assertEqual((sections['uavs']['duplicate'], sections['uavs']['new']), (1, 0))
+        self.assertEqual((sections['flight_logs']['duplicate'], sections['flight_logs']['new']), (2, 0))
+        self.assertEqual(FlightLog.objects.filter(user=self.user).count(), 2)
+
+    def _archive_with_invalid_records(self):
+        """Export of two flights and a maintenance log, plus one invalid record of each."""
+        import io
+        import json
+        import zipfile
+        from .services.export_service import ExportService
+
+        self._create_flight('2025-03-01')
+        self._create_flight('2025-03-02')
+        MaintenanceLog.objects.create(
+            user=self.user, uav=self.uav, event_type='Check', description='Props', event_date='2025-03-01'
+        )
+        exported = zipfile.ZipFile(io.BytesIO(b''.join(ExportService.stream_user_data(self.user))))
+        flights = json.loads(exported.read('flight_logs/flight_logs.json'))
+        flights.append({**flights[0], 'flightlog_id': 9001, 'departure_time': '99:99:99'})
+        maintenance = json.loads(exported.read('maintenance_logs/maintenance_logs.json'))
+        maintenance.append({**maintenance[0], 'maintenance_id': 9002, 'event_date': 'soon'})
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name in exported.namelist():
+                data = exported.read(name)
+                if name == 'flight_logs/flight_logs.json':
+                    data = json.dumps(flights)
+                elif name == 'maintenance_logs/maintenance_logs.json':
+                    data = json.dumps(maintenance)
+                archive.writestr(name, data)
+        return buffer.getvalue()
+
+    def test_import_skips_invalid_records_only(self):
+        """An invalid record is reported and left out; the rest of its section is imported"""
+        import io
+        import tempfile
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from .services.import_service import ImportService
+
+        archive = self._archive_with_invalid_records()
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        with override_settings(IMPORT_ROOT=tempfile.mkdtemp(dir=self.media_root)):
+            with self.captureOnCommitCallbacks(execute=False):
+                job = ImportService.create_import_job(other, SimpleUploadedFile('export.zip', archive))
+            job = ImportService.run_import_job(job.import_id)
+        self.assertEqual(job.status, 'completed', job.result)
+        self.assertEqual(FlightLog.objects.filter(user=other).count(), 2)
+        self.assertEqual(MaintenanceLog.objects.filter(user=other).count(), 1)
+
+        # The background job keeps why each record was skipped, up to a cap
+        job.refresh_from_db()
+        details = job.result['details']
+        self.assertEqual(details['skipped_records'], 2)
+        self.assertEqual(len(details['record_errors']), 2)
+        self.assertTrue(all(error.startswith('Error importing') for error in details['record_errors']))
+        with mock.patch('api.services.import_service.IMPORT_RECORD_ERRORS_KEPT', 1):
+            details = ImportService.import_user_data(
+                User.objects.create_user(email='third@example.com', password='password123'), io.BytesIO(archive)
+            )['details']
+        self.assertEqual((details['skipped_records'], len(details['record_errors'])), (2, 1))
+
+    def test_dry_run_predicts_the_import(self):
+        """A dry run counts as new exactly the records the import then creates"""
+        import io
+        from .services.import_service import ImportService
+
+        archive = self._archive_with_invalid_records()
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        sections = ImportService.preview_user_data(other, io.BytesIO(archive))['details']['sections']
+        self.assertEqual(sections['flight_logs']['invalid'], 1)
+        self.assertEqual(sections['maintenance_logs']['invalid'], 1)
+
+        details = ImportService.import_user_data(other, io.BytesIO(archive))['details']
+        for section, counts in sections.items():
+            self.assertEqual(counts['new'], details[f'{section}_imported'], section)
+
+    def test_import_queries_do_not_grow_with_records(self):
+        """Duplicates are detected in memory and new rows are inserted in batches"""
+        import io
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .services.export_service import ExportService
+        from .services.import_service import ImportService
+
+        def import_queries(flight_count):
+            FlightLog.objects.filter(user=self.user).delete()
+            for index in range(flight_count):
+                self._create_flight(date(2025, 1, 1) + timedelta(days=index))
+                MaintenanceLog.objects.create(
+                    user=self.user, uav=self.uav, event_type='Check', description=f'Check {index}', event_date='2025-03-01'
+                )
+            archive = b''.join(ExportService.stream_user_data(self.user))
+            MaintenanceLog.objects.filter(user=self.user).delete()
+
+            other = User.objects.create_user(email=f'other{flight_count}@example.com', password='password123')
+            with CaptureQueriesContext(connection) as queries:
+                result = ImportService.import_user_data(other, io.BytesIO(archive))
+            self.assertTrue(result['success'], result)
+            self.assertEqual(FlightLog.objects.filter(user=other).count(), flight_count)
+            self.assertEqual(MaintenanceLog.objects.filter(user=other).count(), flight_count)
+
+            # Importing the same archive again finds every record
+            again = ImportService.import_user_data(other, io.BytesIO(archive))
+            self.assertEqual(again['details']['flight_logs_imported'], 0)
+            self.assertEqual(again['details']['maintenance_logs_imported'], 0)
+            return len(queries)
+
+        self.assertEqual(import_queries(3), import_queries(30))
+
+    def test_delta_export(self):
+        """?since= exports only changed records and the deletions after that point"""
+        import io
+        import json
+        import zipfile
+        from django.utils import timezone
+
+        changed = self._create_flight('2025-03-01')
+        deleted = self._create_flight('2025-03-02')
+        self._create_flight('2025-03-03')
+        since = timezone.now()
+
+        changed.comments = 'Edited'
+        changed.save()
+        deleted_id = deleted.flightlog_id
+        deleted.delete()
+        added = self._create_flight('2025-03-04')
+
+        response = self.client.get(reverse('export-user-data'), {'since': since.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+        manifest = json.loads(archive.read('manifest.json'))
+        self.assertEqual(manifest['type'], 'delta')
+        logs = json.loads(archive.read('flight_logs/flight_logs.json'))
+        self.assertEqual({log['flightlog_id'] for log in logs}, {changed.flightlog_id, added.flightlog_id})
+        self.assertNotIn('uavs/uavs.json', archive.namelist())
+        deletions = json.loads(archive.read('deleted.json'))
+        self.assertEqual([(d['model'], d['id']) for d in deletions], [('flight_log', deleted_id)])
+
+        response = self.client.get(reverse('export-user-data'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_applies_delta_chain(self):
+        """A full archive followed by a delta archive reproduces updates and deletions"""
+        import io
+        from django.test import override_settings
+        from django.utils import timezone
+        from .services.export_service import ExportService
+        from .services.import_service import ImportService
+
+        kept = self._create_flight('2025-03-01')
+        removed = self._create_flight('2025-03-02')
+        other = User.objects.create_user(email='other@example.com', password='password123')
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            full = b''.join(ExportService.stream_user_data(self.user))
+            since = timezone.now()
+            kept.comments = 'Edited'
+            kept.save()
+            removed.delete()
+            self._create_flight('2025-03-05', comments='New')
+            delta = b''.join(ExportService.stream_user_data(self.user, since=since))
+
+            result = ImportService.import_user_data(other, io.BytesIO(full))
+            self.assertTrue(result['success'], result)
+            self.assertEqual(FlightLog.objects.filter(user=other).count(), 2)
+
+            result = ImportService.import_user_data(other, io.BytesIO(delta))
+            self.assertTrue(result['success'], result)
+
+        self.assertEqual(result['details']['records_updated'], 1)
+        self.assertEqual(result['details']['records_deleted'], 1)
+        self.assertEqual(
+            sorted(FlightLog.objects.filter(user=other).values_list('departure_date', 'comments')),
+            [(date(2025, 3, 1), 'Edited'), (date(2025, 3, 5), 'New')]
+        )
+        self.assertEqual(UAV.objects.filter(user=other).count(), 1)
+
+
+class CSVImportTests(APITestCase):
+    """UAV and flight log CSV import tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place='Field',
+            departure_date='2025-03-01',
+            departure_time='10:00:00',
+            landing_place='Field',
+            landing_time='10:10:00',
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _post_csv(self, name, content, dry_run=False):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        url = reverse(name)
+        if dry_run:
+            url = f"{url}?dry_run=1"
+        response = self.client.post(
+            url, {'file': SimpleUploadedFile('import.csv', content.encode(), content_type='text/csv')}, format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_flight_log_dry_run(self):
+        """A dry run classifies rows like the import would, without saving them"""
+        content = (
+            'uav_serial,departure_date,departure_time,landing_time,flight_duration\n'
+            'TEST123456,2025-03-01,10:00:00,10:10:00,600\n'     # duplicate
+            'TEST123456,2025-03-02,10:00:00,10:10:00,600\n'     # new
+            'TEST123456,2025-03-02,10:00:00,10:10:00,600\n'     # duplicate of the row above
+            'Unknown Drone,2025-03-03,10:00:00,10:10:00,600\n'  # unmapped
+        )
+        invalid = 'Test Drone,2025-13-40,10:00:00,10:10:00,600\n'
+        data = self._post_csv('flightlog-import', content + invalid, dry_run=True)
+        details = data['details']
+        self.assertTrue(data['dry_run'])
+        self.assertEqual(
+            (details['success_count'], details['duplicate_count'], details['unmapped_count'], details['error_count']),
+            (1, 2, 1, 1)
+        )
+        self.assertEqual(details['samples']['new'][0]['departure_date'], '2025-03-02')
+        self.assertEqual(details['samples']['unmapped'][0]['uav'], 'Unknown Drone')
+        self.assertEqual(details['samples']['invalid'][0]['row'], 6)
+        self.assertEqual(FlightLog.objects.count(), 1)
+
+        # The import agrees with the preview
+        details = self._post_csv('flightlog-import', content)['details']
+        self.assertEqual(
+            (details['success_count'], details['duplicate_count'], details['unmapped_count'], details['error_count']),
+            (1, 2, 1, 0)
+        )
+        self.assertEqual(FlightLog.objects.count(), 2)
+
+    def test_flylog_import_benchmark(self):
+        """10k EdgeTX flylog rows are imported with a fixed number of queries"""
+        import time
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .services.uav_service import CSV_IMPORT_BATCH_SIZE
+
+        lines = ['Date,ModelName,Timestamp-TO,Timestamp-LDG,Duration,GPS-Arming-Lat,GPS-Arming-Lon,'
+                 'GPS-Disarming-Lat,GPS-Disarming-Lon']
+        for index in range(10000):
+            day = date(2024, 1, 1) + timedelta(days=index // 20)
+            minute = (index % 20) * 3
+            lines.append(
+                f'{day.isoformat()},Test Drone,10:{minute:02d}:00,10:{minute + 2:02d}:00,120.5,'
+                f'47.100000,8.500000,47.100100,8.500100'
+            )
+        content = '\n'.join(lines) + '\n'
+
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            details = self._post_csv('flightlog-import', content)['details']
+        elapsed = time.perf_counter() - started
+
+        # One row repeats the flight created in setUp
+        self.assertEqual((details['success_count'], details['duplicate_count'], details['error_count']), (9999, 1, 0))
+        self.assertEqual(len({entry['flightlog_id'] for entry in details['imported']}), 9999)
+        self.assertEqual(details['imported'][0]['departure_time'], '10:00:00')
+        # One key lookup per batch of rows; inserts are batched too
+        # (sqlite takes fewer rows per INSERT than Postgres)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT')]
+        self.assertLess(len(queries) - len(inserts), 10000 / CSV_IMPORT_BATCH_SIZE + 5, f"{len(queries)} queries in {elapsed:.2f}s")
+        self.assertLess(len(inserts), 10000 / 50)
+        self.assertEqual(FlightLog.objects.filter(user=self.user).count(), 10000)
+
+        # Importing the same file again only finds duplicates
+        with CaptureQueriesContext(connection) as queries:
+            details = self._post_csv('flightlog-import', content)['details']
+        self.assertEqual((details['success_count'], details['duplicate_count']), (0, 10000))
+        self.assertLess(len(queries), 10000 / CSV_IMPORT_BATCH_SIZE + 5)
+
+    def test_uav_import_is_batched(self):
+        """Hundreds of UAVs are imported in a handful of queries, keeping per-row errors"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        lines = ['drone_name,type,motors,serial_number']
+        lines += [f'Drone {index},Quadcopter,4,SN{index}' for index in range(300)]
+        lines += ['Test Drone,Quadcopter,4,', 'Broken,,4,', f"{'x' * 300},Quadcopter,4,"]
+        with CaptureQueriesContext(connection) as queries:
+            details = self._post_csv('uav-import', '\n'.join(lines) + '\n')['details']
+
+        self.assertEqual((details['success_count'], details['duplicate_count'], details['error_count']), (300, 1, 2))
+        self.assertTrue(details['errors'][0].startswith('Row 303: Missing required field: type'))
+        self.assertIn('Row 304: drone_name', details['errors'][1])
+        self.assertEqual(UAV.objects.filter(user=self.user).count(), 301)
+        self.assertLess(len([query for query in queries if not query['sql'].startswith('INSERT')]), 10)
+
+    def test_csv_is_read_incrementally(self):
+        """The importers decode the upload as they go instead of reading it whole"""
+        import io
+        from unittest import mock
+        from .services.uav_service import FlightLogService, UAVService
+
+        class Upload(io.BytesIO):
+            def read(self, size=-1):
+                assert size is not None and size >= 0, 'read the whole file'
+                return super().read(size)
+
+            def read1(self, size=-1):
+                return self.read(size)
+
+        lines = ['uav_serial,departure_date,departure_time,landing_time,flight_duration']
+        lines += [f'TEST123456,2025-04-{day:02d},10:00:00,10:10:00,600' for day in range(1, 31)]
+        with mock.patch('api.services.uav_service.CSV_IMPORT_BATCH_SIZE', 7):
+            results = FlightLogService.import_logs_from_csv(Upload(('\n'.join(lines) + '\n').encode()), self.user)
+        self.assertEqual((results['success_count'], results['error_count']), (30, 0), results['errors'])
+        self.assertEqual(len(results['imported']), 30)
+
+        results = UAVService.import_uavs_from_csv(Upload(b'drone_name,type,motors\nStream Drone,Quadcopter,4\n'), self.user)
+        self.assertEqual(results['success_count'], 1, results['errors'])
+
+    def test_uav_dry_run(self):
+        content = (
+            'drone_name,type,motors\n'
+            'Test Drone,Quadcopter,4\n'
+            'New Drone,Quadcopter,4\n'
+            'New Drone,Quadcopter,4\n'
+            'No Type,,4\n'
+        )
+        details = self._post_csv('uav-import', content, dry_run=True)['details']
+        self.assertEqual((details['success_count'], details['duplicate_count'], details['error_count']), (1, 2, 1))
+        self.assertEqual(details['samples']['new'], [{'row': 3, 'drone_name': 'New Drone', 'serial_number': ''}])
+        self.assertEqual(UAV.objects.count(), 1)
+
+    def test_attach_telelogs_batch(self):
+        """Many TeleLog files are matched to flight logs by name and attached in one request"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import FlightGPSLog
+        from .services.gps_service import TELELOG_COLUMNS
+
+        second = FlightLog.objects.create(
+            user=self.user, uav=self.uav, departure_place='Field', departure_date='2025-03-02',
+            departure_time='09:30:15', landing_place='Field', landing_time='09:40:00', flight_duration=585,
+            takeoffs=1, landings=1, light_conditions='Day', ops_conditions='VLOS', pilot_type='PIC'
+        )
+        first = FlightLog.objects.exclude(pk=second.pk).get()
+        FlightGPSLog.objects.create(flight_log=first, timestamp=0, latitude=1.0, longitude=1.0)
+
+        header = ','.join(column for column, _, _ in TELELOG_COLUMNS)
+        row = '1000,12,47.1,8.5,450.5,12.3,90,0.5,1,2,3,7.4,5.2,120,100,100,25,0,0,-1024,0'
+        telelog = f'{header}\n{row}\n{row.replace("1000,", "2000,", 1)}\n,,,,\n'
+        files = [
+            SimpleUploadedFile('Test_Drone_TeleLog_20250301_100000.csv', telelog.encode()),
+            SimpleUploadedFile('TEST123456_TeleLog_20250302_093015.csv', telelog.encode()),
+            SimpleUploadedFile('Test_Drone_TeleLog_20250303_100000.csv', telelog.encode()),
+            SimpleUploadedFile('Test_Drone_TeleLog_20250302_093015.csv', b'time,lat\n1,2\n'),
+        ]
+        response = self.client.post(reverse('flightlog-gps-batch'), {'files': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted((entry['flightlog_id'], entry['points']) for entry in response.data['attached']),
+            [(first.pk, 2), (second.pk, 2)]
+        )
+        self.assertEqual(response.data['unmatched'], ['Test_Drone_TeleLog_20250303_100000.csv'])
+        self.assertEqual([entry['file'] for entry in response.data['failed']], ['Test_Drone_TeleLog_20250302_093015.csv'])
+
+        # Existing points are replaced
+        points = FlightGPSLog.objects.filter(flight_log=first)
+        self.assertEqual(list(points.values_list('timestamp', flat=True)), [1000, 2000])
+        self.assertEqual(points[0].receiver_quality, 100)
+        self.assertEqual(points[0].throttle, -1024)
+
+    def test_attach_telelogs_reports_corrupt_file(self):
+        """A file the csv module can't read fails on its own instead of the whole batch"""
+        import csv
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import FlightGPSLog
+        from .services.gps_service import TELELOG_COLUMNS
+
+        second = FlightLog.objects.create(
+            user=self.user, uav=self.uav, departure_place='Field', departure_date='2025-03-02',
+            departure_time='09:30:15', landing_place='Field', landing_time='09:40:00', flight_duration=585,
+            takeoffs=1, landings=1, light_conditions='Day', ops_conditions='VLOS', pilot_type='PIC'
+        )
+        first = FlightLog.objects.exclude(pk=second.pk).get()
+
+        header = ','.join(column for column, _, _ in TELELOG_COLUMNS)
+        row = '1000,12,47.1,8.5,450.5,12.3,90,0.5,1,2,3,7.4,5.2,120,100,100,25,0,0,-1024,0'
+        corrupt = f'{header}\n{"x" * (csv.field_size_limit() + 1)}\n'
+        files = [
+            SimpleUploadedFile('Test_Drone_TeleLog_20250301_100000.csv', f'{header}\n{row}\n'.encode()),
+            SimpleUploadedFile('TEST123456_TeleLog_20250302_093015.csv', corrupt.encode()),
+        ]
+        response = self.client.post(reverse('flightlog-gps-batch'), {'files': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([entry['flightlog_id'] for entry in response.data['attached']], [first.pk])
+        self.assertEqual([entry['file'] for entry in response.data['failed']], ['TEST123456_TeleLog_20250302_093015.csv'])
+        self.assertEqual(FlightGPSLog.objects.filter(flight_log=first).count(), 1)
+        self.assertFalse(FlightGPSLog.objects.filter(flight_log=second).exists())
+
+class FlightLogBulkTests(APITestCase):
+    """Bulk flight log create/update/delete tests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        other_user = User.objects.create_user(email='other@example.com', password='testpassword')
+        self.other_uav = UAV.objects.create(
+            user=other_user, drone_name='Other Drone', manufacturer='DJI', type='Quadcopter', motors=4
+        )
+        self.logs = FlightLog.objects.bulk_create([
+            FlightLog(
+                user=self.user,
+                uav=self.uav,
+                departure_place='Field',
+                departure_date=date(2025, 3, 1) + timedelta(days=i),
+                departure_time='10:00:00',
+                landing_place='Field',
+                landing_time='10:10:00',
+                flight_duration=600,
+                takeoffs=1,
+                landings=1,
+                light_conditions='Day',
+                ops_conditions='VLOS',
+                pilot_type='PIC'
+            )
+            for i in range(3)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _flight(self, **overrides):
+        return {
+            'uav_id': self.uav.uav_id,
+            'departure_place': 'Meadow',
+            'departure_date': '2025-04-01',
+            'departure_time': '08:00:00',
+            'landing_place': 'Meadow',
+            'landing_time': '08:20:00',
+            'flight_duration': 1200,
+            'takeoffs': 1,
+            'landings': 1,
+            'light_conditions': 'Day',
+            'ops_conditions': 'VLOS',
+            'pilot_type': 'PIC',
+            **overrides
+        }
+
+    def test_bulk_operations(self):
+        """Creates, updates and deletes are applied together with a fixed number of queries"""
+        import os
+        import tempfile
+        import threading
+        from django.db import connection
+        from django.test import override_settings
+        from django.test.utils import CaptureQueriesContext
+        from .models import DeletedRecord
+
+        media_root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(media_root, 'blackbox'))
+        blackbox_path = os.path.join(media_root, 'blackbox', 'log.csv')
+        open(blackbox_path, 'w').close()
+        FlightLog.objects.filter(pk=self.logs[2].pk).update(blackbox_log='blackbox/log.csv')
+
+        operations = {
+            'create': [self._flight(departure_time=f'08:{minute:02d}:00') for minute in range(20)],
+            'update': [
+                {'flightlog_id': self.logs[0].pk, 'comments': 'Gusty'},
+                {'flightlog_id': self.logs[1].pk, 'landing_place': 'Lake'},
+            ],
+            'delete': [self.logs[2].pk],
+        }
+        with override_settings(MEDIA_ROOT=media_root), CaptureQueriesContext(connection) as queries, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('flightlog-bulk'), operations, format='json')
+        for thread in threading.enumerate():
+            if thread.name == 'flightlog-file-cleanup':
+                thread.join()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['created']), 20)
+        self.assertEqual(response.data['updated'], sorted([self.logs[0].pk, self.logs[1].pk]))
+        self.assertEqual(response.data['deleted'], [self.logs[2].pk])
+        self.assertLess(len(queries), 20)
+
+        self.assertEqual(FlightLog.objects.filter(departure_place='Meadow').count(), 20)
+        self.assertEqual(FlightLog.objects.get(pk=self.logs[0].pk).comments, 'Gusty')
+        self.assertEqual(FlightLog.objects.get(pk=self.logs[1].pk).landing_place, 'Lake')
+        self.assertGreater(FlightLog.objects.get(pk=self.logs[1].pk).updated_at, self.logs[1].updated_at)
+        self.assertFalse(FlightLog.objects.filter(pk=self.logs[2].pk).exists())
+        self.assertTrue(DeletedRecord.objects.filter(model_name='flight_log', object_id=self.logs[2].pk).exists())
+        self.assertFalse(os.path.exists(blackbox_path))
+
+    def test_invalid_operation_rejects_the_batch(self):
+        """One invalid operation leaves every flight log untouched"""
+        operations = {
+            'create': [self._flight(), self._flight(uav_id=self.other_uav.uav_id)],
+            'update': [{'flightlog_id': 999999, 'comments': 'Missing'}],
+            'delete': [self.logs[0].pk],
+        }
+        response = self.client.post(reverse('flightlog-bulk'), operations, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data['create']), [1])
+        self.assertIn('uav_id', response.data['create'][1])
+        self.assertIn('flightlog_id', response.data['update'][0])
+        self.assertEqual(FlightLog.objects.count(), 3)
+
+    def test_operation_limit(self):
+        """Requests over the operation limit are refused"""
+        from unittest import mock
+
+        with mock.patch('api.services.uav_service.FLIGHTLOG_BULK_MAX_OPERATIONS', 2):
+            response = self.client.post(
+                reverse('flightlog-bulk'), {'delete': [log.pk for log in self.logs]}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(FlightLog.objects.count(), 3)
+
+class SyncTests(APITestCase):
+    """Delta-sync API tests"""
+
+    def setUp(self):
+        from django.utils import timezone
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.logs = FlightLog.objects.bulk_create([
+            FlightLog(
+                user=self.user,
+                uav=self.uav,
+                departure_place='Field',
+                departure_date=date(2025, 3, 1) + timedelta(days=i),
+                departure_time='10:00:00',
+                landing_place='Field',
+                landing_time='10:10:00',
+                flight_duration=600,
+                takeoffs=1,
+                landings=1,
+                light_conditions='Day',
+                ops_conditions='VLOS',
+                pilot_type='PIC'
+            )
+            for i in range(5)
+        ])
+        other_user = User.objects.create_user(email='other@example.com', password='testpassword')
+        UAV.objects.create(user=other_user, drone_name='Other Drone', manufacturer='DJI', type='Quadcopter', motors=4)
+
+        # Existing history predates the sync window overlap
+        yesterday = timezone.now() - timedelta(days=1)
+        UAV.objects.update(updated_at=yesterday)
+        FlightLog.objects.update(updated_at=yesterday)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_initial_sync_pages_through_everything(self):
+        """Without a cursor all records are returned, page by page"""
+        from .services.sync_service import SyncService
+
+        flight_log_ids = []
+        cursor = None
+        pages = 0
+        while True:
+            page = SyncService.get_changes(self.user, cursor, limit=2)
+            pages += 1
+            self.assertLessEqual(sum(len(rows) for rows in page['changes'].values()), 2)
+            flight_log_ids += [row['flightlog_id'] for row in page['changes']['flight_logs']]
+            self.assertEqual([row['drone_name'] for row in page['changes']['uavs']], ['Test Drone'] if pages == 1 else [])
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+
+        self.assertEqual(flight_log_ids, [log.pk for log in self.logs])
+
+    def test_sync_returns_changes_and_deletions_after_cursor(self):
+        """A cursor yields only records changed or deleted since the previous sync"""
+        url = reverse('sync')
+        cursor = self.client.get(url).data['cursor']
+
+        unchanged = self.client.get(url, {'cursor': cursor}).data
+        self.assertFalse(unchanged['has_more'])
+        self.assertEqual(sum(len(rows) for rows in unchanged['changes'].values()), 0)
+        self.assertEqual(unchanged['deleted'], [])
+
+        log = FlightLog.objects.get(pk=self.logs[1].pk)
+        log.comments = 'Calm'
+        log.save()
+        deleted_id = self.logs[2].pk
+        self.logs[2].delete()
+
+        response = self.client.get(url, {'cursor': unchanged['cursor']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['flightlog_id'] for row in response.data['changes']['flight_logs']], [self.logs[1].pk])
+        self.assertEqual(response.data['changes']['uavs'], [])
+        self.assertEqual(
+            [(entry['model'], entry['id']) for entry in response.data['deleted']], [('flight_log', deleted_id)]
+        )
+
+    def test_cursor_of_another_user_is_rejected(self):
+        """Cursors are signed and bound to the user they were issued to"""
+        cursor = self.client.get(reverse('sync')).data['cursor']
+        other = User.objects.get(email='other@example.com')
+        self.client.force_authenticate(user=other)
+
+        self.assertEqual(self.client.get(reverse('sync'), {'cursor': cursor}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('sync'), {'cursor': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deletions_write_tombstones_in_bulk(self):
+        """Bulk and cascading deletes write their tombstones in a single INSERT"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import DeletedRecord, MaintenanceReminder
+
+        def tombstone_inserts(queries):
+            return [query for query in queries if query['sql'].startswith('INSERT INTO "api_deletedrecord"')]
+
+        with CaptureQueriesContext(connection) as queries:
+            FlightLog.objects.filter(pk__in=[self.logs[0].pk, self.logs[1].pk]).delete()
+        self.assertEqual(len(tombstone_inserts(queries)), 1)
+
+        reminder = MaintenanceReminder.objects.create(
+            uav=self.uav, component='props', last_maintenance=date(2025, 3, 1), next_maintenance=date(2025, 6, 1)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(reverse('uav-detail', args=[self.uav.uav_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(tombstone_inserts(queries)), 1)
+
+        deleted = set(DeletedRecord.objects.filter(user_id=self.user.pk).values_list('model_name', 'object_id'))
+        self.assertEqual(deleted, {('flight_log', log.pk) for log in self.logs} | {
+            ('uav', self.uav.uav_id), ('maintenance_reminder', reminder.reminder_id)
+        })
+
+class ConditionalGetTests(APITestCase):
+    """ETag / Last-Modified revalidation of read endpoints"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.uav = UAV.objects.create(
+            user=self.user,
+            drone_name='Test Drone',
+            manufacturer='DJI',
+            type='Quadcopter',
+            motors=4,
+            serial_number='TEST123456'
+        )
+        self.log = FlightLog.objects.create(
+            user=self.user,
+            uav=self.uav,
+            departure_place='Field',
+            departure_date='2025-03-01',
+            departure_time='10:00:00',
+            landing_place='Field',
+            landing_time='10:10:00',
+            flight_duration=600,
+            takeoffs=1,
+            landings=1,
+            light_conditions='Day',
+            ops_conditions='VLOS',
+            pilot_type='PIC'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_answers_not_modified_until_records_change(self):
+        """Lists and meta endpoints return 304 for a current ETag, 200 after a change or delete"""
+        for name in ('uav-list', 'flightlog-list', 'uav-meta', 'flightlog-meta'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response['ETag'].startswith('W/'))
+            self.assertIn('Last-Modified', response)
+            self.assertEqual(
+                self.client.get(reverse(name), HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                status.HTTP_304_NOT_MODIFIED
+            )
+
+        url = reverse('uav-list')
+        etag = self.client.get(url)['ETag']
+        self.client.patch(reverse('uav-detail', args=[self.uav.uav_id]), {'manufacturer': 'Other'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['manufacturer'], 'Other')
+
+        # Flight totals are part of UAV rows; deletes leave no updated_at behind
+        etag = response['ETag']
+        self.client.delete(reverse('flightlog-detail', args=[self.log.flightlog_id]))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        # Another user's changes don't invalidate this user's lists
+        etag = self.client.get(url)['ETag']
+        other_user = User.objects.create_user(email='other@example.com', password='testpassword')
+        UAV.objects.create(user=other_user, drone_name='Other Drone', manufacturer='DJI', type='Quadcopter', motors=4)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_staff_user_filter_versions_the_listed_logs(self):
+        """A staff ?user= list is versioned by that user's logs, not the staff member's own"""
+        from django.utils import timezone
+
+        staff = User.objects.create_user(email='staff@example.com', password='testpassword', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        url = reverse('flightlog-list')
+
+        own = self.client.get(url)
+        response = self.client.get(url, {'user': self.user.pk})
+        self.assertEqual(response.data['count'], 1)
+        self.assertNotEqual(response['ETag'], own['ETag'])
+        etag = response['ETag']
+
+        FlightLog.objects.filter(pk=self.log.pk).update(departure_place='Hill', updated_at=timezone.now())
+        response = self.client.get(url, {'user': self.user.pk}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['departure_place'], 'Hill')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=own['ETag']).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_gps_track_has_strong_etag(self):
+        """GPS tracks get a strong ETag that changes when the points are replaced"""
+        from .services.gps_service import GPSService
+
+        point = {'timestamp': 0, 'latitude': 47.0, 'longitude': 8.0}
+        GPSService.save_gps_data(self.log, [point])
+        url = reverse('flightlog-gps', args=[self.log.flightlog_id])
+
+        etag = self.client.get(url)['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        GPSService.save_gps_data(self.log, [point, dict(point, timestamp=1)])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+        other_user = User.objects.create_user(email='other@example.com', password='testpassword')
+        self.client.force_authenticate(user=other_user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_media_file_has_strong_etag(self):
+        """Media files such as blackbox CSVs are revalidated by a strong ETag"""
+        import os
+        import tempfile
+        from django.test import RequestFactory
+        from .views import serve_media
+
+        media_root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(media_root, 'blackbox'))
+        with open(os.path.join(media_root, 'blackbox', 'log-1.csv'), 'w') as f:
+            f.write('time,gyro\n0,1\n')
+
+        factory = RequestFactory()
+        response = serve_media(factory.get('/media/blackbox/log-1.csv'), 'blackbox/log-1.csv', media_root)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        request = factory.get('/media/blackbox/log-1.csv', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(serve_media(request, 'blackbox/log-1.csv', media_root).status_code, status.HTTP_304_NOT_MODIFIED)
+
 class MaintenanceTests(APITestCase):
     """Maintenance log and reminder tests"""
     
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     UAVListCreateView, UAVDetailView,
-    FlightLogListCreateView, FlightLogDetailView, FlightGPSDataUploadView,
+    FlightLogListCreateView, FlightLogDetailView, FlightLogBulkView, FlightGPSDataUploadView, FlightGPSBatchUploadView,
     MaintenanceLogListCreateView, MaintenanceLogDetailView,
     MaintenanceReminderListCreateView, MaintenanceReminderDetailView,
     FileListCreateView, FileDetailView,
@@ -9,8 +9,9 @@ from .views import (
     UserSettingsListCreateView, UserSettingsDetailView,
     AdminUserListView, AdminUserDetailView, AdminUAVListView, AdminUAVDetailView,
     UAVImportView, FlightLogImportView, UserDataExportView, UserDataImportView,
+    SyncView, ExportJobDetailView, ExportDownloadView, ImportJobDetailView, ImportJobCancelView,
     UAVConfigListCreateView, UAVConfigDetailView,
-    FlightLogMetaView, UAVMetaView,
+    FlightLogMetaView, FlightLogNeighborsView, FlightLogCalendarView, FlightLogExportView, UAVMetaView, UAVImageView,
     BlackboxUploadView,
     BlackboxOriginalDownloadView,
 )
@@ -23,13 +24,31 @@ urlpatterns = [
     # Returns UAV meta information
     path('uavs/meta/', UAVMetaView.as_view(), name='uav-meta'),
 
+    # UAV pictures, named by their content hash and cached by browsers for good
+    path('uav-images/<str:filename>', UAVImageView.as_view(), name='uav-image'),
+
     # Flight log endpoints
     path('flightlogs/', FlightLogListCreateView.as_view(), name='flightlog-list'),
     path('flightlogs/<int:pk>/', FlightLogDetailView.as_view(), name='flightlog-detail'),
+
+    # Bulk create/update/delete of flight logs
+    path('flightlogs/bulk/', FlightLogBulkView.as_view(), name='flightlog-bulk'),
+
+    # Per-day flight summaries for a month, or one day's flights
+    path('flightlogs/calendar/', FlightLogCalendarView.as_view(), name='flightlog-calendar'),
+
+    # Streamed logbook download as pdf or csv, honouring the list filters and ordering
+    path('flightlogs/export/<str:file_format>/', FlightLogExportView.as_view(), name='flightlog-export'),
+
+    # Previous/next flight log ids, honouring the list filters and ordering
+    path('flightlogs/<int:pk>/neighbors/', FlightLogNeighborsView.as_view(), name='flightlog-neighbors'),
     
     # Upload or retrieve GPS and Telemetry data for a flight log
     path('flightlogs/<int:flightlog_id>/gps/', FlightGPSDataUploadView.as_view(), name='flightlog-gps'),
 
+    # Attach many TeleLog files, matched to flight logs by UAV and departure date/time
+    path('flightlogs/gps/batch/', FlightGPSBatchUploadView.as_view(), name='flightlog-gps-batch'),
+
     # Upload blackbox log file for a flight log
     path('flightlogs/<int:flightlog_id>/blackbox/', BlackboxUploadView.as_view(), name='flightlog-blackbox'),
 
@@ -73,6 +92,17 @@ urlpatterns = [
     path('export-user-data/', UserDataExportView.as_view(), name='export-user-data'),
     path('import-user-data/', UserDataImportView.as_view(), name='import-user-data'),
 
+    # Incremental changes and deletions since a cursor from the previous call
+    path('sync/', SyncView.as_view(), name='sync'),
+
+    # Background export status and its signed, Range-capable download link
+    path('exports/<int:pk>/', ExportJobDetailView.as_view(), name='export-job-detail'),
+    path('exports/<int:pk>/download/', ExportDownloadView.as_view(), name='export-download'),
+
+    # Background import status, progress and result
+    path('imports/<int:pk>/', ImportJobDetailView.as_view(), name='import-job-detail'),
+    path('imports/<int:pk>/cancel/', ImportJobCancelView.as_view(), name='import-job-cancel'),
+
     # UAV configuration endpoints
     path('uav-configs/', UAVConfigListCreateView.as_view(), name='uav-config-list'),
     path('uav-configs/<int:pk>/', UAVConfigDetailView.as_view(), name='uav-config-detail'),
@@ -1,4 +1,5 @@
 # backend/api/views.py
+import os
 from django.conf import settings
 from rest_framework import generics, permissions, filters, status
 from rest_framework.pagination import PageNumberPagination
@@ -9,24 +10,37 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.exceptions import PermissionDenied
 
 from .models import (
-    UAV, FlightLog, MaintenanceLog, MaintenanceReminder, User, UAVConfig
+    UAV, FlightLog, MaintenanceLog, MaintenanceReminder, User, UAVConfig, ExportJob, ImportJob
 )
 from .serializers import (
     UAVSerializer, FlightLogSerializer, MaintenanceLogSerializer, FlightGPSLogSerializer,
     MaintenanceReminderSerializer, FileSerializer, UserSerializer, UserSettingsSerializer,
-    FlightLogWithGPSSerializer, UAVConfigSerializer
+    FlightLogWithGPSSerializer, UAVConfigSerializer, ExportJobSerializer, ImportJobSerializer
 )
 
 # Import the services
-from .services.uav_service import UAVService, FlightLogService
+from .services.uav_service import UAVService, FlightLogService, UAV_LIST_DEFERRED_FIELDS
 from .services.maintenance_service import MaintenanceService
 from .services.admin_service import AdminService
 from .services.user_service import UserService
 from .services.file_service import FileService
 from .services.gps_service import GPSService
 from .services.export_service import ExportService
+from .services.logbook_service import LogbookService
 from .services.import_service import ImportService
 from .services.pagination_service import PaginationService
+from .services.sync_service import SyncService
+from .services.conditional_service import ConditionalService, conditional_get
+from .services.image_service import UAVImageService, IMAGE_CONTENT_TYPES, IMMUTABLE_CACHE_CONTROL
+
+class SearchRankOrderingFilter(filters.OrderingFilter):
+    """Order `q=` search results by relevance unless an explicit ordering is requested."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if request.query_params.get('q', '').strip() and not request.query_params.get(self.ordering_param):
+            return ['-search_rank', *(ordering or [])]
+        return ordering
 
 # Pagination for UAVs
 class UAVPagination(PageNumberPagination):
@@ -39,17 +53,25 @@ class UAVListCreateView(generics.ListCreateAPIView):
     serializer_class = UAVSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = UAVPagination
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [SearchRankOrderingFilter]
     ordering_fields = ['drone_name', 'manufacturer', 'type', 'motors', 'registration_number', 'created_at']
     ordering = ['drone_name']  # Default ordering
     
     def get_queryset(self):
         return UAVService.get_uav_queryset(self.request.user, self.request.query_params)
     
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Leave out the columns the list query deferred
+        if self.request.method == 'GET':
+            context['deferred_fields'] = UAVService.list_deferred_fields(self.request.query_params, UAV_LIST_DEFERRED_FIELDS)
+        return context
+    
     def perform_create(self, serializer):
         uav = serializer.save(user=self.request.user)
         UAVService.update_maintenance_reminders(uav, serializer.validated_data)
     
+    @conditional_get(lambda request, *args, **kwargs: ConditionalService.resource_version(request, 'uavs'))
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         
@@ -74,10 +96,37 @@ class UAVDetailView(generics.RetrieveUpdateDestroyAPIView):
         response.data = UAVService.enrich_uav_data(response.data)
         return response
 
+# UAV pictures by content hash; a name never changes content, so browsers may keep them forever
+class UAVImageView(APIView):
+    # Plain <img> requests carry no token; the hash in the name is what links to a picture
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, filename):
+        from django.http import FileResponse, HttpResponseNotModified
+
+        path = UAVImageService.file_path(filename)
+        extension = os.path.splitext(filename)[1].lstrip('.')
+        if not path or extension not in IMAGE_CONTENT_TYPES:
+            return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = f'"{os.path.splitext(filename)[0]}"'
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=IMAGE_CONTENT_TYPES[extension])
+        response['ETag'] = etag
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        # Never let a browser run a stored file as a document
+        response['X-Content-Type-Options'] = 'nosniff'
+        response['Content-Security-Policy'] = 'sandbox'
+        return response
+
 # UAV metadata endpoint
 class UAVMetaView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get(lambda request: ConditionalService.resource_version(request, 'uav_meta'))
     def get(self, request):
         qs = UAV.objects.filter(user=request.user)
         min_id = qs.order_by('uav_id').values_list('uav_id', flat=True).first()
@@ -95,7 +144,7 @@ class FlightLogListCreateView(generics.ListCreateAPIView):
     serializer_class = FlightLogSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = FlightLogPagination
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [SearchRankOrderingFilter]
     ordering_fields = ['departure_date', 'departure_time', 'landing_time', 'flight_duration']
     ordering = ['-departure_date', '-departure_time']  # Default: newest first
     
@@ -108,8 +157,12 @@ class FlightLogListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
+    @conditional_get(lambda request, *args, **kwargs: ConditionalService.resource_version(
+        request, 'flight_logs', FlightLogService.get_owner_id(request.user, request.query_params)
+    ))
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.order_by(*FlightLogService.stable_ordering(queryset.query.order_by))
         
         # Use PaginationService for consistent error handling
         page, error_response = PaginationService.paginate_queryset_safely(self, queryset, request)
@@ -131,17 +184,24 @@ class FlightLogDetailView(generics.RetrieveUpdateDestroyAPIView):
         return FlightLog.objects.filter(user=self.request.user)
 
     def perform_destroy(self, instance):
-        import os
         if instance.blackbox_log:
-            csv_path = os.path.join(settings.MEDIA_ROOT, instance.blackbox_log)
-            if os.path.isfile(csv_path):
-                os.remove(csv_path)
-            original_filename = os.path.splitext(os.path.basename(instance.blackbox_log))[0] + '.txt'
-            original_path = os.path.join(settings.BLACKBOX_ORIGINAL_ROOT, original_filename)
-            if os.path.isfile(original_path):
-                os.remove(original_path)
+            FlightLogService.delete_blackbox_files([instance.blackbox_log])
         instance.delete()
 
+# Create, update and delete many flight logs in one transaction
+class FlightLogBulkView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Expected an object with create, update and delete lists"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        result, errors = FlightLogService.bulk_apply(request.user, request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
 # Endpoint for uploading and managing GPS data
 class FlightGPSDataUploadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -166,6 +226,7 @@ class FlightGPSDataUploadView(APIView):
         return Response({"detail": "No valid GPS data provided"}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
+    @conditional_get(ConditionalService.gps_version)
     def get(self, request, flightlog_id):
         try:
             flight_log = AdminService.get_object_if_owner(
@@ -198,6 +259,19 @@ class FlightGPSDataUploadView(APIView):
             "deleted_count": deleted_count
         }, status=status.HTTP_200_OK)
 
+# Attach many TeleLog files at once, matched to flight logs by their file names
+class FlightGPSBatchUploadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        files = request.FILES.getlist('files')
+        if not files:
+            return Response({"detail": "No files provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = GPSService.attach_telelogs(request.user, files)
+        return Response(result, status=status.HTTP_201_CREATED if result['attached'] else status.HTTP_200_OK)
+
 # Endpoint for uploading blackbox log files
 class BlackboxUploadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -274,7 +348,7 @@ class BlackboxUploadView(APIView):
 
             relative_path = f"blackbox/{dest_filename}"
             flight_log.blackbox_log = relative_path
-            flight_log.save(update_fields=['blackbox_log'])
+            flight_log.save(update_fields=['blackbox_log', 'updated_at'])
 
             return Response(
                 {"detail": "Blackbox log decoded and saved", "blackbox_log": relative_path},
@@ -310,7 +384,7 @@ class BlackboxUploadView(APIView):
             os.remove(original_path)
 
         flight_log.blackbox_log = None
-        flight_log.save(update_fields=['blackbox_log'])
+        flight_log.save(update_fields=['blackbox_log', 'updated_at'])
 
         return Response({"detail": "Blackbox log deleted"}, status=status.HTTP_200_OK)
 
@@ -333,25 +407,103 @@ class BlackboxOriginalDownloadView(APIView):
         return response
 
 
+# Media files (e.g. decoded blackbox CSVs) with a strong ETag, revalidated on every use
+def serve_media(request, path, document_root=None, show_indexes=False):
+    import posixpath
+    from pathlib import Path
+    from django.utils._os import safe_join
+    from django.utils.cache import get_conditional_response
+    from django.views.static import serve
+
+    full_path = Path(safe_join(document_root, posixpath.normpath(path).lstrip('/')))
+    if not full_path.is_file():
+        return serve(request, path, document_root, show_indexes)
+
+    etag = ConditionalService.file_etag(full_path.stat())
+    response = get_conditional_response(request, etag=etag) or serve(request, path, document_root, show_indexes)
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+
 # Flight log metadata endpoint
 class FlightLogMetaView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get(lambda request: ConditionalService.resource_version(request, 'flight_log_meta'))
     def get(self, request):
         qs = FlightLog.objects.filter(user=request.user)
         min_id = qs.order_by('flightlog_id').values_list('flightlog_id', flat=True).first()
         max_id = qs.order_by('-flightlog_id').values_list('flightlog_id', flat=True).first()
-        
-        # Get all flight IDs ordered by departure date and time
-        ordered_ids = list(qs.order_by('-departure_date', '-departure_time')
-                          .values_list('flightlog_id', flat=True))
-        
+        return Response({'minId': min_id, 'maxId': max_id})
+
+# Per-day flight summaries for the calendar page
+class FlightLogCalendarView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        queryset = FlightLog.objects.filter(user=request.user)
+
+        # ?date=YYYY-MM-DD lazily loads the flights of one day
+        day = request.query_params.get('date')
+        if day:
+            day_range = FlightLogService.parse_date_prefix(day)
+            if len(day) != 10 or day_range is None:
+                return Response({"detail": "date must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'date': day_range[0],
+                'flights': FlightLogService.get_calendar_day_flights(queryset, day_range[0])
+            })
+
+        month = request.query_params.get('month', '')
+        month_range = FlightLogService.parse_date_prefix(month)
+        if len(month) != 7 or month_range is None:
+            return Response({"detail": "month must be YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
         return Response({
-            'minId': min_id, 
-            'maxId': max_id,
-            'orderedIds': ordered_ids  # Add ordered flight IDs by date
+            'month': month,
+            'days': FlightLogService.get_calendar_days(queryset, *month_range)
         })
 
+# Logbook download (pdf or csv) with the list filters and ordering
+class FlightLogExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = FlightLogListCreateView.ordering_fields
+    ordering = FlightLogListCreateView.ordering
+
+    def get(self, request, file_format):
+        if file_format not in ('pdf', 'csv'):
+            return Response({"detail": "Export format must be pdf or csv"}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = FlightLogService.get_flightlog_queryset(request.user, request.query_params)
+        ordering = SearchRankOrderingFilter().get_ordering(request, queryset, self)
+        queryset = queryset.order_by(*FlightLogService.stable_ordering(ordering))
+        return LogbookService.export_response(queryset, request.user, file_format)
+
+# Previous/next flight log for the detail view navigation
+class FlightLogNeighborsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # Same ordering rules as the list view, so the neighbors match its pages
+    ordering_fields = FlightLogListCreateView.ordering_fields
+    ordering = FlightLogListCreateView.ordering
+
+    def get(self, request, pk):
+        queryset = FlightLogService.get_flightlog_queryset(request.user, request.query_params)
+        try:
+            flight_log = AdminService.get_object_if_owner(
+                user=request.user,
+                model_class=FlightLog,
+                object_id=pk
+            )
+        except FlightLog.DoesNotExist:
+            return Response({"detail": "Flight log not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        ordering = SearchRankOrderingFilter().get_ordering(request, queryset, self)
+        with_position = request.query_params.get('position') == 'true'
+        return Response(FlightLogService.get_flightlog_neighbors(
+            queryset, flight_log, ordering, with_position=with_position
+        ))
+
 # Maintenance log endpoints
 class MaintenanceLogListCreateView(generics.ListCreateAPIView):
     serializer_class = MaintenanceLogSerializer
@@ -506,6 +658,12 @@ class AdminUAVListView(generics.ListAPIView):
             self.request.query_params
         )
     
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Leave out the columns the list query deferred
+        context['deferred_fields'] = UAVService.list_deferred_fields(self.request.query_params, UAV_LIST_DEFERRED_FIELDS)
+        return context
+    
     def list(self, request, *args, **kwargs):
         try:
             AdminService.ensure_staff_user(request.user)
@@ -564,8 +722,11 @@ class UAVImportView(APIView):
         if not csv_file.name.endswith('.csv'):
             return Response({'error': 'File must be a CSV'}, status=status.HTTP_400_BAD_REQUEST)
         
+        # ?dry_run=1 only reports what would be imported
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+
         # Process the CSV file using UAVService
-        import_results = UAVService.import_uavs_from_csv(csv_file, request.user)
+        import_results = UAVService.import_uavs_from_csv(csv_file, request.user, dry_run=dry_run)
         
         # Create response
         response_data = {
@@ -579,6 +740,13 @@ class UAVImportView(APIView):
                 'duplicate_message': import_results['duplicate_message']
             }
         }
+        if dry_run:
+            response_data['dry_run'] = True
+            response_data['message'] = (
+                f"Dry run: {import_results['success_count']} of {import_results['total']} UAVs would be imported. "
+                f"{import_results['duplicate_count']} duplicates would be skipped."
+            )
+            response_data['details']['samples'] = import_results['samples']
         
         if import_results['errors']:
             response_data['details']['errors'] = import_results['errors']
@@ -600,8 +768,11 @@ class FlightLogImportView(APIView):
         if not csv_file.name.endswith('.csv'):
             return Response({'error': 'File must be a CSV'}, status=status.HTTP_400_BAD_REQUEST)
         
+        # ?dry_run=1 only reports what would be imported
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+
         # Process the CSV file using FlightLogService
-        import_results = FlightLogService.import_logs_from_csv(csv_file, request.user)
+        import_results = FlightLogService.import_logs_from_csv(csv_file, request.user, dry_run=dry_run)
         
         # Create response
         response_data = {
@@ -618,6 +789,14 @@ class FlightLogImportView(APIView):
                 'imported': import_results.get('imported', [])
             }
         }
+        if dry_run:
+            response_data['dry_run'] = True
+            response_data['message'] = (
+                f"Dry run: {import_results['success_count']} of {import_results['total']} logs would be imported. "
+                f"{import_results['duplicate_count']} duplicates and {import_results['unmapped_count']} logs with "
+                f"unmapped UAVs would be skipped."
+            )
+            response_data['details']['samples'] = import_results['samples']
         
         if import_results['errors']:
             response_data['details']['errors'] = import_results['errors']
@@ -628,9 +807,18 @@ class FlightLogImportView(APIView):
 class UserDataExportView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
+    def _get_since(self, request):
+        # ?since=<export id or ISO date/datetime> requests a delta export
+        value = request.query_params.get('since') or request.data.get('since')
+        return ExportService.resolve_since(request.user, str(value)) if value else None
+
     def get(self, request):
         try:
-            response = ExportService.export_user_data(request.user)
+            since = self._get_since(request)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            response = ExportService.export_user_data(request.user, since)
             return response
         except Exception as e:
             return Response(
@@ -638,6 +826,56 @@ class UserDataExportView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def post(self, request):
+        try:
+            since = self._get_since(request)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # Run the export in the background; poll export-job-detail for progress
+        job = ExportService.create_export_job(request.user, since)
+        return Response(
+            ExportJobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
+# Changes since a cursor issued by an earlier call, for clients mirroring the logbook
+class SyncView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            changes = SyncService.get_changes(request.user, request.query_params.get('cursor'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes)
+
+# Status and progress of a background export
+class ExportJobDetailView(generics.RetrieveAPIView):
+    serializer_class = ExportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(user=self.request.user)
+
+# Download of a finished export through its signed, expiring link
+class ExportDownloadView(APIView):
+    # The signed token authorizes the download, so plain links and download managers work
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        job = ExportJob.objects.filter(export_id=pk).first()
+        if not job or not ExportService.check_download_token(job, request.query_params.get('token', '')):
+            return Response({"detail": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        path = ExportService.get_export_path(job)
+        if not path:
+            return Response({"detail": "Export has expired"}, status=status.HTTP_410_GONE)
+
+        return FileService.range_file_response(
+            path, request.META.get('HTTP_RANGE'), 'application/zip', os.path.basename(path)
+        )
+
 # Add this new view for importing user data
 class UserDataImportView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -659,21 +897,39 @@ class UserDataImportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
+        # ?dry_run=1 classifies the archive's records without importing them
+        if request.query_params.get('dry_run') in ('1', 'true'):
+            result = ImportService.preview_user_data(request.user, zip_file)
+            return Response(result, status=status.HTTP_200_OK if result['success'] else status.HTTP_400_BAD_REQUEST)
+
         try:
-            # Process the import
-            result = ImportService.import_user_data(request.user, zip_file)
-            
-            # Return appropriate response based on result
-            if result['success']:
-                return Response(result, status=status.HTTP_200_OK)
-            else:
-                return Response(result, status=status.HTTP_400_BAD_REQUEST)
-                
+            # Run the import in the background; poll import-job-detail for progress and the result
+            job = ImportService.create_import_job(request.user, zip_file)
         except Exception as e:
             return Response(
                 {"detail": f"Error importing data: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+# Status, progress and result of a background import
+class ImportJobDetailView(generics.RetrieveAPIView):
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
+
+# Stop a background import before its next phase
+class ImportJobCancelView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        job = ImportJob.objects.filter(import_id=pk, user=request.user).first()
+        if not job:
+            return Response({"detail": "Import not found"}, status=status.HTTP_404_NOT_FOUND)
+        job = ImportService.cancel_import_job(job)
+        return Response(ImportJobSerializer(job).data)
 
 # UAV configuration endpoints
 class UAVConfigListCreateView(generics.ListCreateAPIView):
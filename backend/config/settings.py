@@ -131,6 +131,19 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'uploads'
 BLACKBOX_ORIGINAL_ROOT = BASE_DIR / 'uploads' / 'blackbox-original'
 
+# Finished background exports and how long their download links stay valid
+EXPORT_ROOT = BASE_DIR / 'exports'
+EXPORT_TTL_HOURS = int(os.environ.get('EXPORT_TTL_HOURS', 24))
+# Exports whose worker reported no progress for this long are marked failed by the cron sweep
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.environ.get('EXPORT_JOB_TIMEOUT_MINUTES', 60))
+# zlib level 0-9 for the JSON and CSV members of export archives
+EXPORT_COMPRESSION_LEVEL = int(os.environ.get('EXPORT_COMPRESSION_LEVEL', 6))
+
+# Uploaded archives waiting for (or processed by) a background import
+IMPORT_ROOT = BASE_DIR / 'imports'
+# Imports whose worker reported no progress for this long are marked failed by the cron sweep
+IMPORT_JOB_TIMEOUT_MINUTES = int(os.environ.get('IMPORT_JOB_TIMEOUT_MINUTES', 60))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -227,6 +240,9 @@ CORS_ALLOW_HEADERS = [
 CRONJOBS = [
     ('0 7 * * *', 'api.services.user_service.UserService.check_license_expiry'),
     ('0 8 * * *', 'api.services.maintenance_service.MaintenanceService.check_maintenance_reminders'),
+    ('0 * * * *', 'api.services.export_service.ExportService.cleanup_expired_exports'),
+    ('0 * * * *', 'api.services.export_service.ExportService.fail_stale_export_jobs'),
+    ('0 * * * *', 'api.services.import_service.ImportService.fail_stale_import_jobs'),
 ]
 
 SITE_ID = 1  # Required by django.contrib.sites
@@ -1,7 +1,7 @@
 import { useEffect, useState, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Layout, Alert, Button, Loading, ConfirmModal, CompareModal, ScriptModal, ArrowButton, ConfigFileTable, InfoRow, GridInfo, InfoSection } from '../components';
-import { maintenanceLogTableColumns, compareConfigFiles, na, formatFlightHours, formatDate, extractUavId, resizeImageToDataUrl, UAV_IMAGE_SIZE } from '../utils';
+import { maintenanceLogTableColumns, compareConfigFiles, na, formatFlightHours, formatDate, extractUavId, resizeImageToDataUrl, UAV_IMAGE_SIZE, uavImageSrcSet } from '../utils';
 import { useAuth, useApi } from '../hooks';
 
 const AircraftSettings = () => {
@@ -188,7 +188,7 @@ const AircraftSettings = () => {
     }
   };
 
-  // Store the aircraft picture (a data URI) on the UAV record
+  // Upload the aircraft picture (a data URI); the UAV comes back with its image URL
   const saveAircraftImage = async (image) => {
     setImageSaving(true);
     try {
@@ -196,7 +196,7 @@ const AircraftSettings = () => {
       const result = await fetchData(`/api/uavs/${uavId}/`, {}, 'PATCH', { image });
       if (result.error) return;
 
-      setAircraft(a => ({ ...a, image }));
+      setAircraft(a => ({ ...a, image: result.data?.image ?? null, image_srcset: result.data?.image_srcset ?? null }));
       setError(null);
     } finally {
       setImageSaving(false);
@@ -519,7 +519,7 @@ const AircraftSettings = () => {
             <div className="flex items-center gap-4">
               <div className="h-32 w-32 flex-shrink-0 rounded-lg border border-gray-200 dark:border-gray-700 overflow-hidden bg-gray-50 dark:bg-gray-900 flex items-center justify-center">
                 {aircraft.image ? (
-                  <img src={aircraft.image} alt={aircraft.drone_name} className="h-full w-full aspect-square object-contain" />
+                  <img src={aircraft.image} srcSet={uavImageSrcSet(aircraft)} sizes="128px" alt={aircraft.drone_name} className="h-full w-full aspect-square object-contain" />
                 ) : (
                   <span className="text-xs text-gray-400 dark:text-gray-500">No image</span>
                 )}
@@ -242,10 +242,7 @@ const FlightDetails = () => {
     maxSatellites: null,
     minSatellites: null
   });
-  const [minFlightId, setMinFlightId] = useState(null);
-  const [maxFlightId, setMaxFlightId] = useState(null);
-  const [orderedFlightIds, setOrderedFlightIds] = useState([]);
-  const [currentFlightIndex, setCurrentFlightIndex] = useState(-1);
+  const [neighborFlightIds, setNeighborFlightIds] = useState({ previousId: null, nextId: null });
   const [isCalculatingPath, setIsCalculatingPath] = useState(false);
   const [hasSyntheticPath, setHasSyntheticPath] = useState(false);
   const [showFlightPathModal, setShowFlightPathModal] = useState(false);
@@ -314,18 +311,21 @@ const FlightDetails = () => {
     setGpsTrack(null);
     setFullGpsData(null);
     setAlertMessage(null);
-    navigate(`/flightdetails/${id}`);
+    // Keep the flight log filters so navigation stays within the same list
+    navigate(`/flightdetails/${id}${location.search}`);
   };
 
+  // The list is newest first, so the chronologically previous flight is the
+  // next row of the list and vice versa
   const navigateToPreviousFlight = () => {
-    if (orderedFlightIds.length > 0 && currentFlightIndex < orderedFlightIds.length - 1) {
-      navigateToFlight(orderedFlightIds[currentFlightIndex + 1]);
+    if (neighborFlightIds.nextId) {
+      navigateToFlight(neighborFlightIds.nextId);
     }
   };
 
   const navigateToNextFlight = () => {
-    if (orderedFlightIds.length > 0 && currentFlightIndex > 0) {
-      navigateToFlight(orderedFlightIds[currentFlightIndex - 1]);
+    if (neighborFlightIds.previousId) {
+      navigateToFlight(neighborFlightIds.previousId);
     }
   };
 
@@ -636,29 +636,29 @@ const FlightDetails = () => {
     };
   }, [flightId, memoizedFetchData, memoizedCheckAuth]);
 
-  // Fetch min/max flightId for navigation
+  // Fetch the neighboring flights for navigation, using the flight log list's filters and sort
   useEffect(() => {
     let isActive = true;
-    const fetchMeta = async () => {
+    const fetchNeighbors = async () => {
       try {
-        const result = await fetchData(`/api/flightlogs/meta/`);
+        const queryParams = {};
+        new URLSearchParams(location.search).forEach((value, key) => {
+          if (key === 'page' || key === 'calendar_defaultDate') return;
+          queryParams[key === 'sort' ? 'ordering' : key] = value;
+        });
+
+        const result = await fetchData(`/api/flightlogs/${flightId}/neighbors/`, queryParams);
         if (!result.error && isActive) {
-          setMinFlightId(result.data?.minId);
-          setMaxFlightId(result.data?.maxId);
-          
-          if (result.data?.orderedIds) {
-            setOrderedFlightIds(result.data.orderedIds);
-            
-            // Find current flight index in ordered array
-            const currentIndex = result.data.orderedIds.indexOf(parseInt(flightId));
-            setCurrentFlightIndex(currentIndex);
-          }
+          setNeighborFlightIds({
+            previousId: result.data?.previousId ?? null,
+            nextId: result.data?.nextId ?? null
+          });
         }
       } catch (e) { /* ignore errors */ }
     };
-    fetchMeta();
+    fetchNeighbors();
     return () => { isActive = false; };
-  }, [flightId]);
+  }, [flightId, location.search]);
 
   if (!flight) return <Loading message="Loading flight details..." />;
 
@@ -858,7 +858,7 @@ const FlightDetails = () => {
           direction="left"
           onClick={navigateToNextFlight}
           title="Next Flight"
-          disabled={orderedFlightIds.length === 0 || currentFlightIndex <= 0}
+          disabled={!neighborFlightIds.previousId}
         />
         <h1 className="text-2xl font-semibold">
           Flight Details {flight.uav?.drone_name && `- ${flight.uav.drone_name}`}
@@ -867,7 +867,7 @@ const FlightDetails = () => {
           direction="right"
           onClick={navigateToPreviousFlight}
           title="Previous Flight"
-          disabled={orderedFlightIds.length === 0 || currentFlightIndex >= orderedFlightIds.length - 1 || currentFlightIndex === -1}
+          disabled={!neighborFlightIds.nextId}
         />
       </div>
 
@@ -4,6 +4,7 @@ import { Calendar, momentLocalizer, Views } from 'react-big-calendar'
 import moment from 'moment'
 import { Layout, Alert, Button, Loading } from '../components';
 import { useApi, removeSearchParam } from '../hooks';
+import { formatFlightHours } from '../utils';
 
 const localizer = momentLocalizer(moment)
 
@@ -30,6 +31,8 @@ const localizer = momentLocalizer(moment)
     '#191970', // midnight blue
 ];
 
+const aircraftColor = (uavId) => darkDistinctColors[uavId % darkDistinctColors.length];
+
 const FlightlogCalendar = () => {
 
     const API_URL = import.meta.env.VITE_API_URL;
@@ -40,9 +43,10 @@ const FlightlogCalendar = () => {
     const [error, setError] = useState(null);
     const { fetchData } = useApi(API_URL, setError);
     
-    const [flightLogs, setFlightLogs] = useState([]);
-    const [aicraftsColor, setAicraftsColor] = useState([]);
+    const [calendarDays, setCalendarDays] = useState([]);
     const [events, setEvents] = useState([]);
+    const [selectedDay, setSelectedDay] = useState(null);
+    const [dayFlights, setDayFlights] = useState([]);
     
 
     // init
@@ -55,94 +59,79 @@ const FlightlogCalendar = () => {
         setCurrentDate(calendarDefaultDate);
         navigate(`${location.pathname}`+removeSearchParam(location.search, 'calendar_defaultDate'), { replace: true });
 
-        initFetchAllData( `${year}-${month}`);
+        fetchCalendarMonth( `${year}-${month}`);
     }, []);
 
-    //
-    const initFetchAllData = useCallback(async (dateMonth) => {
-        await fetchAicrafts();
-        await fetchFlightLogsForMonth(dateMonth);
-    });   
-
-    //
-    const fetchAicrafts = useCallback(async () => {   
+    // per-day summaries for the whole month in one request
+    const fetchCalendarMonth = useCallback(async (dateMonth) => {      
         setIsLoading(true);
-        const queryParams = {
-            page_size: -1,
-        };
+        setSelectedDay(null);
+        setDayFlights([]);
 
-        const result = await fetchData('/api/uavs/', queryParams);
+        const result = await fetchData('/api/flightlogs/calendar/', { month: dateMonth });
         if (result.error) {
-            setError('Failed to aicrafts  list');
+            setError('Failed to fetch flight calendar');
             setIsLoading(false);
             return;
         }
 
-        const aicrafts = result.data.results || [];
-
-        var aircraftsColor = {};
-        aicrafts.map(aicraft => {
-            aircraftsColor[aicraft.uav_id] = darkDistinctColors[aicraft.uav_id % darkDistinctColors.length];
-        });
-        
-        setAicraftsColor(aircraftsColor);
+        setCalendarDays(result.data.days || []);
         setIsLoading(false);  
     }, [fetchData]);
 
-    //
-    const fetchFlightLogsForMonth = useCallback(async (dateMonth) => {      
-        setIsLoading(true);
-        const queryParams = {
-            page_size: -1,
-            departure_date: dateMonth
-        };
+    // flights of one day, loaded when the day is opened
+    const fetchDayFlights = useCallback(async (date) => {
+        setSelectedDay(date);
+        setDayFlights([]);
 
-        const result = await fetchData('/api/flightlogs/', queryParams);
+        const result = await fetchData('/api/flightlogs/calendar/', { date });
         if (result.error) {
-            setError('Failed to fetch flight list');
-            setIsLoading(false);
+            setError('Failed to fetch flights of the day');
             return;
         }
 
-        const flighLogs = result.data.results || [];
-        setFlightLogs(flighLogs)
-        setIsLoading(false);  
+        setDayFlights(result.data.flights || []);
     }, [fetchData]);
 
     //////////////////////////////////
     // calendar controls 
 
-    //click to event in calendar
+    //click to day summary in calendar
     const handleSelectedEvent = (event) => {
-        navigate(`/flightdetails/${event.id}/`+removeSearchParam(location.search, 'calendar_defaultDate'))
+        fetchDayFlights(event.id);
+    };
+
+    //click to flight of the selected day
+    const handleSelectedFlight = (flightId) => {
+        navigate(`/flightdetails/${flightId}/`+removeSearchParam(location.search, 'calendar_defaultDate'))
     };
 
     //click to control button in calendar
     const handleNavigate = (date) => {
-        //fetch flight logs for month
+        //fetch flight summaries for month
         const year = date.getUTCFullYear(); 
         const month = String(date.getUTCMonth() + 1).padStart(2, '0');
-        fetchFlightLogsForMonth( `${year}-${month}`);
+        fetchCalendarMonth( `${year}-${month}`);
 
         //workdown for calendar button
         setCurrentDate(date);
     };
 
-    // fill events for calendar
+    // fill events for calendar, one summary per day
     useEffect(() => {
-        const events = flightLogs.map(flight => {
-            const startDateTimeStr = `${flight.departure_date}T${flight.departure_time}`;
-            const endDateTimeStr = `${flight.departure_date}T${flight.landing_time}`;
+        const events = calendarDays.map(day => {
+            const date = new Date(`${day.date}T00:00:00`);
             return {
-                id: flight.flightlog_id,
-                title: `${flight.uav.drone_name} ${flight.comments} (${flight.departure_time})`,
-                start: new Date(startDateTimeStr),
-                end: new Date(endDateTimeStr),
-                hexColor: aicraftsColor[flight.uav.uav_id] ?? aicraftsColor[0],
+                id: day.date,
+                title: `${day.flights} ${day.flights === 1 ? 'flight' : 'flights'} (${formatFlightHours(day.total_flight_time)})`,
+                start: date,
+                end: date,
+                allDay: true,
+                hexColor: day.uav_ids.length === 1 ? aircraftColor(day.uav_ids[0]) : darkDistinctColors[11],
             };
         });
         setEvents(events);
-    }, [flightLogs]);
+    }, [calendarDays]);
 
     const eventStyleGetter = (event, start, end, isSelected) => {
         var style = {
@@ -183,6 +172,26 @@ const FlightlogCalendar = () => {
                         />
                     </div>
 
+                    {selectedDay && (
+                        <div className="mt-6">
+                            <h2 className="text-lg font-semibold mb-2">Flights on {selectedDay}</h2>
+                            <ul className="space-y-1">
+                                {dayFlights.map(flight => (
+                                    <li key={flight.flightlog_id}>
+                                        <button
+                                            type="button"
+                                            onClick={() => handleSelectedFlight(flight.flightlog_id)}
+                                            className="w-full text-left px-3 py-1 text-white"
+                                            style={{ backgroundColor: aircraftColor(flight.uav_id), opacity: 0.8 }}
+                                        >
+                                            {`${flight.drone_name} ${flight.comments} (${flight.departure_time})`}
+                                        </button>
+                                    </li>
+                                ))}
+                            </ul>
+                        </div>
+                    )}
+
                 <div className="mt-6 flex justify-center gap-4 flex-wrap">
                     <Button 
                         onClick={() => {
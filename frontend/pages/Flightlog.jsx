@@ -1,7 +1,7 @@
 import { useState, useEffect, useMemo, useCallback, useRef } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { Layout, Alert, Button, ResponsiveTable, ConfirmModal, Pagination, ImportPreviewModal } from '../components';
-import { getEnhancedFlightLogColumns, getFlightFormFields, INITIAL_FLIGHT_STATE, FLIGHT_FORM_OPTIONS, exportFlightLogToPDF, calculateFlightDuration, extractUavId, parseGPSFile } from '../utils';
+import { getEnhancedFlightLogColumns, getFlightFormFields, INITIAL_FLIGHT_STATE, FLIGHT_FORM_OPTIONS, exportFlightLogToPDF, calculateFlightDuration, extractUavId } from '../utils';
 import { useAuth, useApi, useUAVs, useQueryState } from '../hooks';
 
 const Flightlog = () => {
@@ -27,7 +27,6 @@ const Flightlog = () => {
   const [mobileFiltersVisible, setMobileFiltersVisible] = useState(false);
   const [mobileAddNewVisible, setMobileAddNewVisible] = useState(false);
   const [importResult, setImportResult] = useState(null);
-  const [userData, setUserData] = useState(null);
   const [pageSizeInitialized, setPageSizeInitialized] = useState(false);
   const [pageSizeCalculationAttempted, setPageSizeCalculationAttempted] = useState(false);
 
@@ -90,29 +89,6 @@ const Flightlog = () => {
     });
   }, [runAuthenticatedOperation, fetchData, debouncedFilters, currentPage, pageSize, sortField]);
 
-  const fetchAllFlightLogs = useCallback(async () => {
-    let allLogs = [];
-    let page = 1;
-    let hasMore = true;
-    const pageSize = 100;
-
-    while (hasMore) {
-      const queryParams = {
-        ...debouncedFilters,
-        page,
-        page_size: pageSize,
-        ordering: sortField
-      };
-      const result = await fetchData('/api/flightlogs/', queryParams);
-      if (result.error) break;
-      const pageLogs = result.data.results || [];
-      allLogs = allLogs.concat(pageLogs);
-      hasMore = pageLogs.length === pageSize;
-      page += 1;
-    }
-    return allLogs;
-  }, [debouncedFilters, sortField, fetchData]);
-
   // Fetch UAVs only once on mount
   const { fetchUAVs } = useUAVs(runAuthenticatedOperation, fetchData, setAvailableUAVs);
 
@@ -341,47 +317,57 @@ const Flightlog = () => {
     parseCSVFile(file);
   }, [parseCSVFile]);
 
-  // Upload the matched TeleLog files to their freshly created flight logs.
-  // Each created log is identified by uav + departure date/time so we can map a
-  // matched file (which knows its CSV row) to the new flightlog_id.
+  // Upload the matched TeleLog files of freshly created flight logs in one request.
+  // Each created log is identified by uav + departure date/time so files of rows
+  // that were not imported (duplicate/unmapped) are left out; the server matches
+  // the remaining files to their flight logs by file name.
   const uploadMatchedTeleLogs = useCallback(async (matchedLogFiles, importedLogs) => {
     if (!matchedLogFiles?.length || !importedLogs?.length) {
       return { uploaded: 0, failed: 0 };
     }
 
-    let uploaded = 0;
-    let failed = 0;
+    const formData = new FormData();
+    let fileCount = 0;
 
     for (const { row, file } of matchedLogFiles) {
       const rowDate = row.Date || row.departure_date || '';
       const rowTime = row['Timestamp-TO'] || row.departure_time || '';
       const rowUav = row.ModelName || row.drone_name || row.uav_serial || '';
 
-      const target = importedLogs.find(e =>
+      const imported = importedLogs.some(e =>
         e.departure_date === rowDate &&
         e.departure_time === rowTime &&
         (e.drone_name === rowUav || e.serial_number === rowUav)
       );
 
-      if (!target) continue; // log wasn't created (duplicate/unmapped) — nothing to attach
+      if (!imported) continue; // log wasn't created — nothing to attach
 
-      try {
-        const { gpsData } = await parseGPSFile(file);
-        const result = await fetchData(
-          `/api/flightlogs/${target.flightlog_id}/gps/`, {}, 'POST', { gps_data: gpsData }
-        );
-        if (result.error) {
-          failed += 1;
-        } else {
-          uploaded += 1;
-        }
-      } catch {
-        failed += 1;
-      }
+      formData.append('files', file, file.name);
+      fileCount += 1;
     }
 
-    return { uploaded, failed };
-  }, [fetchData]);
+    if (!fileCount) return { uploaded: 0, failed: 0 };
+
+    try {
+      const response = await fetch(`${API_URL}/api/flightlogs/gps/batch/`, {
+        method: 'POST',
+        headers: getAuthHeaders(),
+        body: formData
+      });
+      if (!response.ok) {
+        if (await handleAuthError(response)) return { uploaded: 0, failed: 0 };
+        return { uploaded: 0, failed: fileCount };
+      }
+
+      const result = await response.json();
+      return {
+        uploaded: result.attached.length,
+        failed: result.failed.length + result.unmatched.length
+      };
+    } catch {
+      return { uploaded: 0, failed: fileCount };
+    }
+  }, [API_URL, getAuthHeaders, handleAuthError]);
 
   // Handle confirmed import with selected rows
   const handleConfirmImport = useCallback(async (selectedRows, matchedLogFiles = []) => {
@@ -449,22 +435,18 @@ const Flightlog = () => {
     }
   }, []);
 
-  useEffect(() => {
-    const fetchUser = async () => {
-      try {
-        const headers = getAuthHeaders();
-        const res = await fetch(`${API_URL}/api/users/`, { headers });
-        const data = await res.json();
-        if (Array.isArray(data) && data.length > 0) setUserData(data[0]);
-      } catch (e) { /* ignore errors */ }
-    };
-    fetchUser();
-  }, [API_URL, getAuthHeaders]);
-
   const handleExportPDF = useCallback(async () => {
-    const allLogs = await fetchAllFlightLogs();
-    await exportFlightLogToPDF(allLogs, userData);
-  }, [fetchAllFlightLogs, userData]);
+    const queryParams = { ...debouncedFilters, ordering: sortField };
+    if (queryParams.uav && typeof queryParams.uav === 'object' && queryParams.uav.uav_id) {
+      queryParams.uav = queryParams.uav.uav_id;
+    }
+
+    try {
+      await exportFlightLogToPDF(API_URL, queryParams, getAuthHeaders());
+    } catch (err) {
+      setError(err.message);
+    }
+  }, [API_URL, debouncedFilters, sortField, getAuthHeaders]);
 
   const handlePageChange = useCallback((page) => {
     setCurrentPage(page);
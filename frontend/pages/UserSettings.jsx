@@ -8,6 +8,8 @@ import { getAllUserFormFields, validateForm, useFieldValidation, processBackendE
 const UserSettings = () => {
   const navigate = useNavigate();
   const API_URL = import.meta.env.VITE_API_URL;
+  // How often a running export is polled for progress (ms)
+  const EXPORT_POLL_INTERVAL = 2000;
 
   // Create initial form data based on all user form fields
   const getInitialFormData = () => {
@@ -32,7 +34,9 @@ const UserSettings = () => {
   const [success, setSuccess] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [isExporting, setIsExporting] = useState(false);
+  const [exportProgress, setExportProgress] = useState(null);
   const [isImporting, setIsImporting] = useState(false);
+  const [importProgress, setImportProgress] = useState(null);
   const [validationErrors, setValidationErrors] = useState({});
   const fileInputRef = useRef(null);
 
@@ -169,11 +173,14 @@ const UserSettings = () => {
     try {
       setIsExporting(true);
       setError(null);
+      setExportProgress(null);
       
       const auth = checkAuthAndGetUser();
       if (!auth) return;
       
-      const response = await fetch(`${API_URL}/api/export-user-data/`, {
+      // Queue the export on the server; it keeps running if this page is left
+      let response = await fetch(`${API_URL}/api/export-user-data/`, {
+        method: 'POST',
         headers: getAuthHeaders()
       });
       
@@ -183,29 +190,30 @@ const UserSettings = () => {
         }
         throw new Error(`Failed to export: ${response.status} ${response.statusText}`);
       }
-      
-      // Download exported ZIP file
-      const blob = await response.blob();
-      const url = window.URL.createObjectURL(blob);
-      const a = document.createElement('a');
-      a.style.display = 'none';
-      a.href = url;
-      
-      const contentDisposition = response.headers.get('Content-Disposition');
-      let filename = 'dronelogbook_export.zip';
-      
-      if (contentDisposition) {
-        const filenameMatch = /filename="(.+)"/.exec(contentDisposition);
-        if (filenameMatch && filenameMatch[1]) {
-          filename = filenameMatch[1];
+
+      let job = await response.json();
+      while (job.status === 'pending' || job.status === 'running') {
+        setExportProgress(job.progress);
+        await new Promise(resolve => setTimeout(resolve, EXPORT_POLL_INTERVAL));
+        response = await fetch(`${API_URL}/api/exports/${job.export_id}/`, {
+          headers: getAuthHeaders()
+        });
+        if (!response.ok) {
+          throw new Error(`Failed to check export: ${response.status} ${response.statusText}`);
         }
+        job = await response.json();
+      }
+
+      if (job.status !== 'completed' || !job.download_url) {
+        throw new Error(job.error || 'Export failed');
       }
       
-      a.download = filename;
+      // The signed link needs no auth header, so the browser downloads (and can resume) it directly
+      const a = document.createElement('a');
+      a.style.display = 'none';
+      a.href = job.download_url;
       document.body.appendChild(a);
       a.click();
-
-      window.URL.revokeObjectURL(url);
       document.body.removeChild(a);
 
       setSuccess('Your data has been exported successfully!');
@@ -213,6 +221,7 @@ const UserSettings = () => {
       setError('Failed to export data: ' + (err.message || 'Unknown error'));
     } finally {
       setIsExporting(false);
+      setExportProgress(null);
     }
   };
 
@@ -241,7 +250,8 @@ const UserSettings = () => {
       const formData = new FormData();
       formData.append('file', file);
       
-      const response = await fetch(`${API_URL}/api/import-user-data/`, {
+      // Queue the import on the server; progress and the result are polled from the job
+      let response = await fetch(`${API_URL}/api/import-user-data/`, {
         method: 'POST',
         headers: {
           Authorization: `Bearer ${auth.token}`
@@ -265,23 +275,35 @@ const UserSettings = () => {
         throw new Error(result.detail || result.message || 'Import failed');
       }
       
-      const result = await response.json();
+      let job = await response.json();
+      while (job.status === 'pending' || job.status === 'running') {
+        setImportProgress(job.progress);
+        await new Promise(resolve => setTimeout(resolve, EXPORT_POLL_INTERVAL));
+        response = await fetch(`${API_URL}/api/imports/${job.import_id}/`, {
+          headers: getAuthHeaders()
+        });
+        if (!response.ok) {
+          throw new Error(`Failed to check import: ${response.status} ${response.statusText}`);
+        }
+        job = await response.json();
+      }
       
       fileInputRef.current.value = '';
       
+      const result = job.result;
+      if (job.status !== 'completed' || !result) {
+        const errors = result?.details?.errors || [];
+        throw new Error([result?.message || job.error || 'Import failed', ...errors].join(' '));
+      }
+      
       // Show import summary
-      const details = result.details;
-      setSuccess(
-        `Import successful! Imported: ${details.uavs_imported} UAVs, ` +
-        `${details.flight_logs_imported} flight logs, ` +
-        `${details.maintenance_logs_imported} maintenance logs, and ` +
-        `${details.maintenance_reminders_imported} maintenance reminders.`
-      );
+      setSuccess(result.message);
       
     } catch (err) {
       setError('Failed to import data: ' + (err.message || 'Unknown error'));
     } finally {
       setIsImporting(false);
+      setImportProgress(null);
     }
   };
 
@@ -488,7 +510,9 @@ const UserSettings = () => {
                       <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4"></circle>
                       <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path>
                     </svg>
-                    Importing...
+                    {importProgress
+                      ? `Importing... ${Object.values(importProgress).filter(state => state === 'done' || state === 'skipped').length}/${Object.keys(importProgress).length}`
+                      : 'Importing...'}
                   </>
                 ) : (
                   <>
@@ -520,7 +544,9 @@ const UserSettings = () => {
                       <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4"></circle>
                       <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path>
                     </svg>
-                    Exporting...
+                    {exportProgress
+                      ? `Exporting... ${Object.values(exportProgress).filter(state => state === 'done').length}/${Object.keys(exportProgress).length}`
+                      : 'Exporting...'}
                   </>
                 ) : (
                   <>
@@ -306,11 +306,14 @@ const mockGpsData = [
   }
 ];
 
-// orderedIds: [3,2,1] => flightId=1 is the last (Index 2), flightId=2 is middle (Index 1), flightId=3 is first (Index 0)
-const mockFlightMeta = {
-  minId: 1,
-  maxId: 3,
-  orderedIds: [3, 2, 1]
+// List order [3,2,1] => flightId=3 is the first row (newest), flightId=1 the last row (oldest)
+const mockListOrder = [3, 2, 1];
+const mockFlightNeighbors = (endpoint) => {
+  const index = mockListOrder.indexOf(parseInt(endpoint.match(/flightlogs\/(\d+)\/neighbors/)[1], 10));
+  return {
+    previousId: mockListOrder[index - 1] ?? null,
+    nextId: mockListOrder[index + 1] ?? null
+  };
 };
 
 const renderFlightDetails = async () => {
@@ -338,6 +341,9 @@ describe('FlightDetails Component', () => {
     
     // Setup mock fetch responses
     mockFetchData.mockImplementation((endpoint) => {
+      if (endpoint.includes('/neighbors/')) {
+        return Promise.resolve({ data: mockFlightNeighbors(endpoint), error: null });
+      }
       if (endpoint.includes('/api/flightlogs/1/')) {
         return Promise.resolve({ data: mockFlight, error: null });
       }
@@ -347,9 +353,6 @@ describe('FlightDetails Component', () => {
       if (endpoint.includes('/api/flightlogs/1/gps/')) {
         return Promise.resolve({ data: [], error: null }); // Default to no GPS data
       }
-      if (endpoint.includes('/api/flightlogs/meta/')) {
-        return Promise.resolve({ data: mockFlightMeta, error: null });
-      }
       return Promise.resolve({ data: {}, error: null });
     });
     
@@ -415,7 +418,7 @@ describe('FlightDetails Component', () => {
       expect(mockFetchData).toHaveBeenCalledWith('/api/flightlogs/1/', expect.any(Object));
       expect(mockFetchData).toHaveBeenCalledWith('/api/uavs/1/', expect.any(Object));
       expect(mockFetchData).toHaveBeenCalledWith('/api/flightlogs/1/gps/', expect.any(Object));
-      expect(mockFetchData).toHaveBeenCalledWith('/api/flightlogs/meta/');
+      expect(mockFetchData).toHaveBeenCalledWith('/api/flightlogs/1/neighbors/', expect.any(Object));
     });
   });
 
@@ -423,12 +426,12 @@ describe('FlightDetails Component', () => {
     // Set mockFlight without uav data
     const flightWithoutUav = { ...mockFlight, uav: null };
     mockFetchData.mockImplementation((endpoint) => {
+      if (endpoint.includes('/neighbors/')) {
+        return Promise.resolve({ data: mockFlightNeighbors(endpoint), error: null });
+      }
       if (endpoint.includes('/api/flightlogs/1/')) {
         return Promise.resolve({ data: flightWithoutUav, error: null });
       }
-      if (endpoint.includes('/api/flightlogs/meta/')) {
-        return Promise.resolve({ data: mockFlightMeta, error: null });
-      }
       return Promise.resolve({ data: {}, error: null });
     });
     
@@ -453,7 +456,7 @@ describe('FlightDetails Component', () => {
   });
 
   test('handles next flight navigation', async () => {
-    // orderedIds: [3,2,1], flightId=2 (Index 1), left arrow navigates to orderedIds[0]=3
+    // List order [3,2,1], flightId=2, left arrow navigates to the row before it (flightId=3)
     mockParams.flightId = '2';
     await act(async () => {
       await renderFlightDetails();
@@ -469,12 +472,12 @@ describe('FlightDetails Component', () => {
       fireEvent.click(screen.getByTestId('arrow-left'));
     });
 
-    // next flight from index 1 is index 0 (flightId=3)
+    // next flight is the previous list row (flightId=3)
     expect(mockNavigate).toHaveBeenCalledWith('/flightdetails/3');
   });
 
   test('handles previous flight navigation', async () => {
-    // orderedIds: [3,2,1], flightId=2 (Index 1), right arrow navigates to orderedIds[2]=1
+    // List order [3,2,1], flightId=2, right arrow navigates to the row after it (flightId=1)
     mockParams.flightId = '2';
     await act(async () => {
       await renderFlightDetails();
@@ -490,7 +493,7 @@ describe('FlightDetails Component', () => {
       fireEvent.click(screen.getByTestId('arrow-right'));
     });
 
-    // previous flight from index 1 is index 2 (flightId=1)
+    // previous flight is the next list row (flightId=1)
     expect(mockNavigate).toHaveBeenCalledWith('/flightdetails/1');
   });
 
@@ -542,7 +545,7 @@ describe('FlightDetails Component', () => {
   });
 
   test('navigation arrows are disabled appropriately', async () => {
-    // Test with flightId=1 (last in orderedIds, Index 2)
+    // Test with flightId=1 (last list row)
     mockParams.flightId = '1';
     await act(async () => {
       await renderFlightDetails();
@@ -554,13 +557,13 @@ describe('FlightDetails Component', () => {
       const prevButton = prevButtons[prevButtons.length - 1];
       const nextButton = nextButtons[nextButtons.length - 1];
 
-      // previous (right) should be disabled (Index 2 >= orderedIds.length-1)
+      // previous (right) should be disabled (no row after it)
       expect(prevButton).toBeDisabled();
-      // next (left) should be enabled (Index 2 > 0)
+      // next (left) should be enabled (flightId=2 is before it)
       expect(nextButton).not.toBeDisabled();
     });
 
-    // Test with flightId=3 (first in orderedIds, Index 0)
+    // Test with flightId=3 (first list row)
     mockParams.flightId = '3';
     await act(async () => {
       await renderFlightDetails();
@@ -572,9 +575,9 @@ describe('FlightDetails Component', () => {
       const prevButton = prevButtons[prevButtons.length - 1];
       const nextButton = nextButtons[nextButtons.length - 1];
 
-      // previous (right) should be enabled (Index 0 < orderedIds.length-1)
+      // previous (right) should be enabled (flightId=2 is after it)
       expect(prevButton).not.toBeDisabled();
-      // next (left) should be disabled (Index 0 <= 0)
+      // next (left) should be disabled (no row before it)
       expect(nextButton).toBeDisabled();
     });
   });
@@ -1,8 +1,8 @@
 /**
  * Image helpers for aircraft pictures.
  *
- * Pictures are kept in the database as base64 data URIs, so the browser does
- * the scaling: every stored image is a square 256x256 thumbnail.
+ * The browser scales pictures to a square 256x256 image before uploading it
+ * as a base64 data URI; the server stores it and makes the smaller thumbnails.
  */
 
 export const UAV_IMAGE_SIZE = 256;
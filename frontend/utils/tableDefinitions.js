@@ -46,11 +46,19 @@ export const uavTableColumns = [
 
 // Renders the aircraft picture of a flight log row, or nothing if the UAV has none.
 // Pictures are stored square (256x256), so they are shown 1:1 and unscaled in
-// shape. createElement instead of JSX: this module is a plain .js file.
+// shape. uav.image is a content-hash URL the browser caches, not inline data;
+// the srcset lets it fetch the smallest server-made thumbnail that fits.
+// createElement instead of JSX: this module is a plain .js file.
+export const uavImageSrcSet = (uav) => Object.entries(uav?.image_srcset || {})
+  .map(([size, url]) => `${url} ${size}w`)
+  .join(', ') || undefined;
+
 const renderUavImage = (uav) => {
   if (!uav?.image) return '';
   return createElement('img', {
     src: uav.image,
+    srcSet: uavImageSrcSet(uav),
+    sizes: '32px',
     alt: uav.drone_name || 'Aircraft',
     className: 'h-8 w-8 aspect-square object-contain'
   });